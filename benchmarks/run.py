@@ -0,0 +1,280 @@
+"""
+Benchmark suite for the simulation and analysis hot paths.
+
+Run from the repository root::
+
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --save-baseline benchmarks/baseline.json
+    python -m benchmarks.run --baseline benchmarks/baseline.json --tolerance 0.25
+
+Every benchmark reports operations per second, peak traced memory and, for
+simulations, simulated bets per second. Results are printed and written as
+JSON. With ``--baseline`` each result is compared against a stored run, and
+the process exits with status 1 if any benchmark regressed by more than the
+tolerance.
+"""
+
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from src.analytics import ruin_statistics  # noqa: E402
+from src.duration import duration_distribution  # noqa: E402
+from src.loan import credit_limit_ruin  # noqa: E402
+from src import api_demo  # noqa: E402
+from src.page_compute import matrix_power  # noqa: E402
+
+# Cached entry points are benchmarked through __wrapped__ so that every call
+# does the real work instead of hitting the result cache.
+calculate_ruin_probability = api_demo.calculate_ruin_probability.__wrapped__
+analyze_betting_strategy = api_demo.analyze_betting_strategy.__wrapped__
+run_monte_carlo_simulation = api_demo.run_monte_carlo_simulation.__wrapped__
+run_strategy_tournament = api_demo.run_strategy_tournament.__wrapped__
+
+
+class Benchmark:
+    """A named workload.
+
+    Attributes:
+        name (str): Unique benchmark name
+        func (Callable[[], Any]): Workload; called repeatedly while timing
+        steps (Optional[Callable[[Any], int]]): Number of simulated bets done by one call,
+            computed from the workload's return value
+    """
+
+    def __init__(self, name: str, func: Callable[[], Any],
+                 steps: Optional[Callable[[Any], int]] = None):
+        self.name = name
+        self.func = func
+        self.steps = steps
+
+
+def _monte_carlo_steps(result: Dict[str, Any]) -> int:
+    return round(result["average_duration"] * result["parameters"]["num_simulations"])
+
+
+def build_benchmarks(quick: bool = False) -> List[Benchmark]:
+    """Create the benchmark workloads.
+
+    Args:
+        quick (bool): Use smaller workloads, e.g. for smoke runs in CI
+
+    Returns:
+        List of benchmarks in execution order
+    """
+    rng = np.random.default_rng(0)
+    batch_size = 10_000 if quick else 1_000_000
+    targets = rng.integers(2, 2000, batch_size)
+    batch = (rng.integers(1, targets), targets, rng.random(batch_size))
+
+    client = TestClient(api_demo.app)
+    endpoint_batch = {
+        "initial_fortune": batch[0][:10_000].tolist(),
+        "target_fortune": batch[1][:10_000].tolist(),
+        "win_probability": batch[2][:10_000].tolist(),
+    }
+
+    transition = np.zeros((10, 10))
+    transition[0, 0] = transition[-1, -1] = 1
+    for i in range(1, 9):
+        transition[i, i - 1] = 0.5
+        transition[i, i + 1] = 0.5
+
+    benchmarks = [
+        Benchmark("calculate_ruin_probability/scalar",
+                  lambda: calculate_ruin_probability(50, 100, 0.49)),
+        Benchmark(f"ruin_statistics/batch_{batch_size}",
+                  lambda: ruin_statistics(*batch)),
+        Benchmark("analyze_betting_strategy/martingale",
+                  lambda: analyze_betting_strategy("Martingale", 1.0, 100.0, 0.49, 100.0)),
+        Benchmark("analyze_betting_strategy/kelly",
+                  lambda: analyze_betting_strategy("Kelly", 1.0, 100.0, 0.55, 100.0)),
+        Benchmark("run_strategy_tournament/3_strategies",
+                  lambda: run_strategy_tournament(
+                      [{"strategy_type": "Martingale"}, {"strategy_type": "Kelly"}, {"strategy_type": "Fixed"}],
+                      100.0, 0.52, 100.0)),
+        Benchmark("credit_limit_ruin/sweep_0_1000_max_bet_10",
+                  lambda: credit_limit_ruin(100, 200, 0.49, 1000, max_bet=10, interest_rate=0.01)),
+        Benchmark("duration_distribution/50_100_p0.5",
+                  lambda: duration_distribution(50, 100, 0.5)),
+        Benchmark("matrix_power/10x10_power100",
+                  lambda: matrix_power(transition, 100)),
+    ]
+
+    sizes = (1_000, 10_000) if quick else (1_000, 100_000, 1_000_000)
+    for size in sizes:
+        benchmarks.append(Benchmark(
+            f"run_monte_carlo_simulation/{size}",
+            lambda size=size: run_monte_carlo_simulation(size, 50, 100, 0.5, seed=0),
+            steps=_monte_carlo_steps,
+        ))
+
+    benchmarks += [
+        Benchmark("endpoint/calculate_probability",
+                  lambda: client.post("/calculate_probability", json={
+                      "initial_fortune": 50, "target_fortune": 100, "win_probability": 0.49,
+                  }).raise_for_status()),
+        Benchmark("endpoint/calculate_probability_batch_10000",
+                  lambda: client.post("/calculate_probability/batch", json=endpoint_batch).raise_for_status()),
+        Benchmark("endpoint/chat",
+                  lambda: client.post("/chat", json={"message": "What's the best strategy?"}).raise_for_status()),
+    ]
+    return benchmarks
+
+
+def measure(benchmark: Benchmark, min_time: float = 0.2, rounds: int = 3) -> Dict[str, float]:
+    """Time a benchmark and record its peak memory.
+
+    The workload is repeated until one round takes at least ``min_time``
+    seconds, and the fastest of ``rounds`` rounds is reported. Peak memory is
+    measured separately, on a single call under ``tracemalloc``, so tracing
+    does not distort the timings.
+
+    Args:
+        benchmark (Benchmark): Workload to measure
+        min_time (float): Minimum duration of one timing round in seconds
+        rounds (int): Number of timing rounds
+
+    Returns:
+        Dict containing ops_per_sec, seconds_per_op, peak_memory_bytes and,
+        for simulations, steps_per_sec
+    """
+    result = benchmark.func()
+
+    calls = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(calls):
+            benchmark.func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        calls *= 2 if elapsed == 0 else max(2, int(min_time / elapsed) + 1)
+
+    best = elapsed / calls
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(rounds - 1):
+            start = time.perf_counter()
+            for _ in range(calls):
+                benchmark.func()
+            best = min(best, (time.perf_counter() - start) / calls)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    tracemalloc.start()
+    benchmark.func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    stats = {
+        "ops_per_sec": 1.0 / best,
+        "seconds_per_op": best,
+        "peak_memory_bytes": peak,
+    }
+    if benchmark.steps is not None:
+        stats["steps_per_sec"] = benchmark.steps(result) / best
+    return stats
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]],
+            tolerance: float) -> List[str]:
+    """Find benchmarks that regressed against a baseline.
+
+    A benchmark regresses when its throughput drops, or its peak memory grows,
+    by more than ``tolerance`` relative to the baseline. Benchmarks missing
+    from either side are ignored.
+
+    Args:
+        results (Dict[str, Dict[str, float]]): Current results by benchmark name
+        baseline (Dict[str, Dict[str, float]]): Baseline results by benchmark name
+        tolerance (float): Allowed relative change, e.g. 0.25 for 25%
+
+    Returns:
+        Human-readable descriptions of the regressions
+    """
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        ratio = current["ops_per_sec"] / previous["ops_per_sec"]
+        if ratio < 1 - tolerance:
+            regressions.append(f"{name}: throughput {ratio:.2f}x of baseline")
+        if previous["peak_memory_bytes"] and (
+                current["peak_memory_bytes"] > previous["peak_memory_bytes"] * (1 + tolerance)):
+            growth = current["peak_memory_bytes"] / previous["peak_memory_bytes"]
+            regressions.append(f"{name}: peak memory {growth:.2f}x of baseline")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the Gambler's Ruin hot paths.")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--save-baseline", help="Write results as JSON to this file for later comparisons")
+    parser.add_argument("--baseline", help="Compare against results stored in this JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative regression (default: 0.25)")
+    parser.add_argument("--filter", default="", help="Only run benchmarks whose name contains this string")
+    parser.add_argument("--quick", action="store_true", help="Use smaller workloads")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Minimum seconds per timing round")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for benchmark in build_benchmarks(quick=args.quick):
+        if args.filter not in benchmark.name:
+            continue
+        stats = measure(benchmark, min_time=args.min_time)
+        results[benchmark.name] = stats
+        line = f"{benchmark.name:<50} {stats['ops_per_sec']:>14.2f} ops/s {stats['peak_memory_bytes'] / 2**20:>9.2f} MiB"
+        if "steps_per_sec" in stats:
+            line += f" {stats['steps_per_sec']:>14.4g} steps/s"
+        print(line, file=sys.stderr)
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "quick": args.quick,
+        },
+        "results": results,
+    }
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        report["baseline"] = args.baseline
+        report["regressions"] = regressions
+
+    text = json.dumps(report, indent=2)
+    for path in (args.output, args.save_baseline):
+        if path:
+            Path(path).write_text(text + "\n")
+    if not args.output:
+        print(text)
+
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
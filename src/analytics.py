@@ -0,0 +1,68 @@
+"""
+Closed-form analytics for the Gambler's Ruin problem.
+
+All functions here are vectorized: they accept scalars or NumPy arrays of
+initial fortunes, target fortunes and win probabilities, broadcast them
+against each other, and evaluate every parameter point in a single pass.
+"""
+
+import numpy as np
+from typing import Tuple
+
+# Below this value of |log(q/p)| * N the expected duration is taken from its
+# Taylor expansion around p = 0.5, where the exact formula cancels badly.
+_NEAR_FAIR = 1e-5
+
+
+def ruin_statistics(initial_fortune, target_fortune, win_probability) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Compute ruin probability, win probability and expected duration.
+
+    With ``x = log(q/p)`` the probability of reaching the target from ``n`` is
+    ``expm1(n*x) / expm1(N*x)``. Evaluating the formula through ``expm1`` and
+    always in the direction where ``x`` is negative keeps every intermediate
+    value in [-1, 0], so nothing overflows however far p is from 0.5 or however
+    large N is. The probability of the opposite outcome is evaluated
+    separately rather than as ``1 - P`` so that tiny probabilities keep full
+    relative precision.
+
+    The expected number of bets is ``n(N - n)`` for a fair game and
+    ``(n - N * P(win)) / (q - p)`` otherwise.
+
+    Args:
+        initial_fortune (array_like): Starting amount of money
+        target_fortune (array_like): Target amount to reach
+        win_probability (array_like): Probability of winning each bet
+
+    Returns:
+        Tuple of (ruin_probability, win_probability, expected_duration) float64 arrays
+        with the broadcast shape of the inputs
+    """
+    n, N, p = np.broadcast_arrays(
+        np.asarray(initial_fortune, dtype=np.float64),
+        np.asarray(target_fortune, dtype=np.float64),
+        np.asarray(win_probability, dtype=np.float64),
+    )
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        x = np.log1p(-p) - np.log(p)
+        neg = -np.abs(x)
+        # Distance from the barrier the game drifts away from.
+        m = np.where(x < 0, n, N - n)
+        denom = np.expm1(N * neg)
+        away = np.expm1(m * neg) / denom
+        toward = np.exp(m * neg) * (np.expm1((N - m) * neg) / denom)
+
+        fair = x == 0
+        win = np.where(fair, n / N, np.where(x < 0, away, toward))
+        ruin = np.where(fair, (N - n) / N, np.where(x < 0, toward, away))
+
+        duration = (n - N * win) / (1 - 2 * p)
+        near_fair = np.abs(x) * N < _NEAR_FAIR
+        duration = np.where(near_fair, n * (N - n) * (1 + (2 * n - N) * x / 6), duration)
+
+    lost = n <= 0
+    won = ~lost & (n >= N)
+    ruin = np.where(lost, 1.0, np.where(won, 0.0, ruin))
+    win = np.where(lost, 0.0, np.where(won, 1.0, win))
+    duration = np.where(lost | won, 0.0, duration)
+    return ruin, win, duration
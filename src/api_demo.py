@@ -6,16 +6,57 @@ analyzing betting strategies, and running Monte Carlo simulations
 for the Gambler's Ruin problem.
 """
 
+import json
 import numpy as np
-from typing import Dict, List, Optional, Union
-from fastapi import FastAPI
-from pydantic import BaseModel
+from typing import Annotated, Dict, List, Literal, Optional, Union
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+from pydantic import AliasChoices, BaseModel, Field, ValidationError
+
+from src.cache import cached, result_cache
+from src.chat import router as chat_router
+from src.encoding import NPZ_MEDIA_TYPE, encode_npz, prefers_npz, to_jsonable
+from src.duration import duration_distribution, duration_quantiles, duration_survival, duration_tail
+from src.executor import ExecutorSaturated, cpu_executor
+from src.jobs import job_queue
+from src.metrics import Counter, Gauge, MetricsMiddleware, record_simulation, registry, snapshot
+from src.profiling import ENABLED as PROFILING_ENABLED, ProfilingMiddleware, profiled
+from src.simulation import (
+    MAX_WORKERS,
+    SHARD_SIZE,
+    finalize_summary,
+    importance_sampling_estimate,
+    map_shards,
+    merge_summaries,
+    plan_shards,
+    run_shard,
+    simulate_shard,
+    simulate_sharded,
+    summarize_walkers,
+    wilson_interval,
+)
+from src.strategies import (
+    MAX_ROUNDS, MAX_WALKERS, make_rule, run_tournament, simulate_strategies, summarize_strategy
+)
+from src.surface import lookup_ruin_statistics
 
 app = FastAPI(
     title="Gambler's Ruin API",
     description="API for analyzing Gambler's Ruin problem and betting strategies",
     version="1.0.0"
 )
+app.add_middleware(MetricsMiddleware)
+if PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
+@app.exception_handler(ExecutorSaturated)
+async def executor_saturated_handler(request: Request, exc: ExecutorSaturated) -> JSONResponse:
+    """Reject work with 503 and a Retry-After hint while the CPU executor is saturated."""
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
 
 class ProbabilityRequest(BaseModel):
     """Request model for probability calculation endpoint.
@@ -27,7 +68,159 @@ class ProbabilityRequest(BaseModel):
     """
     initial_fortune: int
     target_fortune: int
-    win_probability: float
+    win_probability: float = Field(ge=0, le=1)
+
+class BatchProbabilityRequest(BaseModel):
+    """Request model for the batch probability calculation endpoint.
+    
+    The three lists are columns of the same table: entry ``i`` of each list
+    describes one parameter point. All lists must have the same length.
+    
+    Attributes:
+        initial_fortune (List[int]): Starting amounts of money
+        target_fortune (List[int]): Target amounts to reach
+        win_probability (List[float]): Probabilities of winning each bet
+    """
+    initial_fortune: List[Annotated[int, Field(ge=0)]]
+    target_fortune: List[Annotated[int, Field(ge=0)]]
+    win_probability: List[Annotated[float, Field(ge=0, le=1)]]
+
+class DurationRequest(BaseModel):
+    """Request model for the duration distribution endpoint.
+    
+    Attributes:
+        initial_fortune (int): Starting amount of money
+        target_fortune (int): Target amount to reach
+        win_probability (float): Probability of winning each bet
+        quantiles (List[float]): Duration quantiles to report (default: 0.5, 0.9, 0.99)
+        bins (int): Number of histogram bins (default: 50)
+        eps (float): Probability mass that may be left beyond the computed range (default: 1e-12)
+    """
+    initial_fortune: int
+    target_fortune: int
+    win_probability: float = Field(ge=0, le=1)
+    quantiles: List[float] = [0.5, 0.9, 0.99]
+    bins: int = 50
+    eps: float = 1e-12
+
+class SimulationRequest(BaseModel):
+    """Request model for Monte Carlo simulation endpoints.
+    
+    Attributes:
+        num_simulations (int): Number of simulations to run
+        initial_fortune (int): Starting amount of money
+        target_fortune (int): Target amount to reach
+        win_probability (float): Probability of winning each bet
+        seed (Optional[int]): Seed for reproducible runs (default: fresh entropy)
+        max_steps (int): Maximum number of bets in any simulation (default: 1000)
+        chunk_size (int): Simulations per streamed chunk (default: simulation shard size)
+        confidence (float): Confidence level of the reported interval (default: 0.95)
+        importance_sampling (bool): Estimate the rare outcome by exponential tilting (default: False)
+        antithetic (bool): Use antithetic walker pairs with importance sampling (default: False)
+        return_walkers (bool): Also return every walker's duration and final fortune,
+            ``/simulate`` only (default: False)
+        workers (int): Worker processes to spread the shards of a plain run over,
+            for ``/simulate`` and simulation jobs, at most ``SIM_MAX_WORKERS`` (default: 1)
+    """
+    num_simulations: int
+    initial_fortune: int
+    target_fortune: int
+    win_probability: float = Field(ge=0, le=1)
+    seed: Optional[int] = None
+    max_steps: int = 1000
+    chunk_size: int = SHARD_SIZE
+    confidence: float = Field(0.95, gt=0, lt=1)
+    importance_sampling: bool = False
+    antithetic: bool = False
+    return_walkers: bool = False
+    workers: int = Field(1, ge=1, le=MAX_WORKERS)
+
+class StrategyRequest(BaseModel):
+    """Request model for the strategy analysis endpoint.
+    
+    Attributes:
+        strategy_type (str): Type of betting strategy ("Martingale", "Kelly", or "Fixed")
+        bet_size (float): Initial bet size, also accepted as ``initial_bet``
+        stop_loss (Optional[float]): Maximum loss limit (default: no limit)
+        win_probability (float): Probability of winning each bet
+        initial_fortune (float): Starting amount of money
+        target_fortune (Optional[float]): Stop once wealth reaches this amount (default: no target)
+        table_limit (Optional[float]): Largest bet the table accepts (default: no limit)
+        min_bet (float): Smallest bet the table accepts; smaller bets are raised to it (default: 1)
+        num_walkers (int): Number of simulated gamblers, at most ``STRATEGY_MAX_WALKERS`` (default: 10000)
+        max_rounds (int): Maximum number of bets per gambler, at most ``STRATEGY_MAX_ROUNDS`` (default: 1000)
+        seed (Optional[int]): Seed for reproducible runs (default: 0; null for fresh entropy)
+    """
+    strategy_type: Literal["Fixed", "Martingale", "Kelly"]
+    bet_size: float = Field(validation_alias=AliasChoices("bet_size", "initial_bet"))
+    stop_loss: Optional[float] = None
+    win_probability: float = Field(ge=0, le=1)
+    initial_fortune: float
+    target_fortune: Optional[float] = None
+    table_limit: Optional[float] = None
+    min_bet: float = Field(1.0, gt=0)
+    num_walkers: int = Field(10_000, ge=1, le=MAX_WALKERS)
+    max_rounds: int = Field(1_000, ge=1, le=MAX_ROUNDS)
+    seed: Optional[int] = 0
+
+class StrategySpec(BaseModel):
+    """One contestant of a strategy tournament.
+    
+    Attributes:
+        strategy_type (str): Type of betting strategy ("Martingale", "Kelly", or "Fixed")
+        bet_size (float): Initial bet size for Martingale and Fixed (default: 1)
+        multiplier (float): Martingale stake multiplier after a loss (default: 2)
+        kelly_multiplier (float): Fraction of the Kelly bet, e.g. 0.5 for half-Kelly (default: 1)
+        name (Optional[str]): Label in the results (default: the strategy type)
+    """
+    strategy_type: Literal["Fixed", "Martingale", "Kelly"]
+    bet_size: float = 1.0
+    multiplier: float = 2.0
+    kelly_multiplier: float = 1.0
+    name: Optional[str] = None
+
+class TournamentRequest(BaseModel):
+    """Request model for the strategy tournament endpoint.
+    
+    Attributes:
+        strategies (List[StrategySpec]): Strategies to compare (default: Martingale, Kelly and Fixed)
+        stop_loss (float): Maximum loss limit
+        win_probability (float): Probability of winning each bet
+        initial_fortune (float): Starting amount of money
+        target_fortune (Optional[float]): Stop once wealth reaches this amount (default: no target)
+        table_limit (Optional[float]): Largest bet the table accepts (default: no limit)
+        min_bet (float): Smallest bet the table accepts; smaller bets are raised to it (default: 1)
+        num_walkers (int): Number of simulated gamblers, from 2 to ``STRATEGY_MAX_WALKERS`` (default: 10000)
+        max_rounds (int): Maximum number of bets per gambler, at most ``STRATEGY_MAX_ROUNDS`` (default: 1000)
+        seed (Optional[int]): Seed for reproducible runs (default: 0; null for fresh entropy)
+        confidence (float): Confidence level of the paired intervals (default: 0.95)
+    """
+    strategies: List[StrategySpec] = [
+        StrategySpec(strategy_type="Martingale"),
+        StrategySpec(strategy_type="Kelly"),
+        StrategySpec(strategy_type="Fixed"),
+    ]
+    stop_loss: float
+    win_probability: float = Field(ge=0, le=1)
+    initial_fortune: float
+    target_fortune: Optional[float] = None
+    table_limit: Optional[float] = None
+    min_bet: float = Field(1.0, gt=0)
+    num_walkers: int = Field(10_000, ge=2, le=MAX_WALKERS)
+    max_rounds: int = Field(1_000, ge=1, le=MAX_ROUNDS)
+    seed: Optional[int] = 0
+    confidence: float = Field(0.95, gt=0, lt=1)
+
+class JobRequest(BaseModel):
+    """Request model for submitting a background job.
+    
+    Attributes:
+        kind (str): Work to run ("simulate", "analyze_strategy" or "tournament")
+        parameters (dict): Request body of the matching endpoint
+            (``/simulate``, ``/analyze_strategy`` or ``/analyze_strategy/tournament``)
+    """
+    kind: str
+    parameters: dict = {}
 
 class ChatRequest(BaseModel):
     """Request model for chat endpoint.
@@ -35,7 +228,8 @@ class ChatRequest(BaseModel):
     Attributes:
         message (str): User's message or query
         language (str): Preferred language for response (default: "English")
-        game_state (dict): Current state of the game including probabilities and fortunes
+        game_state (dict): Current state of the game including probabilities and fortunes;
+            an optional ``target_fortune`` defaults to twice the initial fortune
     """
     message: str
     language: str = "English"
@@ -46,6 +240,77 @@ class ChatRequest(BaseModel):
         "has_loan": False
     }
 
+def _check_simulation_request(request: SimulationRequest) -> None:
+    if request.num_simulations <= 0:
+        raise HTTPException(status_code=422, detail="num_simulations must be positive")
+    if request.return_walkers and request.importance_sampling:
+        raise HTTPException(status_code=422, detail="return_walkers is not supported with importance_sampling")
+
+def _check_simulation_job(request: SimulationRequest) -> None:
+    _check_simulation_request(request)
+    if request.return_walkers:
+        raise HTTPException(status_code=422, detail="return_walkers is not supported for jobs")
+
+def _check_strategy_request(request: Union[StrategyRequest, TournamentRequest]) -> None:
+    if request.table_limit is not None and request.table_limit < request.min_bet:
+        raise HTTPException(status_code=422, detail="table_limit must be at least min_bet")
+
+def _check_tournament_request(request: TournamentRequest) -> None:
+    if not request.strategies:
+        raise HTTPException(status_code=422, detail="at least one strategy is required")
+    _check_strategy_request(request)
+    names = [spec.name or spec.strategy_type for spec in request.strategies]
+    if len(set(names)) != len(names):
+        raise HTTPException(status_code=422, detail="strategy names must be unique")
+
+def _chat_game_state(game_state: dict) -> Dict[str, Union[int, float]]:
+    """Read the chat game state, filling in defaults and the target fortune.
+
+    The target defaults to twice the initial fortune. Raises HTTPException
+    (422) for values that are not numbers or a win probability outside [0, 1].
+    """
+    defaults = ChatRequest.model_fields["game_state"].default
+    try:
+        win_probability = float(game_state.get("win_probability", defaults["win_probability"]))
+        initial_fortune = int(game_state.get("initial_fortune", defaults["initial_fortune"]))
+        current_fortune = int(game_state.get("current_fortune", initial_fortune))
+        target_fortune = int(game_state.get("target_fortune", 2 * initial_fortune))
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=422, detail="game_state values must be numbers")
+    if not 0 <= win_probability <= 1:
+        raise HTTPException(status_code=422, detail="win_probability must be between 0 and 1")
+    return {
+        "win_probability": win_probability,
+        "expected_value": 2 * win_probability - 1,
+        "initial_fortune": initial_fortune,
+        "current_fortune": max(current_fortune, 0),
+        "target_fortune": target_fortune,
+    }
+
+def _negotiated_response(result: Dict, http_request: Request) -> Response:
+    """Encode a result as ``.npz`` if the client asks for it, else as JSON."""
+    if prefers_npz(http_request.headers.get("accept")):
+        return Response(encode_npz(result), media_type=NPZ_MEDIA_TYPE)
+    return JSONResponse(to_jsonable(result))
+
+def _running_estimate(summary: Dict, num_simulations: int,
+                      confidence: float) -> Dict[str, Union[int, float, bool, List[float], Dict]]:
+    """Running statistics of a partially finished simulation."""
+    lower, upper = wilson_interval(summary["wins"], summary["num_simulations"], confidence)
+    stats = finalize_summary(summary)
+    return {
+        "completed": summary["num_simulations"],
+        "num_simulations": num_simulations,
+        "win_rate": stats["win_rate"],
+        "confidence_interval": [lower, upper],
+        "average_duration": stats["average_duration"],
+        "duration_percentiles": stats["duration_percentiles"],
+        "max_duration": stats["max_duration"],
+        "min_fortune": stats["min_fortune"],
+        "max_fortune": stats["max_fortune"],
+        "done": summary["num_simulations"] == num_simulations
+    }
+
 @app.post("/calculate_probability")
 async def calculate_probability_endpoint(request: ProbabilityRequest) -> Dict[str, Union[float, Dict[str, Union[int, float]]]]:
     """Calculate ruin probability and related statistics.
@@ -66,10 +331,385 @@ async def calculate_probability_endpoint(request: ProbabilityRequest) -> Dict[st
         request.win_probability
     )
 
+@app.post("/calculate_probability/batch")
+async def calculate_probability_batch_endpoint(request: BatchProbabilityRequest, http_request: Request) -> Response:
+    """Calculate ruin probabilities for many parameter points in one call.
+    
+    All points are evaluated in a single vectorized pass, and the result is
+    serialized straight from the NumPy arrays without per-point response models:
+    as JSON by default, or as a ``.npz`` archive for ``Accept: application/x-npz``.
+    
+    Args:
+        request (BatchProbabilityRequest): Columnar arrays of initial fortunes, target fortunes and win probabilities
+        http_request (Request): Underlying HTTP request, used for content negotiation
+        
+    Returns:
+        JSON or ``.npz`` response containing:
+            - ruin_probability (List[float]): Probability of losing all money for each point
+            - win_probability (List[float]): Probability of reaching target fortune for each point
+            - expected_duration (List[float]): Expected number of bets until game ends for each point
+            - count (int): Number of parameter points evaluated
+    """
+    count = len(request.initial_fortune)
+    if len(request.target_fortune) != count or len(request.win_probability) != count:
+        raise HTTPException(
+            status_code=422,
+            detail="initial_fortune, target_fortune and win_probability must have the same length"
+        )
+    
+    ruin_prob, win_prob, duration = await cpu_executor.run(
+        lookup_ruin_statistics,
+        np.asarray(request.initial_fortune),
+        np.asarray(request.target_fortune),
+        np.asarray(request.win_probability)
+    )
+    return _negotiated_response({
+        "ruin_probability": ruin_prob,
+        "win_probability": win_prob,
+        "expected_duration": duration,
+        "count": count
+    }, http_request)
+
+@app.post("/duration_distribution")
+async def duration_distribution_endpoint(request: DurationRequest) -> Dict[str, Union[float, int, Dict]]:
+    """Exact distribution of the number of bets until the game ends.
+    
+    Args:
+        request (DurationRequest): Game parameters, quantiles and histogram size
+        
+    Returns:
+        Dict as returned by ``calculate_duration_distribution``
+    """
+    if request.bins <= 0 or not all(0 <= q <= 1 for q in request.quantiles):
+        raise HTTPException(status_code=422, detail="bins must be positive and quantiles within [0, 1]")
+    if not 0 < request.eps < 1:
+        raise HTTPException(status_code=422, detail="eps must lie in (0, 1)")
+    
+    try:
+        return await cpu_executor.run(
+            calculate_duration_distribution,
+            request.initial_fortune, request.target_fortune, request.win_probability,
+            quantiles=request.quantiles, bins=request.bins, eps=request.eps
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+@app.post("/simulate")
+async def simulate_endpoint(request: SimulationRequest, http_request: Request) -> Response:
+    """Run a Monte Carlo simulation and return its summary.
+    
+    The result is JSON by default, or a ``.npz`` archive for
+    ``Accept: application/x-npz``, which carries per-walker arrays from
+    ``return_walkers`` as raw buffers.
+    
+    Args:
+        request (SimulationRequest): Simulation parameters; chunk_size is ignored
+        http_request (Request): Underlying HTTP request, used for content negotiation
+        
+    Returns:
+        JSON or ``.npz`` response with the fields returned by ``run_monte_carlo_simulation``
+    """
+    _check_simulation_request(request)
+    
+    result = await cpu_executor.run(
+        run_monte_carlo_simulation,
+        request.num_simulations, request.initial_fortune, request.target_fortune,
+        request.win_probability, seed=request.seed, max_steps=request.max_steps,
+        workers=request.workers, importance_sampling=request.importance_sampling,
+        antithetic=request.antithetic, confidence=request.confidence,
+        return_walkers=request.return_walkers
+    )
+    return _negotiated_response(result, http_request)
+
+@app.post("/simulate/stream")
+async def simulate_stream_endpoint(request: SimulationRequest, http_request: Request) -> StreamingResponse:
+    """Run a Monte Carlo simulation in chunks and stream running estimates.
+    
+    One NDJSON line is emitted after each chunk. Chunks are planned with the
+    same seed layout as ``run_monte_carlo_simulation``, so with the default
+    chunk size the final event matches a non-streamed run with the same seed.
+    The simulation stops as soon as the client disconnects, so callers can
+    simply stop reading once the interval is narrow enough.
+    
+    Args:
+        request (SimulationRequest): Simulation parameters and streaming options
+        http_request (Request): Underlying HTTP request, used to detect disconnects
+        
+    Returns:
+        StreamingResponse of NDJSON events, each containing:
+            - completed (int): Number of simulations finished so far
+            - num_simulations (int): Total number of simulations requested
+            - win_rate (float): Running proportion of simulations reaching target fortune
+            - confidence_interval (List[float]): Wilson interval for the win rate
+            - average_duration (float): Running average number of bets
+            - duration_percentiles (Dict[str, float]): Running p50, p90 and p99 of the number of bets
+            - max_duration (int): Maximum number of bets so far
+            - min_fortune (int): Minimum final fortune so far
+            - max_fortune (int): Maximum final fortune so far
+            - done (bool): Whether this is the last event
+    """
+    if request.num_simulations <= 0 or request.chunk_size <= 0:
+        raise HTTPException(status_code=422, detail="num_simulations and chunk_size must be positive")
+    
+    shards = plan_shards(
+        request.num_simulations, request.initial_fortune, request.target_fortune,
+        request.win_probability, max_steps=request.max_steps, seed=request.seed,
+        shard_size=request.chunk_size
+    )
+    # Admission is decided once, before the stream starts; later chunks of an
+    # admitted stream always run.
+    cpu_executor.check()
+    
+    async def events():
+        summary = None
+        for shard in shards:
+            if await http_request.is_disconnected():
+                return
+            partial = await cpu_executor.run_admitted(run_shard, shard)
+            record_simulation("monte_carlo", partial["num_simulations"], partial["total_duration"])
+            summary = partial if summary is None else merge_summaries([summary, partial])
+            yield json.dumps(_running_estimate(summary, request.num_simulations, request.confidence)) + "\n"
+    
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+@app.post("/analyze_strategy")
+async def analyze_strategy_endpoint(request: StrategyRequest) -> Dict[str, Union[str, float, Dict]]:
+    """Simulate a betting strategy and report its empirical risk.
+    
+    The simulation runs on the CPU executor so it does not block the event loop.
+    
+    Args:
+        request (StrategyRequest): Strategy, its parameters and simulation size
+        
+    Returns:
+        Dict as returned by ``analyze_betting_strategy``
+    """
+    _check_strategy_request(request)
+    
+    try:
+        return await cpu_executor.run(
+            analyze_betting_strategy,
+            request.strategy_type, request.bet_size, request.stop_loss,
+            request.win_probability, request.initial_fortune,
+            target_fortune=request.target_fortune, table_limit=request.table_limit,
+            num_walkers=request.num_walkers, max_rounds=request.max_rounds, seed=request.seed,
+            min_bet=request.min_bet
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+@app.post("/analyze_strategy/tournament")
+async def strategy_tournament_endpoint(request: TournamentRequest) -> Dict[str, Union[List, Dict]]:
+    """Compare strategies on common random numbers.
+    
+    Every strategy is played on the same win/loss outcomes, so the paired
+    differences need far fewer gamblers to resolve than independent runs.
+    
+    Args:
+        request (TournamentRequest): Strategies, shared game parameters and simulation size
+        
+    Returns:
+        Dict as returned by ``run_strategy_tournament``
+    """
+    _check_tournament_request(request)
+    
+    try:
+        return await cpu_executor.run(
+            run_strategy_tournament,
+            [spec.model_dump() for spec in request.strategies], request.stop_loss,
+            request.win_probability, request.initial_fortune,
+            target_fortune=request.target_fortune, table_limit=request.table_limit,
+            num_walkers=request.num_walkers, max_rounds=request.max_rounds,
+            seed=request.seed, confidence=request.confidence, min_bet=request.min_bet
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+def _simulation_job(request: SimulationRequest):
+    """Work function for a simulation job.
+    
+    Plain runs are simulated shard by shard with the layout of
+    ``run_monte_carlo_simulation``, reporting the running estimate after each
+    shard, so a seeded job returns the same result as ``/simulate``.
+    Importance-sampling runs are a single vectorized pass: they report no
+    progress, and a cancelled one runs to the end before its result is discarded.
+    """
+    def work(report):
+        if request.importance_sampling:
+            return run_monte_carlo_simulation(
+                request.num_simulations, request.initial_fortune, request.target_fortune,
+                request.win_probability, seed=request.seed, max_steps=request.max_steps,
+                importance_sampling=True, antithetic=request.antithetic,
+                confidence=request.confidence
+            )
+        shards = plan_shards(
+            request.num_simulations, request.initial_fortune, request.target_fortune,
+            request.win_probability, max_steps=request.max_steps, seed=request.seed
+        )
+        summary = None
+        for partial in map_shards(shards, request.workers):
+            record_simulation("monte_carlo", partial["num_simulations"], partial["total_duration"])
+            summary = partial if summary is None else merge_summaries([summary, partial])
+            report(summary["num_simulations"] / request.num_simulations,
+                   _running_estimate(summary, request.num_simulations, request.confidence))
+        return {
+            **finalize_summary(summary),
+            "parameters": {
+                "num_simulations": request.num_simulations,
+                "initial_fortune": request.initial_fortune,
+                "target_fortune": request.target_fortune,
+                "win_probability": request.win_probability
+            }
+        }
+    return work
+
+def _strategy_job(request: StrategyRequest):
+    """Work function for a strategy analysis job."""
+    return lambda report: analyze_betting_strategy(
+        request.strategy_type, request.bet_size, request.stop_loss,
+        request.win_probability, request.initial_fortune,
+        target_fortune=request.target_fortune, table_limit=request.table_limit,
+        num_walkers=request.num_walkers, max_rounds=request.max_rounds, seed=request.seed,
+        min_bet=request.min_bet
+    )
+
+def _tournament_job(request: TournamentRequest):
+    """Work function for a strategy tournament job."""
+    return lambda report: run_strategy_tournament(
+        [spec.model_dump() for spec in request.strategies], request.stop_loss,
+        request.win_probability, request.initial_fortune,
+        target_fortune=request.target_fortune, table_limit=request.table_limit,
+        num_walkers=request.num_walkers, max_rounds=request.max_rounds,
+        seed=request.seed, confidence=request.confidence, min_bet=request.min_bet
+    )
+
+# Job kinds: request model, validation and work function.
+JOB_KINDS = {
+    "simulate": (SimulationRequest, _check_simulation_job, _simulation_job),
+    "analyze_strategy": (StrategyRequest, _check_strategy_request, _strategy_job),
+    "tournament": (TournamentRequest, _check_tournament_request, _tournament_job),
+}
+
+@app.post("/jobs", status_code=202)
+async def submit_job_endpoint(request: JobRequest) -> Dict[str, Union[str, float, None, Dict]]:
+    """Queue a long-running computation and return at once.
+    
+    Jobs run on a small pool of worker threads (``JOB_WORKERS``, default 2),
+    separate from the threads serving requests. Poll ``GET /jobs/{job_id}``
+    for progress and the result.
+    
+    Args:
+        request (JobRequest): Kind of job and the parameters of the matching endpoint
+        
+    Returns:
+        Dict describing the queued job (see ``GET /jobs/{job_id}``)
+    """
+    if request.kind not in JOB_KINDS:
+        raise HTTPException(status_code=422, detail=f"kind must be one of {', '.join(JOB_KINDS)}")
+    model, check, make_work = JOB_KINDS[request.kind]
+    try:
+        parameters = model.model_validate(request.parameters)
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=json.loads(e.json()))
+    check(parameters)
+    
+    return job_queue.submit(request.kind, make_work(parameters)).to_dict()
+
+@app.get("/jobs/{job_id}")
+async def job_status_endpoint(job_id: str) -> Dict[str, Union[str, float, None, Dict]]:
+    """Report the state of a job.
+    
+    Args:
+        job_id (str): Id returned by ``POST /jobs``
+        
+    Returns:
+        Dict containing:
+            - id (str): Job id
+            - kind (str): Kind of job
+            - status (str): "queued", "running", "completed", "failed" or "cancelled"
+            - progress (float): Fraction of the work done
+            - partial (Optional[Dict]): Latest running estimate, for simulation jobs
+            - result (Optional[Dict]): Result of the matching endpoint once completed
+            - error (Optional[str]): Error message if the job failed
+            - created, started, finished (Optional[float]): Unix timestamps
+    """
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="job not found")
+    return job.to_dict()
+
+@app.delete("/jobs/{job_id}")
+async def cancel_job_endpoint(job_id: str) -> Dict[str, Union[str, float, None, Dict]]:
+    """Cancel a queued or running job, or delete a finished one.
+    
+    A running simulation stops after its current shard. Importance-sampling
+    simulations and strategy jobs run to the end, but their result is discarded.
+    
+    Args:
+        job_id (str): Id returned by ``POST /jobs``
+        
+    Returns:
+        Dict describing the job after the request
+    """
+    job = job_queue.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="job not found")
+    return job.to_dict()
+
+@app.get("/cache/stats")
+async def cache_stats_endpoint() -> Dict[str, Optional[Union[int, float]]]:
+    """Report result cache occupancy and hit/miss counters.
+    
+    Returns:
+        Dict containing hits, misses, evictions, hit_ratio, entries, bytes
+        and the configured limits (max_entries, max_bytes, ttl)
+    """
+    return result_cache.stats()
+
+def _collect_runtime_metrics():
+    """Metrics read from the cache, the CPU executor and the job queue at scrape time."""
+    cache = result_cache.stats()
+    executor = cpu_executor.stats()
+    jobs = job_queue.stats()
+    yield snapshot(Counter, "gamblers_ruin_cache_hits_total", "Result cache hits.", cache["hits"])
+    yield snapshot(Counter, "gamblers_ruin_cache_misses_total", "Result cache misses.", cache["misses"])
+    yield snapshot(Counter, "gamblers_ruin_cache_evictions_total", "Result cache evictions.", cache["evictions"])
+    yield snapshot(Gauge, "gamblers_ruin_cache_hit_ratio", "Result cache hits per lookup since start.", cache["hit_ratio"])
+    yield snapshot(Gauge, "gamblers_ruin_cache_entries", "Results held in the cache.", cache["entries"])
+    yield snapshot(Gauge, "gamblers_ruin_cache_bytes", "Approximate memory held by cached results.", cache["bytes"])
+    yield snapshot(Gauge, "gamblers_ruin_executor_workers", "Threads of the CPU executor.", executor["max_workers"])
+    yield snapshot(Gauge, "gamblers_ruin_executor_pending", "Tasks running or queued on the CPU executor.", executor["pending"])
+    yield snapshot(Gauge, "gamblers_ruin_executor_queue_depth", "Tasks waiting for a CPU executor thread.", executor["queued"])
+    yield snapshot(Counter, "gamblers_ruin_executor_rejected_total", "Requests rejected while the CPU executor was saturated.", executor["rejected"])
+    job_gauge = Gauge("gamblers_ruin_jobs", "Retained background jobs by status.", ("status",))
+    for status, count in jobs.items():
+        if status != "workers":
+            job_gauge.set(count, status)
+    yield job_gauge
+
+registry.add_collector(_collect_runtime_metrics)
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint() -> PlainTextResponse:
+    """Expose service metrics in the Prometheus text format.
+    
+    Includes per-route request counts and latency histograms, requests in
+    flight, result cache counters, simulated walkers and bets (use ``rate()``
+    for throughput), CPU executor queue depth and background job counts.
+    
+    Returns:
+        PlainTextResponse in the Prometheus exposition format, version 0.0.4
+    """
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 @app.post("/chat")
-async def chat_endpoint(request: ChatRequest) -> Dict[str, Union[str, List[str], Dict[str, str]]]:
+async def chat_endpoint(request: ChatRequest) -> Dict[str, Union[str, List[str], Dict[str, Union[str, float]]]]:
     """Provide strategy advice and explanations based on game state.
     
+    The message is routed to an intent of ``src.chat.INTENTS`` by its
+    keywords. Strategy, probability and risk answers include the ruin
+    statistics of the current game from ``calculate_ruin_probability``.
+    
     Args:
         request (ChatRequest): Request containing message, language preference, and game state
         
@@ -79,94 +719,43 @@ async def chat_endpoint(request: ChatRequest) -> Dict[str, Union[str, List[str],
             - suggested_actions (List[str]): Recommended actions
             - analysis (Dict): Risk analysis and game statistics
     """
-    message = request.message.lower()
-    lang = request.language
-    
-    # Strategy advice
-    if "strategy" in message or "策略" in message:
-        if request.game_state["win_probability"] < 0.5:
-            return {
-                "response": (
-                    "Based on current win probability < 0.5, this is an unfavorable game. Consider:\n"
-                    "1. Decreasing your bet size\n"
-                    "2. Setting a strict loss limit\n"
-                    "3. Avoiding the martingale strategy"
-                ) if lang == "English" else (
-                    "基于当前胜率小于0.5，这是一个不利的游戏。建议：\n"
-                    "1. 降低赌注大小\n"
-                    "2. 设置严格的损失限制\n"
-                    "3. 避免使用马丁格尔策略"
-                ),
-                "suggested_actions": ["decrease_bet", "set_loss_limit"],
-                "analysis": {
-                    "risk_level": "high",
-                    "win_probability": request.game_state["win_probability"]
-                }
-            }
-        else:
-            return {
-                "response": (
-                    "Current win probability > 0.5 suggests a favorable game. Consider:\n"
-                    "1. Using Kelly criterion for optimal betting\n"
-                    "2. Setting a win target\n"
-                    "3. Maintaining consistent bet sizes"
-                ) if lang == "English" else (
-                    "当前胜率大于0.5，这是一个有利的游戏。建议：\n"
-                    "1. 使用凯利准则优化下注\n"
-                    "2. 设置合理的盈利目标\n"
-                    "3. 保持稳定的赌注大小"
-                ),
-                "suggested_actions": ["use_kelly", "set_target"],
-                "analysis": {
-                    "risk_level": "moderate",
-                    "win_probability": request.game_state["win_probability"]
-                }
-            }
-    
-    # Probability explanation
-    elif "probability" in message or "概率" in message:
-        return {
-            "response": (
-                f"Current game statistics:\n"
-                f"- Win probability: {request.game_state['win_probability']:.2f}\n"
-                f"- Expected value per bet: ${(2*request.game_state['win_probability']-1):.2f}"
-            ) if lang == "English" else (
-                f"当前游戏统计：\n"
-                f"- 胜率：{request.game_state['win_probability']:.2f}\n"
-                f"- 每次下注期望值：${(2*request.game_state['win_probability']-1):.2f}"
-            ),
-            "suggested_actions": ["view_math_analysis"],
-            "analysis": {
-                "risk_level": "info",
-                "win_probability": request.game_state["win_probability"]
-            }
-        }
-    
-    # Default response
+    game = _chat_game_state(request.game_state)
+    intent = chat_router.route(request.message)
+    if intent.analytics:
+        stats = calculate_ruin_probability(game["current_fortune"], game["target_fortune"],
+                                           game["win_probability"])
+        game.update(
+            ruin_probability=stats["ruin_probability"],
+            target_probability=stats["win_probability"],
+            expected_duration=stats["expected_duration"],
+        )
+    text, response = intent.respond(game, request.language)
+
+    analysis = {"risk_level": response["risk_level"]}
+    if intent.analytics:
+        analysis.update(
+            win_probability=game["win_probability"],
+            ruin_probability=game["ruin_probability"],
+            expected_duration=game["expected_duration"],
+        )
+    else:
+        analysis["api_type"] = "general"
     return {
-        "response": (
-            "I can help you with:\n"
-            "1. Game strategy analysis\n"
-            "2. Probability calculations\n"
-            "3. Risk assessment\n"
-            "What would you like to know?"
-        ) if lang == "English" else (
-            "我可以帮您：\n"
-            "1. 分析游戏策略\n"
-            "2. 计算概率\n"
-            "3. 评估风险\n"
-            "请问您需要了解哪方面的信息？"
-        ),
-        "suggested_actions": ["view_strategy", "view_probability", "view_risk"],
-        "analysis": {
-            "risk_level": "info",
-            "api_type": "general"
-        }
+        "response": text,
+        "suggested_actions": list(response["suggested_actions"]),
+        "analysis": analysis
     }
 
+@cached(result_cache)
+@profiled
 def calculate_ruin_probability(initial_fortune: int, target_fortune: int, win_probability: float) -> Dict[str, Union[float, Dict[str, Union[int, float]]]]:
     """Calculate ruin probability and related statistics for Gambler's Ruin problem.
     
+    Grid points are read from the precomputed surface in ``src.surface`` when
+    one has been built. Everything else is evaluated in log space by
+    ``src.analytics.ruin_statistics``, so the result stays finite for any win
+    probability and target fortune.
+    
     Args:
         initial_fortune (int): Starting amount of money
         target_fortune (int): Target amount to reach
@@ -179,16 +768,84 @@ def calculate_ruin_probability(initial_fortune: int, target_fortune: int, win_pr
             - expected_duration (float): Expected number of bets until game ends
             - parameters (Dict): Input parameters used in calculation
     """
-    q = 1 - win_probability  # failure probability
-    if win_probability == 0.5:
-        ruin_prob = 1 - (initial_fortune / target_fortune)
-    else:
-        ruin_prob = ((q/win_probability)**initial_fortune - 1) / ((q/win_probability)**target_fortune - 1)
+    ruin_prob, win_prob, duration = lookup_ruin_statistics(initial_fortune, target_fortune, win_probability)
     
     return {
-        "ruin_probability": ruin_prob,
-        "win_probability": 1 - ruin_prob,
-        "expected_duration": initial_fortune * target_fortune,  # simplified expected duration
+        "ruin_probability": float(ruin_prob),
+        "win_probability": float(win_prob),
+        "expected_duration": float(duration),
+        "parameters": {
+            "initial_fortune": initial_fortune,
+            "target_fortune": target_fortune,
+            "win_probability": win_probability
+        }
+    }
+
+@cached(result_cache)
+@profiled
+def calculate_duration_distribution(initial_fortune: int, target_fortune: int, win_probability: float,
+                                    quantiles: List[float] = (0.5, 0.9, 0.99), bins: int = 50,
+                                    eps: float = 1e-12) -> Dict[str, Union[float, int, Dict]]:
+    """Exact distribution of the game duration T (number of bets).
+    
+    ``P(T = t)`` comes from the closed-form generating function evaluated
+    with an FFT in ``src.duration``; no walkers are simulated. The
+    distribution covers at most ``MAX_LENGTH`` bets. A longer game is
+    truncated there if at most ``MAX_TAIL`` of the probability lies beyond,
+    and rejected otherwise.
+    
+    Args:
+        initial_fortune (int): Starting amount of money
+        target_fortune (int): Target amount to reach
+        win_probability (float): Probability of winning each bet
+        quantiles (List[float]): Duration quantiles to report
+        bins (int): Number of histogram bins
+        eps (float): Probability mass that may be left beyond the computed range
+        
+    Returns:
+        Dict containing:
+            - ruin_probability (float): Probability of losing all money
+            - win_probability (float): Probability of reaching target fortune
+            - mean_duration (float): Expected number of bets
+            - std_duration (float): Standard deviation of the number of bets
+            - quantiles (Dict[str, int]): Duration at each requested quantile
+            - histogram (Dict): Bin edges and the probability of each bin
+            - survival (Dict): P(T > t) at the lower histogram edges
+            - tail_probability (float): Probability that the game outlasts the
+              computed range, P(T > max_duration)
+            - max_duration (int): Last number of bets covered by the distribution
+            - parameters (Dict): Input parameters used in calculation
+        
+    Raises:
+        ValueError: If the game is too long for the distribution to be computed
+    """
+    ruin_pmf, win_pmf = duration_distribution(initial_fortune, target_fortune, win_probability, eps=eps)
+    pmf = ruin_pmf + win_pmf
+    t = np.arange(pmf.size)
+    mean = float(t @ pmf)
+    std = float(np.sqrt(max((t * t) @ pmf - mean * mean, 0.0)))
+    
+    edges = np.unique(np.linspace(0, pmf.size, bins + 1).round().astype(np.int64))
+    survival = duration_survival(pmf)
+    
+    return {
+        "ruin_probability": float(ruin_pmf.sum()),
+        "win_probability": float(win_pmf.sum()),
+        "mean_duration": mean,
+        "std_duration": std,
+        "quantiles": {
+            f"{q:g}": int(value) for q, value in zip(quantiles, duration_quantiles(pmf, quantiles))
+        },
+        "histogram": {
+            "edges": edges.tolist(),
+            "probabilities": np.add.reduceat(pmf, edges[:-1]).tolist()
+        },
+        "survival": {
+            "duration": edges[:-1].tolist(),
+            "probability": survival[edges[:-1]].tolist()
+        },
+        "tail_probability": duration_tail(initial_fortune, target_fortune, win_probability, pmf.size - 1),
+        "max_duration": pmf.size - 1,
         "parameters": {
             "initial_fortune": initial_fortune,
             "target_fortune": target_fortune,
@@ -196,106 +853,273 @@ def calculate_ruin_probability(initial_fortune: int, target_fortune: int, win_pr
         }
     }
 
-def analyze_betting_strategy(strategy_type: str, bet_size: float, stop_loss: float, 
-                           win_probability: float, initial_fortune: float) -> Dict[str, Union[str, float, Dict[str, Union[str, float]]]]:
+@cached(result_cache, seed_arg="seed")
+@profiled
+def analyze_betting_strategy(strategy_type: str, bet_size: float, stop_loss: Optional[float], 
+                           win_probability: float, initial_fortune: float,
+                           table_limit: Optional[float] = None, num_walkers: int = 10_000,
+                           max_rounds: int = 1_000, seed: Optional[int] = 0,
+                           target_fortune: Optional[float] = None,
+                           min_bet: float = 1.0) -> Dict[str, Union[str, float, Dict]]:
     """Analyze different betting strategies for Gambler's Ruin problem.
     
+    The strategy is played by ``num_walkers`` simulated gamblers at once with
+    the vectorized engine in ``src.strategies``, and every figure below is
+    measured on those walkers. Bets below the table minimum ``min_bet``, such
+    as a small Kelly fraction of a small fortune, are raised to it. A gambler
+    stops when it can no longer cover ``min_bet``, when its losses reach
+    ``stop_loss``, when its wealth reaches ``target_fortune``, or after
+    ``max_rounds`` bets. The default seed makes
+    repeated calls return the same, cacheable result; pass ``seed=None`` for
+    a fresh sample.
+    
     Args:
         strategy_type (str): Type of betting strategy ("Martingale", "Kelly", or "Fixed")
         bet_size (float): Initial bet size
-        stop_loss (float): Maximum loss limit
+        stop_loss (Optional[float]): Maximum loss limit; None for no limit
         win_probability (float): Probability of winning each bet
         initial_fortune (float): Starting amount of money
+        table_limit (Optional[float]): Largest bet the table accepts
+        num_walkers (int): Number of simulated gamblers
+        max_rounds (int): Maximum number of bets per gambler
+        seed (Optional[int]): Seed for the random generator
+        target_fortune (Optional[float]): Wealth at which a gambler stops
+        min_bet (float): Smallest bet the table accepts
         
     Returns:
         Dict containing:
             - strategy (str): Strategy type
-            - risk_level (str): Risk assessment ("High", "Medium", "Low")
-            - max_bet (float): Maximum bet size
-            - max_loss (float): Maximum possible loss
+            - risk_level (str): Risk assessment ("High", "Medium", "Low") from the
+              simulated probability of ruin or hitting the stop-loss
+            - max_bet (float): Largest bet placed by any gambler
+            - max_loss (float): Largest loss suffered by any gambler
             - recommended_bet_size (float): Recommended bet size
+            - simulation (Dict): Empirical statistics from ``summarize_strategy``
             - parameters (Dict): Input parameters used in analysis
     """
-    if strategy_type == "Martingale":
+    rule = make_rule(strategy_type, bet_size, win_probability)
+    outcome, = simulate_strategies(
+        [rule], initial_fortune, win_probability,
+        num_walkers=num_walkers, max_rounds=max_rounds, stop_loss=stop_loss,
+        target_fortune=target_fortune, table_limit=table_limit, min_bet=min_bet,
+        rng=np.random.default_rng(seed)
+    )
+    record_simulation("strategy", outcome["rounds"].size, int(outcome["rounds"].sum()))
+    stats = summarize_strategy(outcome, initial_fortune)
+    
+    loss_probability = stats["ruin_probability"] + stats["stop_loss_probability"]
+    if loss_probability >= 0.5:
         risk_level = "High"
-        max_loss = stop_loss
-        max_bet = bet_size * (2 ** (stop_loss // bet_size))
-    elif strategy_type == "Kelly":
-        edge = 2 * win_probability - 1
-        kelly_fraction = edge / 1.0 if edge > 0 else 0
+    elif loss_probability >= 0.1:
         risk_level = "Medium"
-        max_bet = kelly_fraction * initial_fortune
-        max_loss = initial_fortune * (1 - kelly_fraction)
-    else:  # Fixed
+    else:
         risk_level = "Low"
-        max_bet = bet_size
-        max_loss = stop_loss
 
     return {
         "strategy": strategy_type,
         "risk_level": risk_level,
-        "max_bet": max_bet,
-        "max_loss": max_loss,
+        "max_bet": stats["max_bet"],
+        "max_loss": stats["max_loss"],
         "recommended_bet_size": min(bet_size, initial_fortune * 0.1),
+        "simulation": stats,
         "parameters": {
             "strategy_type": strategy_type,
             "initial_bet_size": bet_size,
             "stop_loss": stop_loss,
-            "win_probability": win_probability
+            "win_probability": win_probability,
+            "target_fortune": target_fortune,
+            "table_limit": table_limit,
+            "min_bet": min_bet,
+            "num_walkers": num_walkers,
+            "max_rounds": max_rounds
+        }
+    }
+
+@cached(result_cache, seed_arg="seed")
+@profiled
+def run_strategy_tournament(strategies: List[Dict[str, Union[str, float, None]]], stop_loss: float,
+                            win_probability: float, initial_fortune: float,
+                            table_limit: Optional[float] = None, num_walkers: int = 10_000,
+                            max_rounds: int = 1_000, seed: Optional[int] = 0,
+                            confidence: float = 0.95,
+                            target_fortune: Optional[float] = None,
+                            min_bet: float = 1.0) -> Dict[str, Union[List, Dict]]:
+    """Rank betting strategies on common random numbers.
+    
+    All strategies are simulated in a single pass over shared outcome
+    streams, so gambler ``i`` of every strategy sees the same sequence of wins
+    and losses. Differences are then measured gambler by gambler, which
+    cancels the noise the strategies share; ``variance_reduction`` in each
+    comparison reports how many times fewer gamblers this needs than
+    independent runs.
+    
+    Args:
+        strategies (List[Dict]): Strategy specifications with strategy_type and
+            optionally bet_size, multiplier, kelly_multiplier and name
+        stop_loss (float): Maximum loss limit
+        win_probability (float): Probability of winning each bet
+        initial_fortune (float): Starting amount of money
+        table_limit (Optional[float]): Largest bet the table accepts
+        num_walkers (int): Number of simulated gamblers per strategy
+        max_rounds (int): Maximum number of bets per gambler
+        seed (Optional[int]): Seed for the random generator
+        confidence (float): Confidence level of the paired intervals
+        target_fortune (Optional[float]): Wealth at which a gambler stops
+        min_bet (float): Smallest bet the table accepts; smaller bets are raised to it
+        
+    Returns:
+        Dict containing:
+            - ranking (List[str]): Strategy names by decreasing mean final wealth
+            - strategies (Dict): Empirical statistics by strategy name
+            - comparisons (List[Dict]): Paired differences of final wealth and
+              loss probability, with confidence intervals, for every pair
+            - parameters (Dict): Input parameters used in the tournament
+    """
+    rules = [
+        make_rule(spec["strategy_type"], spec.get("bet_size", 1.0), win_probability,
+                  multiplier=spec.get("multiplier", 2.0),
+                  kelly_multiplier=spec.get("kelly_multiplier", 1.0), name=spec.get("name"))
+        for spec in strategies
+    ]
+    result = run_tournament(
+        rules, initial_fortune, win_probability, confidence=confidence,
+        num_walkers=num_walkers, max_rounds=max_rounds, stop_loss=stop_loss,
+        target_fortune=target_fortune, table_limit=table_limit, min_bet=min_bet,
+        rng=np.random.default_rng(seed)
+    )
+    for stats in result["strategies"].values():
+        record_simulation("strategy", num_walkers, round(stats["average_rounds"] * num_walkers))
+    
+    return {
+        **result,
+        "parameters": {
+            "stop_loss": stop_loss,
+            "win_probability": win_probability,
+            "initial_fortune": initial_fortune,
+            "target_fortune": target_fortune,
+            "table_limit": table_limit,
+            "min_bet": min_bet,
+            "num_walkers": num_walkers,
+            "max_rounds": max_rounds,
+            "confidence": confidence
         }
     }
 
+@cached(result_cache, ignore=("workers",), seed_arg="seed")
+@profiled
 def run_monte_carlo_simulation(num_simulations: int, initial_fortune: int, 
-                             target_fortune: int, win_probability: float) -> Dict[str, Union[float, int, Dict[str, Union[int, float]]]]:
+                             target_fortune: int, win_probability: float,
+                             seed: Optional[int] = None, max_steps: int = 1000,
+                             workers: Optional[int] = 1, importance_sampling: bool = False,
+                             antithetic: bool = False, confidence: float = 0.95,
+                             return_walkers: bool = False) -> Dict[str, Union[str, float, int, List[float], None, np.ndarray, Dict[str, Union[int, float]]]]:
     """Run Monte Carlo simulation for Gambler's Ruin problem.
     
+    All walkers are advanced together by the vectorized engine in
+    ``src.simulation``; each walker stops at 0, at the target, or after
+    ``max_steps`` bets. Walkers are simulated in fixed-size shards with
+    their own ``SeedSequence`` streams, so a seeded run gives the same result
+    for any number of workers.
+    
+    Far from a fair game the probability of the unlikely outcome (winning for
+    ``p < 0.5``, ruin for ``p > 0.5``) can be far below ``1 / num_simulations``,
+    and the plain estimate is then 0. With ``importance_sampling`` the walkers
+    play the tilted game instead (see
+    ``src.simulation.importance_sampling_estimate``), which resolves such
+    probabilities with a few thousand walkers. This mode runs in-process and
+    reports the estimate with its error instead of duration and fortune
+    statistics.
+    
     Args:
         num_simulations (int): Number of simulations to run
         initial_fortune (int): Starting amount of money
         target_fortune (int): Target amount to reach
         win_probability (float): Probability of winning each bet
+        seed (Optional[int]): Seed for the random generator, for reproducible runs
+        max_steps (int): Maximum number of bets in any simulation
+        workers (Optional[int]): Worker processes of the shared pool to shard over,
+            at most ``MAX_WORKERS``; None uses all of them
+        importance_sampling (bool): Estimate the unlikely outcome by exponential tilting
+        antithetic (bool): With importance sampling, simulate antithetic walker pairs
+        confidence (float): Confidence level of the importance-sampling interval
+        return_walkers (bool): Also return per-walker arrays; the shards then run in-process
         
     Returns:
         Dict containing:
             - win_rate (float): Proportion of simulations reaching target fortune
             - average_duration (float): Average number of bets until game ends
+            - duration_std (float): Standard deviation of the number of bets
+            - duration_percentiles (Dict[str, float]): p50, p90 and p99 of the number
+              of bets, within 1% relative error
             - max_duration (int): Maximum number of bets in any simulation
             - min_fortune (int): Minimum final fortune across all simulations
             - max_fortune (int): Maximum final fortune across all simulations
+            - fortune_histogram (Dict): Bin edges and counts of the final fortunes
             - parameters (Dict): Input parameters used in simulation
+        With return_walkers, also:
+            - durations (np.ndarray): Number of bets played by each walker
+            - final_fortunes (np.ndarray): Fortune of each walker when it stopped
+        With importance_sampling, the duration and fortune statistics are
+        replaced by:
+            - ruin_rate (float): Estimated probability of ruin
+            - event (str): The outcome that was estimated directly ("win" or "ruin")
+            - std_error (Optional[float]): Standard error of the estimate
+            - relative_error (Optional[float]): Standard error relative to the estimate
+            - confidence_interval (List[float]): Interval for the estimated outcome
+            - log10_probability (Optional[float]): Base-10 log of the estimated outcome
+            - exact (bool): Whether the outcome is certain and its probability exact
+            - saturated (bool): Whether every tilted walker reached the outcome, in
+              which case the errors are None and only the interval is reported
     """
-    results: List[bool] = []
-    durations: List[int] = []
-    final_fortunes: List[int] = []
-    
-    for _ in range(num_simulations):
-        fortune = initial_fortune
-        steps = 0
-        while fortune > 0 and fortune < target_fortune and steps < 1000:
-            if np.random.random() < win_probability:
-                fortune += 1
-            else:
-                fortune -= 1
-            steps += 1
-        results.append(fortune >= target_fortune)
-        durations.append(steps)
-        final_fortunes.append(fortune)
-    
-    win_rate = sum(results) / num_simulations
-    avg_duration = sum(durations) / num_simulations
+    parameters = {
+        "num_simulations": num_simulations,
+        "initial_fortune": initial_fortune,
+        "target_fortune": target_fortune,
+        "win_probability": win_probability
+    }
     
-    return {
-        "win_rate": win_rate,
-        "average_duration": avg_duration,
-        "max_duration": max(durations),
-        "min_fortune": min(final_fortunes),
-        "max_fortune": max(final_fortunes),
-        "parameters": {
-            "num_simulations": num_simulations,
-            "initial_fortune": initial_fortune,
-            "target_fortune": target_fortune,
-            "win_probability": win_probability
+    if importance_sampling:
+        estimate = importance_sampling_estimate(
+            num_simulations, initial_fortune, target_fortune, win_probability,
+            antithetic=antithetic, max_steps=max_steps, confidence=confidence,
+            rng=np.random.default_rng(seed)
+        )
+        # The tilted walkers' bets are not counted by the estimator.
+        record_simulation("importance_sampling", num_simulations, 0)
+        rare = estimate["probability"]
+        return {
+            "win_rate": rare if estimate["event"] == "win" else 1 - rare,
+            "ruin_rate": rare if estimate["event"] == "ruin" else 1 - rare,
+            "event": estimate["event"],
+            "std_error": estimate["std_error"],
+            "relative_error": estimate["relative_error"],
+            "confidence_interval": estimate["confidence_interval"],
+            "log10_probability": estimate["log10_probability"],
+            "exact": estimate["exact"],
+            "saturated": estimate["saturated"],
+            "parameters": parameters
         }
+    
+    if return_walkers:
+        shards = plan_shards(num_simulations, initial_fortune, target_fortune,
+                             win_probability, max_steps=max_steps, seed=seed)
+        outcomes = [simulate_shard(shard) for shard in shards]
+        durations = np.concatenate([durations for durations, _ in outcomes])
+        final_fortunes = np.concatenate([final_fortunes for _, final_fortunes in outcomes])
+        summary = summarize_walkers(durations, final_fortunes, target_fortune)
+        walkers = {"durations": durations, "final_fortunes": final_fortunes}
+    else:
+        summary = simulate_sharded(
+            num_simulations, initial_fortune, target_fortune, win_probability,
+            max_steps=max_steps, seed=seed, workers=workers
+        )
+        walkers = {}
+    record_simulation("monte_carlo", summary["num_simulations"], summary["total_duration"])
+    
+    return {
+        **finalize_summary(summary),
+        "parameters": parameters,
+        **walkers
     }
 
 if __name__ == "__main__":
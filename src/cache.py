@@ -0,0 +1,177 @@
+"""
+Bounded in-process result cache for API computations.
+
+Results are keyed on the function name and its normalized arguments, and are
+evicted by least-recent use, by age (TTL) and by an approximate memory cap.
+The cache is shared by all requests handled by one worker process.
+"""
+
+import functools
+import inspect
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple, Union
+
+import numpy as np
+
+
+def _normalize(value: Any) -> Hashable:
+    """Turn an argument into a hashable key component.
+
+    Integral floats and NumPy scalars compare equal to the matching Python
+    number, so ``50``, ``50.0`` and ``np.int64(50)`` share one cache entry.
+    """
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, (list, tuple)):
+        return tuple(_normalize(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _normalize(v)) for k, v in value.items()))
+    return value
+
+
+def _sizeof(value: Any) -> int:
+    """Approximate the memory held by a cached result, in bytes."""
+    if isinstance(value, np.ndarray):
+        return value.nbytes + sys.getsizeof(value)
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_sizeof(k) + _sizeof(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(_sizeof(v) for v in value)
+    return size
+
+
+class ResultCache:
+    """Thread-safe LRU cache with TTL expiry and a memory cap.
+
+    Attributes:
+        max_entries (int): Maximum number of cached results
+        ttl (Optional[float]): Seconds a result stays valid; None disables expiry
+        max_bytes (int): Approximate upper bound on the memory held by results
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl: Optional[float] = 300.0,
+                 max_bytes: int = 64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Look up a key.
+
+        Returns:
+            Tuple of (found, value); value is None when not found
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] < time.monotonic():
+                self._remove(key)
+                self.evictions += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[0]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting least recently used entries as needed."""
+        size = _sizeof(value)
+        if size > self.max_bytes or self.max_entries <= 0:
+            return
+        expires = time.monotonic() + self.ttl if self.ttl is not None else float("inf")
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, expires, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, Optional[Union[int, float]]]:
+        """Report cache occupancy and hit/miss counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+            }
+
+    def _remove(self, key: Hashable) -> None:
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+
+def cached(cache: ResultCache, ignore: Iterable[str] = (), seed_arg: Optional[str] = None) -> Callable:
+    """Memoize a function in ``cache`` keyed on its normalized arguments.
+
+    Args:
+        cache (ResultCache): Cache that stores the results
+        ignore (Iterable[str]): Arguments that do not affect the result (e.g. worker counts)
+        seed_arg (Optional[str]): For stochastic functions, the name of the seed argument.
+            Calls without a seed are never cached, since each one should draw fresh samples.
+
+    Returns:
+        Decorator wrapping the function
+    """
+    ignore = frozenset(ignore)
+
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            if seed_arg is not None and bound.arguments[seed_arg] is None:
+                return func(*args, **kwargs)
+            key = (func.__qualname__,) + tuple(
+                (name, _normalize(value))
+                for name, value in bound.arguments.items() if name not in ignore
+            )
+            found, value = cache.get(key)
+            if not found:
+                value = func(*args, **kwargs)
+                cache.put(key, value)
+            return value
+
+        return wrapper
+
+    return decorator
+
+
+# Process-wide cache used by the API. A TTL of 0 or less disables expiry.
+_ttl = float(os.environ.get("RESULT_CACHE_TTL", "300"))
+result_cache = ResultCache(
+    max_entries=int(os.environ.get("RESULT_CACHE_MAX_ENTRIES", "1024")),
+    ttl=_ttl if _ttl > 0 else None,
+    max_bytes=int(os.environ.get("RESULT_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+)
@@ -0,0 +1,202 @@
+"""
+Rendered charts for the Streamlit pages, cached as image bytes.
+
+Building a matplotlib figure and rasterizing it costs far more than the
+numbers behind it, and the pages used to do both on every rerun. The chart
+functions here render with the Agg canvas directly (no pyplot state) and
+return PNG or SVG bytes, which pages show with ``st.image``. Charts that depend
+only on their parameters are memoized in ``chart_cache``, a size-bounded LRU
+shared by all sessions of the server process, so a repeated view is a
+dictionary lookup.
+
+Matplotlib is imported on the first render, not when a page imports this
+module, so pages that do not draw anything yet load without it.
+"""
+
+import io
+import os
+from typing import Callable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.cache import ResultCache, cached
+from src.page_compute import credit_limit_sweep, ruin_curve, transition_matrix
+from src.simulation import BAND_QUANTILES
+
+# Colour scheme shared by the pages.
+COLORS = ['#FF9999', '#66B2FF', '#99FF99', '#FFCC99', '#FF99CC']
+
+# Resolution of rendered PNGs.
+DPI = 150
+
+# Buckets per decimated trajectory, about one per horizontal pixel of a chart.
+PATH_BUCKETS = 600
+
+# Rendered charts by chart name and parameters. Entries never expire; the
+# byte bound keeps the cache small.
+chart_cache = ResultCache(
+    max_entries=int(os.environ.get("CHART_CACHE_MAX_ENTRIES", "512")),
+    ttl=None,
+    max_bytes=int(os.environ.get("CHART_CACHE_MAX_BYTES", str(32 * 1024 * 1024))),
+)
+
+_colormap = None
+
+
+def _custom_colormap():
+    global _colormap
+    if _colormap is None:
+        from matplotlib.colors import LinearSegmentedColormap
+        _colormap = LinearSegmentedColormap.from_list('custom', COLORS)
+    return _colormap
+
+
+def render(draw: Callable, figsize: Optional[Tuple[float, float]] = (4, 3), fmt: str = "png") -> bytes:
+    """Draw a figure and return it encoded as an image.
+
+    Args:
+        draw (Callable): Called with ``(figure, axes)`` to draw the chart
+        figsize (Optional[Tuple[float, float]]): Figure size in inches; None for matplotlib's default
+        fmt (str): Image format, "png" or "svg"
+
+    Returns:
+        Encoded image bytes
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    draw(fig, ax)
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format=fmt, dpi=DPI, bbox_inches="tight")
+    return buffer.getvalue()
+
+
+@cached(chart_cache)
+def transition_heatmap(states: int, win_probability: float, fmt: str = "png") -> bytes:
+    """Heatmap of the transition matrix of a game with ``states`` states."""
+    P = transition_matrix(states, win_probability)
+
+    def draw(fig, ax):
+        im = ax.imshow(P, cmap=_custom_colormap())
+        fig.colorbar(im)
+        ax.set_title("Transition Matrix Heatmap")
+        ax.set_xlabel("To State")
+        ax.set_ylabel("From State")
+
+    return render(draw, fmt=fmt)
+
+
+@cached(chart_cache)
+def ruin_curve_chart(target_fortune: int, win_probability: float, fmt: str = "png") -> bytes:
+    """Ruin probability against the initial fortune, for fortunes up to the target."""
+    fortunes, ruin_probs = ruin_curve(target_fortune, win_probability)
+
+    def draw(fig, ax):
+        ax.plot(fortunes, ruin_probs, color=COLORS[0])
+        ax.set_xlabel("Initial Fortune ($)")
+        ax.set_ylabel("Probability of Ruin")
+        ax.set_title("Ruin Probability vs Initial Fortune")
+        ax.grid(True)
+
+    return render(draw, fmt=fmt)
+
+
+@cached(chart_cache)
+def credit_limit_chart(initial_fortune: int, target_fortune: int, win_probability: float,
+                       stop: int, max_bet: int = 1, interest_rate: float = 0.0,
+                       marker: Optional[int] = None, figsize: Optional[Tuple[float, float]] = (4, 3),
+                       fmt: str = "png") -> bytes:
+    """Ruin probability against the credit limit, for limits below ``stop``.
+
+    Args:
+        initial_fortune (int): Starting amount of money
+        target_fortune (int): Target amount to reach
+        win_probability (float): Probability of winning each bet
+        stop (int): Credit limits ``0 .. stop - 1`` are plotted
+        max_bet (int): Largest bet placed in one round
+        interest_rate (float): Interest charged on the debt after every bet
+        marker (Optional[int]): Credit limit to highlight
+        figsize (Optional[Tuple[float, float]]): Figure size in inches; None for matplotlib's default
+        fmt (str): Image format, "png" or "svg"
+    """
+    credit_limits, ruin_probs = credit_limit_sweep(
+        initial_fortune, target_fortune, win_probability, stop,
+        max_bet=max_bet, interest_rate=interest_rate
+    )
+
+    def draw(fig, ax):
+        ax.plot(credit_limits, ruin_probs, color=COLORS[0])
+        if marker is not None:
+            ax.plot(marker, ruin_probs[marker], 'o', color=COLORS[1])
+        ax.set_xlabel("Credit Limit ($)")
+        ax.set_ylabel("Probability of Ruin")
+        ax.set_title("Ruin Probability vs Credit Limit")
+        ax.grid(True)
+
+    return render(draw, figsize=figsize, fmt=fmt)
+
+
+def decimate(values: np.ndarray, buckets: int = PATH_BUCKETS) -> Tuple[np.ndarray, np.ndarray]:
+    """Downsample a trajectory to its minimum and maximum per bucket.
+
+    The line through the kept points covers the same vertical range as the
+    full trajectory in every bucket, so at one bucket per pixel the plot
+    looks the same while drawing at most ``2 * buckets + 1`` points.
+
+    Args:
+        values (np.ndarray): Trajectory, one value per step
+        buckets (int): Number of buckets
+
+    Returns:
+        Tuple of (steps, values) of the kept points, in step order
+    """
+    size = values.size
+    if size <= 2 * buckets:
+        return np.arange(size), values
+    width = -(-size // buckets)
+    # Pad with the last value, which adds no new extremes.
+    padded = np.concatenate([values, np.repeat(values[-1:], width * buckets - size)]).reshape(buckets, width)
+    low, high = padded.argmin(axis=1), padded.argmax(axis=1)
+    start = np.arange(buckets) * width
+    steps = np.stack([start + np.minimum(low, high), start + np.maximum(low, high)], axis=1).ravel()
+    steps = np.append(np.minimum(steps, size - 1), size - 1)
+    return steps, values[steps]
+
+
+def sample_paths_chart(paths: Sequence[np.ndarray], times: Optional[np.ndarray] = None,
+                       bands: Optional[np.ndarray] = None, quantiles: Sequence[float] = BAND_QUANTILES,
+                       fmt: str = "png") -> bytes:
+    """Fortune trajectories of simulated walkers over quantile bands of all walkers.
+
+    Trajectories are decimated with ``decimate`` before drawing, so rendering
+    time does not grow with the length of the game. Not cached: every
+    simulation draws new paths.
+
+    Args:
+        paths (Sequence[np.ndarray]): Trajectories to draw
+        times (Optional[np.ndarray]): Grid times of the bands
+        bands (Optional[np.ndarray]): Fortune quantiles, one row per quantile, e.g.
+            from ``src.simulation.simulate_path_bands``
+        quantiles (Sequence[float]): Quantile of each row of ``bands``, in increasing order
+        fmt (str): Image format, "png" or "svg"
+    """
+    def draw(fig, ax):
+        if bands is not None:
+            for i in range(len(quantiles) // 2):
+                ax.fill_between(times, bands[i], bands[-1 - i], color=COLORS[1], alpha=0.15 + 0.15 * i,
+                                linewidth=0, label=f"{quantiles[i]:.0%}-{quantiles[-1 - i]:.0%} of walkers")
+            if len(quantiles) % 2:
+                ax.plot(times, bands[len(quantiles) // 2], color=COLORS[1], label="Median")
+        for i, path in enumerate(paths):
+            ax.plot(*decimate(path), alpha=0.5, linewidth=0.8, color=COLORS[i % len(COLORS)])
+        ax.set_xlabel("Steps")
+        ax.set_ylabel("Fortune ($)")
+        ax.set_title("Sample Paths")
+        ax.grid(True)
+        if bands is not None:
+            ax.legend(fontsize="x-small", loc="best")
+
+    return render(draw, fmt=fmt)
@@ -0,0 +1,310 @@
+"""
+Intent routing and response templates for the chat endpoint.
+
+Intents are described by the ``INTENTS`` table: the keywords that select
+them, in any supported language, and the responses to give, each with an
+optional condition on the game. The table is compiled once at import time:
+all keywords go into one Aho-Corasick automaton, so routing a message is a
+single pass over its characters however many intents and keywords there are,
+and every response text is parsed into a ``Template`` ready to be filled in.
+"""
+
+from string import Formatter
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+# Language used for requests in a language without templates. As before,
+# anything but English is answered in Chinese.
+FALLBACK_LANGUAGE = "中文"
+
+_ANALYTICS_EN = (
+    "\nFrom ${current_fortune} with a target of ${target_fortune}, the probability of ruin "
+    "is {ruin_probability:.2%} and the game lasts {expected_duration:.1f} bets on average."
+)
+_ANALYTICS_ZH = (
+    "\n从${current_fortune}开始、目标为${target_fortune}时，破产概率为{ruin_probability:.2%}，"
+    "平均需要{expected_duration:.1f}次下注。"
+)
+
+# Intents in order of precedence: when a message matches several, the first
+# one wins. The last entry has no keywords and answers everything else.
+# ``analytics`` intents are given the ruin statistics of the current game.
+INTENTS: List[Dict] = [
+    {
+        "name": "strategy",
+        "keywords": ("strategy", "strategies", "martingale", "kelly", "策略", "马丁格尔", "凯利"),
+        "analytics": True,
+        "responses": [
+            {
+                "when": lambda game: game["win_probability"] < 0.5,
+                "risk_level": "high",
+                "suggested_actions": ["decrease_bet", "set_loss_limit"],
+                "text": {
+                    "English": (
+                        "Based on current win probability < 0.5, this is an unfavorable game. Consider:\n"
+                        "1. Decreasing your bet size\n"
+                        "2. Setting a strict loss limit\n"
+                        "3. Avoiding the martingale strategy" + _ANALYTICS_EN
+                    ),
+                    "中文": (
+                        "基于当前胜率小于0.5，这是一个不利的游戏。建议：\n"
+                        "1. 降低赌注大小\n"
+                        "2. 设置严格的损失限制\n"
+                        "3. 避免使用马丁格尔策略" + _ANALYTICS_ZH
+                    ),
+                },
+            },
+            {
+                "when": None,
+                "risk_level": "moderate",
+                "suggested_actions": ["use_kelly", "set_target"],
+                "text": {
+                    "English": (
+                        "Current win probability > 0.5 suggests a favorable game. Consider:\n"
+                        "1. Using Kelly criterion for optimal betting\n"
+                        "2. Setting a win target\n"
+                        "3. Maintaining consistent bet sizes" + _ANALYTICS_EN
+                    ),
+                    "中文": (
+                        "当前胜率大于0.5，这是一个有利的游戏。建议：\n"
+                        "1. 使用凯利准则优化下注\n"
+                        "2. 设置合理的盈利目标\n"
+                        "3. 保持稳定的赌注大小" + _ANALYTICS_ZH
+                    ),
+                },
+            },
+        ],
+    },
+    {
+        "name": "probability",
+        "keywords": ("probability", "chance", "odds", "概率", "几率", "胜率"),
+        "analytics": True,
+        "responses": [
+            {
+                "when": None,
+                "risk_level": "info",
+                "suggested_actions": ["view_math_analysis"],
+                "text": {
+                    "English": (
+                        "Current game statistics:\n"
+                        "- Win probability: {win_probability:.2f}\n"
+                        "- Expected value per bet: ${expected_value:.2f}\n"
+                        "- Probability of reaching ${target_fortune}: {target_probability:.2%}\n"
+                        "- Probability of ruin: {ruin_probability:.2%}\n"
+                        "- Expected number of bets: {expected_duration:.1f}"
+                    ),
+                    "中文": (
+                        "当前游戏统计：\n"
+                        "- 胜率：{win_probability:.2f}\n"
+                        "- 每次下注期望值：${expected_value:.2f}\n"
+                        "- 达到${target_fortune}的概率：{target_probability:.2%}\n"
+                        "- 破产概率：{ruin_probability:.2%}\n"
+                        "- 预期下注次数：{expected_duration:.1f}"
+                    ),
+                },
+            },
+        ],
+    },
+    {
+        "name": "risk",
+        "keywords": ("risk", "ruin", "bankrupt", "风险", "破产"),
+        "analytics": True,
+        "responses": [
+            {
+                "when": lambda game: game["ruin_probability"] >= 0.5,
+                "risk_level": "high",
+                "suggested_actions": ["decrease_bet", "set_loss_limit"],
+                "text": {
+                    "English": (
+                        "Your risk of ruin is high: {ruin_probability:.2%} before reaching ${target_fortune}. "
+                        "Consider lowering the target or your bet size."
+                    ),
+                    "中文": "您的破产风险很高：达到${target_fortune}之前破产的概率为{ruin_probability:.2%}。建议降低目标或赌注大小。",
+                },
+            },
+            {
+                "when": lambda game: game["ruin_probability"] >= 0.2,
+                "risk_level": "moderate",
+                "suggested_actions": ["set_loss_limit"],
+                "text": {
+                    "English": (
+                        "Your risk of ruin is moderate: {ruin_probability:.2%} before reaching ${target_fortune}. "
+                        "A loss limit keeps it in check."
+                    ),
+                    "中文": "您的破产风险中等：达到${target_fortune}之前破产的概率为{ruin_probability:.2%}。设置损失限制有助于控制风险。",
+                },
+            },
+            {
+                "when": None,
+                "risk_level": "low",
+                "suggested_actions": ["set_target"],
+                "text": {
+                    "English": (
+                        "Your risk of ruin is low: {ruin_probability:.2%} before reaching ${target_fortune}."
+                    ),
+                    "中文": "您的破产风险较低：达到${target_fortune}之前破产的概率为{ruin_probability:.2%}。",
+                },
+            },
+        ],
+    },
+    {
+        "name": "help",
+        "keywords": (),
+        "analytics": False,
+        "responses": [
+            {
+                "when": None,
+                "risk_level": "info",
+                "suggested_actions": ["view_strategy", "view_probability", "view_risk"],
+                "text": {
+                    "English": (
+                        "I can help you with:\n"
+                        "1. Game strategy analysis\n"
+                        "2. Probability calculations\n"
+                        "3. Risk assessment\n"
+                        "What would you like to know?"
+                    ),
+                    "中文": (
+                        "我可以帮您：\n"
+                        "1. 分析游戏策略\n"
+                        "2. 计算概率\n"
+                        "3. 评估风险\n"
+                        "请问您需要了解哪方面的信息？"
+                    ),
+                },
+            },
+        ],
+    },
+]
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton finding which keyword groups occur in a text.
+
+    Attributes:
+        groups (int): Number of keyword groups
+    """
+
+    def __init__(self, groups: Sequence[Sequence[str]]):
+        self.groups = len(groups)
+        self._goto: List[Dict[str, int]] = [{}]
+        # Bit i of a state's output is set when keyword group i ends there.
+        self._output: List[int] = [0]
+        for group, keywords in enumerate(groups):
+            for keyword in keywords:
+                state = 0
+                for char in keyword:
+                    if char not in self._goto[state]:
+                        self._goto.append({})
+                        self._output.append(0)
+                        self._goto[state][char] = len(self._goto) - 1
+                    state = self._goto[state][char]
+                self._output[state] |= 1 << group
+
+        # Failure links in breadth-first order; outputs of the longest proper
+        # suffix state are merged in so matching never follows output links.
+        self._fail = [0] * len(self._goto)
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for char, child in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._output[child] |= self._output[self._fail[child]]
+                queue.append(child)
+
+    def match(self, text: str) -> int:
+        """Bit mask of the keyword groups occurring anywhere in ``text``."""
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        found = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            found |= output[state]
+        return found
+
+
+class Template:
+    """Format string parsed once into literal text and replacement fields.
+
+    Only plain field names with an optional format spec (``{name:.2f}``) are
+    supported.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self._parts: List[Tuple[str, Optional[str], str]] = [
+            (literal, field, spec or "") for literal, field, spec, _ in Formatter().parse(text)
+        ]
+
+    def render(self, values: Dict[str, Union[int, float, str]]) -> str:
+        out = []
+        for literal, field, spec in self._parts:
+            out.append(literal)
+            if field is not None:
+                out.append(format(values[field], spec))
+        return "".join(out)
+
+
+class Intent:
+    """Compiled entry of the intent table.
+
+    Attributes:
+        name (str): Intent name
+        analytics (bool): Whether responses need the ruin statistics of the game
+        responses (List[Dict]): Responses in order, each with ``when``, ``risk_level``,
+            ``suggested_actions`` and ``templates`` by language
+    """
+
+    def __init__(self, spec: Dict):
+        self.name = spec["name"]
+        self.analytics = spec["analytics"]
+        self.responses = [
+            {
+                "when": response["when"],
+                "risk_level": response["risk_level"],
+                "suggested_actions": list(response["suggested_actions"]),
+                "templates": {lang: Template(text) for lang, text in response["text"].items()},
+            }
+            for response in spec["responses"]
+        ]
+
+    def respond(self, game: Dict[str, Union[int, float]], language: str) -> Tuple[str, Dict]:
+        """Pick the first response whose condition holds and render it.
+
+        Returns:
+            Tuple of (text, response) where response is the chosen table entry
+        """
+        for response in self.responses:
+            if response["when"] is None or response["when"](game):
+                templates = response["templates"]
+                template = templates.get(language) or templates[FALLBACK_LANGUAGE]
+                return template.render(game), response
+        raise ValueError(f"intent {self.name!r} has no response for this game")
+
+
+class IntentRouter:
+    """Routes messages to intents with one automaton over all keywords.
+
+    Attributes:
+        intents (List[Intent]): Intents in order of precedence; the last one is the fallback
+    """
+
+    def __init__(self, table: Sequence[Dict]):
+        self.intents = [Intent(spec) for spec in table]
+        self._automaton = KeywordAutomaton([
+            [keyword.lower() for keyword in spec["keywords"]] for spec in table
+        ])
+
+    def route(self, message: str) -> Intent:
+        """Intent of ``message``: the first one with a keyword in it, else the fallback."""
+        found = self._automaton.match(message.lower())
+        if not found:
+            return self.intents[-1]
+        return self.intents[(found & -found).bit_length() - 1]
+
+
+router = IntentRouter(INTENTS)
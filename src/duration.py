@@ -0,0 +1,194 @@
+"""
+Exact distribution of the duration of a Gambler's Ruin game.
+
+The generating functions of the ruin and win times,
+``U(s) = E[s^T; ruin]`` and ``W(s) = E[s^T; win]``, have a closed form in the
+roots ``a, b = (1 ± d) / (2ps)`` of ``ps*x^2 - x + qs = 0``, where
+``d = sqrt(1 - 4pqs^2)``. With ``L = log(b/a)``::
+
+    U(s) = b^n * expm1((N - n) L) / expm1(N L)
+    W(s) = a^-(N - n) * expm1(n L) / expm1(N L)
+
+``|b/a| <= 1`` and both ``b`` and ``1/a`` are evaluated without cancellation,
+so nothing overflows for any p or N. Evaluating these at the M-th roots of
+unity and taking an inverse real FFT gives ``P(T = t)`` for ``t < M``, up to
+the mass beyond ``M`` folding back onto small ``t``.
+
+``M`` is chosen from the tail of the distribution. For large ``t``,
+``P(T > t)`` decays like ``c * lambda^t`` with ``lambda = 2 sqrt(pq) cos(pi/N)``,
+the slowest mode of the walk. Its weight ``c``, which depends on the parity
+of ``t``, has a closed form, so the length where the tail falls below ``eps``
+is known before any FFT is run.
+``M`` is still doubled if the folded mass turns out larger than expected.
+Games whose tail beyond ``MAX_LENGTH`` bets exceeds ``MAX_TAIL`` are rejected
+before any work is done. Games with a smaller tail are truncated there, with
+the missing mass left out of the pmf.
+"""
+
+import math
+from typing import Tuple
+
+import numpy as np
+
+from src.analytics import ruin_statistics
+
+# Largest FFT length, and so the longest duration covered.
+MAX_LENGTH = 1 << 22
+
+# Largest probability mass beyond MAX_LENGTH bets for which a truncated
+# distribution is returned rather than an error.
+MAX_TAIL = 1e-6
+
+
+def _generating_functions(s: np.ndarray, initial_fortune: int, target_fortune: int,
+                          win_probability: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Evaluate U(s) and W(s) at complex points ``s`` on the unit circle."""
+    p, q = win_probability, 1 - win_probability
+    n, N = initial_fortune, target_fortune
+    d = np.sqrt(1 - 4 * p * q * s * s)
+    b = 2 * q * s / (1 + d)
+    inv_a = 2 * p * s / (1 + d)
+    L = np.log1p(-d) - np.log1p(d)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        denom = np.expm1(N * L)
+        # At d = 0 (p = 0.5 and s = +-1) the ratios tend to (N - n) / N and n / N.
+        degenerate = L == 0
+        ruin_ratio = np.where(degenerate, (N - n) / N, np.expm1((N - n) * L) / denom)
+        win_ratio = np.where(degenerate, n / N, np.expm1(n * L) / denom)
+    return b ** n * ruin_ratio, inv_a ** (N - n) * win_ratio
+
+
+def _slowest_modes(initial_fortune: int, target_fortune: int,
+                   win_probability: float) -> Tuple[float, Tuple[float, float]]:
+    """Log decay rate and log weights of the slowest modes of ``P(T > t)``.
+
+    On the transient states ``1..N-1`` the walk's right eigenvectors are
+    ``x^-j sin(k pi j / N)`` and left eigenvectors ``x^j sin(k pi j / N)``,
+    with ``x = sqrt(p/q)`` and eigenvalues ``lambda_k = 2 sqrt(pq) cos(k pi / N)``.
+    The walk has period two, so ``k = 1`` and ``k = N - 1`` decay alike, with
+    ``lambda_1 = -lambda_(N-1)``, and ``P(T > t) ~ w(t mod 2) * lambda_1^t``.
+    Both mode weights sum a geometric-sine series in closed form::
+
+        c_1     = C (1 + x^N) / (1 - 2x cos(pi/N) + x^2)
+        c_(N-1) = C (-1)^(n+1) (1 + (-x)^N) / (1 + 2x cos(pi/N) + x^2)
+
+    with ``C = (2/N) x^(1-n) sin(pi n/N) sin(pi/N)``.
+
+    Returns:
+        Tuple of (log lambda_1, (log w(0), log w(1)))
+    """
+    n, N, p = initial_fortune, target_fortune, win_probability
+    q = 1 - p
+    angle = math.pi / N
+    half_angle = math.sin(angle / 2)
+    log_rate = 0.5 * math.log1p(-(p - q) ** 2) + math.log1p(-2 * half_angle ** 2)
+    log_x = 0.5 * (math.log(p) - math.log(q))
+    x = math.exp(log_x)
+    # x^N may overflow: scale both weights by max(1, x^N).
+    scale = max(0.0, N * log_x)
+    low, high = math.exp(-scale), math.exp(N * log_x - scale)
+    first = (low + high) / ((1 - x) ** 2 + 4 * x * half_angle ** 2)
+    second = (low + (-1) ** N * high) / ((1 + x) ** 2 - 4 * x * half_angle ** 2)
+    log_common = (math.log(2 / N) + (1 - n) * log_x + math.log(math.sin(angle * n))
+                  + math.log(math.sin(angle)) + scale)
+    sign = (-1) ** (n + 1)
+    return log_rate, (log_common + math.log(first + sign * second),
+                      log_common + math.log(first - sign * second))
+
+
+def duration_distribution(initial_fortune: int, target_fortune: int, win_probability: float,
+                          eps: float = 1e-12) -> Tuple[np.ndarray, np.ndarray]:
+    """Exact probability that the game ends at each bet, split by outcome.
+
+    Args:
+        initial_fortune (int): Starting amount of money
+        target_fortune (int): Target amount to reach
+        win_probability (float): Probability of winning each bet
+        eps (float): Probability mass that may be left beyond the returned range
+
+    Returns:
+        Tuple of (ruin_pmf, win_pmf): element ``t`` is the probability that the
+        game ends at bet ``t`` in ruin or in reaching the target. Both arrays
+        stop where the remaining mass falls below ``eps``, or at ``MAX_LENGTH``
+        bets, with up to ``MAX_TAIL`` of the mass beyond them, for longer games.
+
+    Raises:
+        ValueError: If more than ``MAX_TAIL`` of the probability lies beyond
+            ``MAX_LENGTH`` bets. This is checked before any computation.
+    """
+    n, N, p = initial_fortune, target_fortune, win_probability
+    if n <= 0 or n >= N:
+        return np.array([1.0 if n <= 0 else 0.0]), np.array([1.0 if n >= N else 0.0])
+    if p <= 0 or p >= 1:
+        # Every bet goes the same way.
+        steps = n if p <= 0 else N - n
+        pmf = np.zeros(steps + 1)
+        pmf[steps] = 1.0
+        return (pmf, np.zeros(steps + 1)) if p <= 0 else (np.zeros(steps + 1), pmf)
+
+    _, _, mean = ruin_statistics(n, N, p)
+    log_rate, log_weights = _slowest_modes(n, N, p)
+    log_weight = max(log_weights)
+    needed = max(4 * float(mean), (math.log(eps) - log_weight) / log_rate) + 1
+    if needed > MAX_LENGTH:
+        log10_tail = (log_weight + log_rate * MAX_LENGTH) / math.log(10)
+        if log10_tail > math.log10(MAX_TAIL):
+            raise ValueError(
+                f"game too long for the exact duration distribution: about 10^{log10_tail:.1f} "
+                f"of the probability lies beyond {MAX_LENGTH} bets"
+            )
+    length = min(1 << max(6, math.ceil(math.log2(needed))), MAX_LENGTH)
+    while True:
+        s = np.exp(-2j * np.pi * np.arange(length // 2 + 1) / length)
+        ruin_gf, win_gf = _generating_functions(s, n, N, p)
+        ruin_pmf = np.fft.irfft(ruin_gf, n=length)
+        win_pmf = np.fft.irfft(win_gf, n=length)
+        # Mass beyond the window folds back onto t - length and lowers the mean
+        # by length per unit of folded mass, which bounds the folded mass.
+        t = np.arange(length)
+        folded = (float(mean) - t @ (ruin_pmf + win_pmf)) / length
+        if folded < eps or (length == MAX_LENGTH and folded < MAX_TAIL):
+            break
+        if length == MAX_LENGTH:
+            raise ValueError("game too long for the exact duration distribution")
+        length *= 2
+
+    # The game can only end after a number of bets with the parity of the distance.
+    np.maximum(ruin_pmf, 0.0, out=ruin_pmf)
+    np.maximum(win_pmf, 0.0, out=win_pmf)
+    ruin_pmf[(t - n) % 2 == 1] = 0.0
+    win_pmf[(t - (N - n)) % 2 == 1] = 0.0
+    tail = np.cumsum((ruin_pmf + win_pmf)[::-1])[::-1]
+    end = int(np.searchsorted(-tail, -eps)) + 1
+    return ruin_pmf[:end], win_pmf[:end]
+
+
+def duration_tail(initial_fortune: int, target_fortune: int, win_probability: float, t: int) -> float:
+    """``P(T > t)`` from the slowest mode of the walk; accurate for ``t`` well past the mean.
+
+    Used to report the probability mass beyond a pmf from ``duration_distribution``.
+    """
+    n, N, p = initial_fortune, target_fortune, win_probability
+    if n <= 0 or n >= N:
+        return 0.0
+    if p <= 0 or p >= 1:
+        return 1.0 if t < (n if p <= 0 else N - n) else 0.0
+    log_rate, log_weights = _slowest_modes(n, N, p)
+    return min(1.0, math.exp(log_weights[t % 2] + log_rate * t))
+
+
+def duration_survival(pmf: np.ndarray) -> np.ndarray:
+    """Survival curve ``P(T > t)`` from a duration pmf.
+
+    The tail is summed from the end so that small probabilities keep their
+    relative precision.
+    """
+    tail = np.cumsum(pmf[::-1])[::-1]
+    return np.append(tail[1:], 0.0)
+
+
+def duration_quantiles(pmf: np.ndarray, quantiles) -> np.ndarray:
+    """Smallest ``t`` with ``P(T <= t) >= quantile``, for each quantile."""
+    cdf = np.cumsum(pmf)
+    return np.minimum(np.searchsorted(cdf, np.asarray(quantiles) - 1e-12), pmf.size - 1)
@@ -0,0 +1,126 @@
+"""
+Response encodings for array-heavy API results.
+
+Results are returned as JSON by default. Clients that send
+``Accept: application/x-npz`` get the same fields as a NumPy ``.npz`` archive
+instead: every array is written as its raw buffer behind a ``.npy`` header,
+with no per-element conversion on either side, so large results are several
+times smaller and faster to produce than JSON lists. Integer arrays are
+stored in the smallest integer type that holds their values (per-walker
+fortunes usually fit in one byte), floats as float64. Nested dicts become
+members named with dotted paths (``parameters.initial_fortune``), scalars
+and strings become 0-d arrays, and None becomes a 0-d NaN. ``decode_npz``
+turns such an archive back into the JSON-shaped dict.
+"""
+
+import io
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+JSON_MEDIA_TYPE = "application/json"
+NPZ_MEDIA_TYPE = "application/x-npz"
+
+
+def _quality(accept: str, media_type: str) -> float:
+    """Quality the Accept header gives ``media_type``, by its most specific match."""
+    main_type = media_type.split("/")[0]
+    best, specificity = 0.0, -1
+    for item in accept.split(","):
+        pattern, *params = [part.strip() for part in item.split(";")]
+        if pattern == media_type:
+            rank = 2
+        elif pattern == f"{main_type}/*":
+            rank = 1
+        elif pattern == "*/*":
+            rank = 0
+        else:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if rank > specificity:
+            best, specificity = quality, rank
+    return best
+
+
+def prefers_npz(accept: Optional[str]) -> bool:
+    """Whether an Accept header ranks ``.npz`` above JSON.
+
+    JSON wins ties and is used when the header is missing or accepts neither.
+    """
+    if not accept:
+        return False
+    return _quality(accept, NPZ_MEDIA_TYPE) > _quality(accept, JSON_MEDIA_TYPE)
+
+
+def _flatten(result: Dict[str, Any], prefix: str = "") -> Iterator[Tuple[str, Any]]:
+    for key, value in result.items():
+        if isinstance(value, dict):
+            yield from _flatten(value, f"{prefix}{key}.")
+        else:
+            yield f"{prefix}{key}", value
+
+
+def _compact(array: np.ndarray) -> np.ndarray:
+    """Losslessly narrow an integer array to the smallest type holding its range."""
+    if array.dtype.kind not in "iu" or array.size == 0:
+        return array
+    dtype = np.result_type(np.min_scalar_type(array.min()), np.min_scalar_type(array.max()))
+    return array.astype(dtype, copy=False)
+
+
+def encode_npz(result: Dict[str, Any]) -> bytes:
+    """Encode a result dict as an uncompressed ``.npz`` archive.
+
+    Args:
+        result (Dict[str, Any]): Arrays, numbers, strings, lists of numbers, None and nested dicts
+
+    Returns:
+        Archive bytes
+    """
+    arrays = {
+        name: _compact(np.asarray(np.nan if value is None else value))
+        for name, value in _flatten(result)
+    }
+    buffer = io.BytesIO()
+    np.savez(buffer, **arrays)
+    return buffer.getvalue()
+
+
+def decode_npz(content: bytes) -> Dict[str, Any]:
+    """Decode an archive from ``encode_npz`` into the JSON-shaped dict.
+
+    Arrays stay NumPy arrays, with integer arrays widened back to int64 so
+    arithmetic on them cannot overflow; 0-d members become Python scalars.
+    """
+    result: Dict[str, Any] = {}
+    with np.load(io.BytesIO(content), allow_pickle=False) as archive:
+        for name in archive.files:
+            value = archive[name]
+            *parents, key = name.split(".")
+            node = result
+            for parent in parents:
+                node = node.setdefault(parent, {})
+            if value.ndim == 0:
+                value = value.item()
+            elif value.dtype.kind in "iu":
+                value = value.astype(np.int64)
+            node[key] = value
+    return result
+
+
+def to_jsonable(result: Any) -> Any:
+    """Replace NumPy arrays and scalars in a result with Python lists and numbers."""
+    if isinstance(result, dict):
+        return {key: to_jsonable(value) for key, value in result.items()}
+    if isinstance(result, (list, tuple)):
+        return [to_jsonable(value) for value in result]
+    if isinstance(result, (np.ndarray, np.generic)):
+        return result.tolist()
+    return result
@@ -0,0 +1,136 @@
+"""
+Bounded executor for CPU-bound endpoint work.
+
+Heavy handlers run their NumPy work on a fixed pool of threads instead of the
+event loop, so cheap requests keep being served while simulations run. The
+number of tasks waiting for a thread is capped: once the pool is saturated
+new work is rejected with ``ExecutorSaturated`` right away, which the API
+turns into a 503 response with a ``Retry-After`` estimate, instead of letting
+requests pile up until clients time out.
+"""
+
+import asyncio
+import contextvars
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Union
+
+
+class ExecutorSaturated(Exception):
+    """Raised when the executor's queue is full.
+
+    Attributes:
+        retry_after (int): Suggested number of seconds before retrying
+    """
+
+    def __init__(self, retry_after: int):
+        super().__init__("server is busy, retry later")
+        self.retry_after = retry_after
+
+
+class BoundedExecutor:
+    """Thread pool with a cap on queued tasks.
+
+    Attributes:
+        max_workers (int): Number of threads running tasks
+        max_queue (int): Tasks allowed to wait for a free thread
+    """
+
+    def __init__(self, max_workers: int = 4, max_queue: int = 16):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._pool = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._average_seconds = 0.1
+        self.rejected = 0
+
+    @property
+    def pending(self) -> int:
+        """Tasks submitted and not yet finished, running or queued."""
+        return self._pending
+
+    def retry_after(self) -> int:
+        """Estimate in seconds until a queued task would start."""
+        return max(1, math.ceil(self._average_seconds * self._pending / self.max_workers))
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """Run ``func(*args, **kwargs)`` on the pool and await its result.
+
+        Raises:
+            ExecutorSaturated: If ``max_queue`` tasks are already waiting
+        """
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise ExecutorSaturated(self.retry_after())
+            self._pending += 1
+        return await self._run(func, args, kwargs)
+
+    async def run_admitted(self, func: Callable, *args, **kwargs) -> Any:
+        """Like ``run``, but never rejects.
+
+        For follow-up work of a request that was already admitted, e.g. the
+        later chunks of a streamed simulation.
+        """
+        with self._lock:
+            self._pending += 1
+        return await self._run(func, args, kwargs)
+
+    def check(self) -> None:
+        """Raise ``ExecutorSaturated`` if ``run`` would currently reject work."""
+        if self._pending >= self.max_workers + self.max_queue:
+            with self._lock:
+                self.rejected += 1
+            raise ExecutorSaturated(self.retry_after())
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        """Report pool size, queue depth and rejections."""
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "pending": self._pending,
+            "queued": max(0, self._pending - self.max_workers),
+            "rejected": self.rejected,
+            "average_task_seconds": self._average_seconds,
+        }
+
+    async def _run(self, func: Callable, args: tuple, kwargs: dict) -> Any:
+        # Carry the request's context variables (e.g. an active profile) to the worker.
+        context = contextvars.copy_context()
+
+        def task():
+            start = time.perf_counter()
+            try:
+                return context.run(func, *args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                with self._lock:
+                    self._average_seconds += 0.1 * (elapsed - self._average_seconds)
+
+        def release(_):
+            with self._lock:
+                self._pending -= 1
+
+        try:
+            if self._pool is None:
+                with self._lock:
+                    if self._pool is None:
+                        self._pool = ThreadPoolExecutor(self.max_workers, thread_name_prefix="cpu-worker")
+            future = self._pool.submit(task)
+        except BaseException:
+            release(None)
+            raise
+        # Released when the task finishes, even if the awaiting request is cancelled.
+        future.add_done_callback(release)
+        return await asyncio.wrap_future(future)
+
+
+# Process-wide executor used by the API.
+cpu_executor = BoundedExecutor(
+    max_workers=int(os.environ.get("CPU_WORKERS", str(os.cpu_count() or 1))),
+    max_queue=int(os.environ.get("CPU_QUEUE_LIMIT", "16")),
+)
@@ -0,0 +1,202 @@
+"""
+In-process queue for long-running API computations.
+
+Jobs are run by a fixed number of worker threads, so heavy simulations never
+hold more than ``workers`` threads, however many are submitted, and requests
+return at once with a job id. A job function receives a ``report`` callback
+through which it publishes its progress and partial results; the callback
+also raises ``JobCancelled`` once the job has been cancelled, so work stops at
+the next report. Job records are kept in memory and, once finished, dropped
+oldest first beyond a retention limit.
+"""
+
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED = frozenset((COMPLETED, FAILED, CANCELLED))
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when it has been cancelled."""
+
+
+class Job:
+    """State of one submitted computation.
+
+    Attributes:
+        id (str): Unique job identifier
+        kind (str): Kind of work, e.g. "simulate"
+        status (str): One of queued, running, completed, failed or cancelled
+        progress (float): Fraction of the work done, from 0 to 1
+        partial (Optional[Dict]): Latest partial result reported by the job
+        result (Any): Final result once completed
+        error (Optional[str]): Error message if the job failed
+    """
+
+    def __init__(self, kind: str, func: Callable[[Callable[..., None]], Any]):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.func = func
+        self.status = QUEUED
+        self.progress = 0.0
+        self.partial: Optional[Dict] = None
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.created = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.cancel_requested = threading.Event()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Describe the job for API responses."""
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "progress": self.progress,
+            "partial": self.partial,
+            "result": self.result,
+            "error": self.error,
+            "created": self.created,
+            "started": self.started,
+            "finished": self.finished,
+        }
+
+
+class JobQueue:
+    """Thread-safe job store served by a bounded pool of worker threads.
+
+    Worker threads are started on the first submission, so importing the
+    module has no side effects.
+
+    Attributes:
+        workers (int): Number of jobs run at the same time
+        max_retained (int): Finished jobs kept for polling before the oldest are dropped
+    """
+
+    def __init__(self, workers: int = 2, max_retained: int = 1000):
+        self.workers = workers
+        self.max_retained = max_retained
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._pending: "queue.Queue[Job]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._threads = []
+
+    def submit(self, kind: str, func: Callable[[Callable[..., None]], Any]) -> Job:
+        """Queue ``func(report)`` for execution.
+
+        Args:
+            kind (str): Kind of work, reported back with the job
+            func (Callable): Work to run; it may call ``report(progress, partial=None)``
+
+        Returns:
+            The queued job
+        """
+        job = Job(kind, func)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+            while len(self._threads) < self.workers:
+                thread = threading.Thread(target=self._work, name=f"job-worker-{len(self._threads)}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+        self._pending.put(job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Look up a job by id; None if unknown or no longer retained."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """Cancel a queued or running job, or forget a finished one.
+
+        A queued job is cancelled at once; a running job stops at its next
+        progress report.
+
+        Returns:
+            The job, or None if unknown
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            if job.status in FINISHED:
+                del self._jobs[job_id]
+                return job
+            job.cancel_requested.set()
+            if job.status == QUEUED:
+                self._finish(job, CANCELLED)
+            return job
+
+    def stats(self) -> Dict[str, int]:
+        """Count retained jobs by status."""
+        with self._lock:
+            counts = {status: 0 for status in (QUEUED, RUNNING, COMPLETED, FAILED, CANCELLED)}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+            counts["workers"] = self.workers
+            return counts
+
+    def _work(self) -> None:
+        while True:
+            job = self._pending.get()
+            with self._lock:
+                if job.status != QUEUED:
+                    continue
+                job.status = RUNNING
+                job.started = time.time()
+
+            def report(progress: float, partial: Optional[Dict] = None, job: Job = job) -> None:
+                if job.cancel_requested.is_set():
+                    raise JobCancelled()
+                job.progress = progress
+                if partial is not None:
+                    job.partial = partial
+
+            try:
+                result = job.func(report)
+            except JobCancelled:
+                with self._lock:
+                    self._finish(job, CANCELLED)
+            except Exception as e:
+                with self._lock:
+                    job.error = str(e) or type(e).__name__
+                    self._finish(job, FAILED)
+            else:
+                with self._lock:
+                    if job.cancel_requested.is_set():
+                        self._finish(job, CANCELLED)
+                    else:
+                        job.result = result
+                        job.progress = 1.0
+                        self._finish(job, COMPLETED)
+
+    def _finish(self, job: Job, status: str) -> None:
+        job.status = status
+        job.finished = time.time()
+        job.func = None
+        self._prune()
+
+    def _prune(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.status in FINISHED]
+        for job_id in finished[:max(0, len(finished) - self.max_retained)]:
+            del self._jobs[job_id]
+
+
+# Process-wide queue used by the API.
+job_queue = JobQueue(
+    workers=int(os.environ.get("JOB_WORKERS", "2")),
+    max_retained=int(os.environ.get("JOB_MAX_RETAINED", "1000")),
+)
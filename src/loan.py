@@ -0,0 +1,139 @@
+"""
+Exact ruin probabilities for a gambler who can borrow up to a credit limit.
+
+The gambler's net wealth ``w`` (cash minus debt) starts at ``n``. Every round
+the gambler bets ``min(max_bet, N - w)`` at even odds, i.e. ``max_bet`` but
+never more than is still needed to reach the target ``N``. While ``w`` is
+negative, interest on the debt is added after each bet. The game is won at
+``N`` and lost once the debt reaches the credit limit ``c``, i.e. at
+``w <= -c``. A losing bet that would overdraw the credit line is ruin as
+well.
+
+The dynamics do not depend on ``c``; the credit limit only decides where the
+chain is cut off. Ordering the transient states from the top down, the chain
+for credit limit ``c`` is therefore a leading block of the chain for the
+largest limit. A single banded LU factorization of the largest chain (without
+pivoting, which is stable for this M-matrix) contains the factors of every
+leading block, so one pass of forward and transposed-back substitution
+gives the answer for every credit limit at once.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+
+def _transitions(target_fortune: int, lowest: int, win_probability: float, max_bet: int,
+                 interest_rate: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """List the one-step transitions of every transient state.
+
+    Transient states are the wealths ``target_fortune - 1`` down to ``lowest``,
+    numbered ``0, 1, ...`` in that order.
+
+    Returns:
+        Tuple of (rows, cols, probs, win): sparse transition probabilities
+        between transient states, and the probability of reaching the target
+        in one step from each state
+    """
+    size = target_fortune - lowest
+    wealth = target_fortune - 1 - np.arange(size)
+    bets = np.minimum(max_bet, target_fortune - wealth)
+
+    rows, cols, probs = [], [], []
+    win = np.where(wealth + bets >= target_fortune, win_probability, 0.0)
+    for after, prob in ((wealth + bets, win_probability), (wealth - bets, 1 - win_probability)):
+        # Stochastic rounding keeps the state integral and the expected interest exact.
+        interest = interest_rate * np.maximum(-after, 0)
+        whole = np.floor(interest)
+        extra = interest - whole
+        for landing, weight in ((after - whole, 1 - extra), (after - whole - 1, extra)):
+            keep = (landing < target_fortune) & (landing >= lowest) & (weight > 0)
+            rows.append(np.nonzero(keep)[0])
+            cols.append((target_fortune - 1 - landing[keep]).astype(np.intp))
+            probs.append(prob * weight[keep])
+    return np.concatenate(rows), np.concatenate(cols), np.concatenate(probs), win
+
+
+def _banded_lu(rows: np.ndarray, cols: np.ndarray, probs: np.ndarray,
+               size: int) -> Tuple[np.ndarray, int, int]:
+    """Factor ``I - Q`` in place in band storage, without pivoting.
+
+    Returns:
+        Tuple of (band, lower, upper): ``band[i, j - i + lower]`` holds
+        ``U[i, j]`` for ``j >= i`` and the multiplier ``L[i, j]`` for ``j < i``
+    """
+    lower = max(int((rows - cols).max(initial=0)), 0)
+    upper = max(int((cols - rows).max(initial=0)), 0)
+    band = np.zeros((size, lower + upper + 1))
+    band[:, lower] = 1.0
+    np.subtract.at(band, (rows, cols - rows + lower), probs)
+
+    below = np.arange(1, lower + 1)[:, None]
+    right = np.arange(1, upper + 1)[None, :]
+    for k in range(size - 1):
+        count = min(lower, size - 1 - k)
+        if count == 0:
+            continue
+        sub = below[:count]
+        pivot_rows = k + sub[:, 0]
+        factors = band[pivot_rows, lower - sub[:, 0]] / band[k, lower]
+        band[pivot_rows, lower - sub[:, 0]] = factors
+        if upper:
+            band[k + sub, lower + right - sub] -= factors[:, None] * band[k, lower + 1:]
+    return band, lower, upper
+
+
+def credit_limit_ruin(initial_fortune: int, target_fortune: int, win_probability: float,
+                      max_credit: int, max_bet: int = 1,
+                      interest_rate: float = 0.0) -> Tuple[np.ndarray, np.ndarray]:
+    """Ruin probability and expected duration for every credit limit up to ``max_credit``.
+
+    With ``max_bet=1`` and no interest this is the classic game shifted by the
+    credit limit, i.e. ``ruin_statistics(n + c, N + c, p)``.
+
+    Args:
+        initial_fortune (int): Starting amount of money
+        target_fortune (int): Target amount to reach
+        win_probability (float): Probability of winning each bet
+        max_credit (int): Largest credit limit to solve for
+        max_bet (int): Largest bet placed in one round
+        interest_rate (float): Interest charged on the debt after every bet, e.g. 0.01 for 1%
+
+    Returns:
+        Tuple of (ruin_probabilities, expected_durations), arrays indexed by
+        credit limit ``0 .. max_credit``
+    """
+    credit = np.arange(max_credit + 1)
+    if initial_fortune >= target_fortune:
+        return np.zeros(credit.size), np.zeros(credit.size)
+    # Credit limits that do not even cover the starting debt end the game at once.
+    ruined = initial_fortune <= -credit
+
+    lowest = -max_credit + 1
+    size = target_fortune - lowest
+    if size <= 0 or initial_fortune < lowest:
+        return np.ones(credit.size), np.zeros(credit.size)
+    rows, cols, probs, win = _transitions(target_fortune, lowest, win_probability, max_bet, interest_rate)
+    band, lower, upper = _banded_lu(rows, cols, probs, size)
+
+    # Forward substitution L y = b for the win and duration right-hand sides.
+    rhs = np.stack([win, np.ones(size)])
+    for i in range(1, size):
+        start = max(0, i - lower)
+        rhs[:, i] -= rhs[:, start:i] @ band[i, start - i + lower:lower]
+
+    # Transposed back substitution U^T z = e_n; z vanishes above the start state.
+    start_index = target_fortune - 1 - initial_fortune
+    z = np.zeros(size)
+    z[start_index] = 1.0 / band[start_index, lower]
+    for i in range(start_index + 1, size):
+        first = max(start_index, i - upper)
+        above = np.arange(first, i)
+        z[i] = -(z[first:i] @ band[above, i - above + lower]) / band[i, lower]
+
+    # The chain for credit c holds the first target_fortune - 1 + c states.
+    totals = np.cumsum(z * rhs, axis=1)
+    states = np.clip(target_fortune - 2 + credit, 0, size - 1)
+    win_prob = np.where(ruined, 0.0, totals[0, states])
+    duration = np.where(ruined, 0.0, totals[1, states])
+    return np.clip(1 - win_prob, 0.0, 1.0), duration
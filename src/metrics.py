@@ -0,0 +1,249 @@
+"""
+Prometheus metrics for the API.
+
+A small dependency-free implementation of counters, gauges and histograms
+rendered in the Prometheus text exposition format. Updating a metric is a
+dictionary lookup and an addition under a lock, so instrumentation stays
+cheap on the request path. Values owned by other components (cache counters,
+executor and job queue depth) are read by collector callbacks only when
+``/metrics`` is scraped.
+"""
+
+import bisect
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+# Request latency buckets in seconds, from cached lookups to long simulations.
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        '{}="{}"'.format(name, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in zip(names, values)
+    )
+    return "{" + pairs + "}"
+
+
+class _Metric(ABC):
+    """Common parts of labelled metrics.
+
+    Attributes:
+        name (str): Metric name
+        documentation (str): Help text
+        label_names (Tuple[str, ...]): Names of the labels
+    """
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        return lines + self._samples()
+
+    @abstractmethod
+    def _samples(self) -> List[str]:
+        """Sample lines of every series, without the HELP and TYPE header."""
+
+
+class Counter(_Metric):
+    """Monotonically increasing value per label combination."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        super().__init__(name, documentation, label_names)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, *labels: str) -> None:
+        """Add ``amount`` to the series identified by ``labels``."""
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}"
+                for labels, value in items]
+
+
+class Gauge(Counter):
+    """Value that can go up and down per label combination."""
+
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, *labels: str) -> None:
+        """Subtract ``amount`` from the series identified by ``labels``."""
+        self.inc(-amount, *labels)
+
+    def set(self, value: float, *labels: str) -> None:
+        """Set the series identified by ``labels`` to ``value``."""
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(_Metric):
+    """Distribution of observed values over fixed buckets.
+
+    Attributes:
+        buckets (Tuple[float, ...]): Upper bounds of the buckets, increasing
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(buckets)
+        # Per series: per-bucket counts (last one is +Inf), sum of observations.
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        """Record one observation in the series identified by ``labels``."""
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][index] += 1
+            series[1][0] += value
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = sorted((labels, (list(counts), total[0])) for labels, (counts, total) in self._series.items())
+        lines = []
+        names = self.label_names + ("le",)
+        for labels, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(names, labels + (_format_value(bound),))} {cumulative}")
+            label_text = _format_labels(self.label_names, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(total)}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+class Registry:
+    """Set of metrics and scrape-time collectors rendered together."""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], Iterable[_Metric]]] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], Iterable[_Metric]]) -> None:
+        """Register a callback that builds metrics from live state at scrape time."""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = []
+        for metric in self._metrics:
+            lines += metric.render()
+        for collector in self._collectors:
+            for metric in collector():
+                lines += metric.render()
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+requests_total = registry.register(Counter(
+    "gamblers_ruin_http_requests_total", "HTTP requests by method, route and status code.",
+    ("method", "path", "status")))
+request_latency = registry.register(Histogram(
+    "gamblers_ruin_http_request_duration_seconds", "HTTP request latency by method and route.",
+    ("method", "path")))
+requests_in_flight = registry.register(Gauge(
+    "gamblers_ruin_http_requests_in_flight", "HTTP requests currently being served."))
+simulated_walkers = registry.register(Counter(
+    "gamblers_ruin_simulated_walkers_total", "Walkers simulated, by engine.", ("engine",)))
+simulated_steps = registry.register(Counter(
+    "gamblers_ruin_simulated_steps_total", "Bets simulated, by engine.", ("engine",)))
+
+
+def record_simulation(engine: str, walkers: int, steps: int) -> None:
+    """Count simulated walkers and bets; rate() over these gives throughput.
+
+    Args:
+        engine (str): Simulation engine, e.g. "monte_carlo" or "strategy"
+        walkers (int): Number of walkers simulated
+        steps (int): Total number of bets they played
+    """
+    simulated_walkers.inc(walkers, engine)
+    simulated_steps.inc(steps, engine)
+
+
+class MetricsMiddleware:
+    """ASGI middleware counting requests and timing them per route.
+
+    Requests are labelled with the route template (e.g. ``/jobs/{job_id}``)
+    rather than the raw path, so ids do not create new series. Streaming
+    responses are timed until their last chunk has been sent.
+    """
+
+    def __init__(self, app, exclude: Iterable[str] = ("/metrics",)):
+        self.app = app
+        self.exclude = frozenset(exclude)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.exclude:
+            await self.app(scope, receive, send)
+            return
+
+        status = "500"
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        requests_in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            requests_in_flight.dec()
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            requests_total.inc(1, scope["method"], path, status)
+            request_latency.observe(elapsed, scope["method"], path)
+
+
+def snapshot(metric_type: type, name: str, documentation: str, value: float) -> _Metric:
+    """Build an unlabelled metric holding a value read at scrape time.
+
+    Args:
+        metric_type (type): ``Counter`` for cumulative totals, ``Gauge`` otherwise
+        name (str): Metric name
+        documentation (str): Help text
+        value (float): Current value
+
+    Returns:
+        Metric with a single sample
+    """
+    metric = metric_type(name, documentation)
+    metric._values[()] = value
+    return metric
@@ -0,0 +1,76 @@
+"""
+Shared, cached computations for the Streamlit pages.
+
+Every page used to carry its own copy of the ruin formula, the credit-limit
+sweep and the transition-matrix code, and recomputed them on every rerun.
+The functions here are the single implementation used by all pages. They are
+wrapped in ``st.cache_data`` with bounded entries, so a rerun triggered by an
+unrelated widget does no numerical work, and each parameter set is computed
+once per server process and then shared by all sessions.
+"""
+
+from typing import Tuple
+
+import numpy as np
+import streamlit as st
+
+from src.loan import credit_limit_ruin
+from src.surface import lookup_ruin_statistics
+
+# Upper bound on cached parameter sets per function.
+MAX_CACHE_ENTRIES = 256
+
+
+def matrix_power(matrix: np.ndarray, power: int) -> np.ndarray:
+    """Calculate the power of a matrix by repeated squaring."""
+    return np.linalg.matrix_power(matrix, power)
+
+
+@st.cache_data(max_entries=MAX_CACHE_ENTRIES, show_spinner=False)
+def transition_matrix(states: int, win_probability: float) -> np.ndarray:
+    """Build the transition matrix of a game with absorbing states 0 and ``states - 1``."""
+    P = np.zeros((states, states))
+    P[0, 0] = P[-1, -1] = 1  # Absorbing states
+    inner = np.arange(1, states - 1)
+    P[inner, inner - 1] = 1 - win_probability  # Probability of losing
+    P[inner, inner + 1] = win_probability      # Probability of winning
+    return P
+
+
+@st.cache_data(max_entries=MAX_CACHE_ENTRIES, show_spinner=False)
+def transition_matrix_power(states: int, win_probability: float, power: int) -> np.ndarray:
+    """Transition probabilities after ``power`` bets."""
+    return matrix_power(transition_matrix(states, win_probability), power)
+
+
+@st.cache_data(max_entries=MAX_CACHE_ENTRIES, show_spinner=False)
+def ruin_curve(target_fortune: int, win_probability: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Ruin probability for every initial fortune from 1 to the target.
+
+    Returns:
+        Tuple of (fortunes, ruin_probabilities)
+    """
+    fortunes = np.arange(1, target_fortune + 1)
+    ruin, _, _ = lookup_ruin_statistics(fortunes, target_fortune, win_probability)
+    return fortunes, ruin
+
+
+@st.cache_data(max_entries=MAX_CACHE_ENTRIES, show_spinner=False)
+def credit_limit_sweep(initial_fortune: int, target_fortune: int, win_probability: float,
+                       stop: int, step: int = 1, max_bet: int = 1,
+                       interest_rate: float = 0.0) -> Tuple[np.ndarray, np.ndarray]:
+    """Ruin probability for credit limits ``0, step, 2*step, ...`` below ``stop``.
+
+    All limits are solved exactly in one pass of ``src.loan.credit_limit_ruin``,
+    with bets of up to ``max_bet`` and interest charged on the debt after
+    every bet.
+
+    Returns:
+        Tuple of (credit_limits, ruin_probabilities)
+    """
+    credit_limits = np.arange(0, stop, step)
+    if credit_limits.size == 0:
+        return credit_limits, np.empty(0)
+    ruin, _ = credit_limit_ruin(initial_fortune, target_fortune, win_probability,
+                                int(credit_limits[-1]), max_bet=max_bet, interest_rate=interest_rate)
+    return credit_limits, ruin[credit_limits]
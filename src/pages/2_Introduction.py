@@ -1,8 +1,20 @@
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
 import requests
-from matplotlib.colors import LinearSegmentedColormap
+import sys
+from pathlib import Path
+
+# Make the repository root importable so the pages can share the src package
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from src.charts import credit_limit_chart, ruin_curve_chart, sample_paths_chart, transition_heatmap
+from src.encoding import NPZ_MEDIA_TYPE, decode_npz
+from src.simulation import simulate_path_bands
+from src.page_compute import (
+    credit_limit_sweep,
+    ruin_curve,
+    transition_matrix,
+    transition_matrix_power,
+)
 
 # Set page config
 st.set_page_config(
@@ -11,19 +23,6 @@ st.set_page_config(
     layout="wide"
 )
 
-# Custom color scheme
-colors = ['#FF9999', '#66B2FF', '#99FF99', '#FFCC99', '#FF99CC']
-custom_cmap = LinearSegmentedColormap.from_list('custom', colors)
-
-def matrix_power(matrix, power):
-    """Calculate the power of a matrix using numpy."""
-    if power == 1:
-        return matrix
-    result = matrix.copy()
-    for _ in range(power - 1):
-        result = np.dot(result, matrix)
-    return result
-
 def show_navigation():
     st.sidebar.title("Navigation")
     pages = {
@@ -134,11 +133,7 @@ def show_introduction():
             power = st.number_input("Matrix Power", 1, 100, 1, key="matrix_power")
 
         # Create transition matrix
-        P = np.zeros((states, states))
-        P[0,0] = P[-1,-1] = 1  # Absorbing states
-        for i in range(1, states-1):
-            P[i,i-1] = 1 - win_prob_matrix  # Probability of losing
-            P[i,i+1] = win_prob_matrix      # Probability of winning
+        P = transition_matrix(states, win_prob_matrix)
 
         # Display initial matrix
         st.write("Initial Transition Matrix:")
@@ -146,18 +141,12 @@ def show_introduction():
 
         # Calculate and display powered matrix
         if power > 1:
-            P_n = matrix_power(P, power)
+            P_n = transition_matrix_power(states, win_prob_matrix, power)
             st.write(f"Transition Matrix after {power} steps:")
             st.write(P_n)
 
-        # Add matrix visualization
-        fig_matrix, ax_matrix = plt.subplots(figsize=(4, 3))
-        im = ax_matrix.imshow(P, cmap=custom_cmap)
-        plt.colorbar(im)
-        ax_matrix.set_title("Transition Matrix Heatmap")
-        ax_matrix.set_xlabel("To State")
-        ax_matrix.set_ylabel("From State")
-        st.pyplot(fig_matrix)
+        # Add matrix visualization, rendered once per parameter set
+        st.image(transition_heatmap(states, win_prob_matrix))
 
     with tab3:
         st.header("Interactive Demo (without loan)")
@@ -170,62 +159,32 @@ def show_introduction():
         with col2:
             win_prob = st.slider("Win Probability", 0.0, 1.0, 0.5, 0.01, key="no_loan_prob")
             
-        if win_prob != 0.5:
-            ruin_prob = (1 - (win_prob/(1-win_prob))**initial_fortune)/(1 - (win_prob/(1-win_prob))**target_fortune)
-        else:
-            ruin_prob = initial_fortune/target_fortune
+        # Ruin probability for every initial fortune up to the target, read from
+        # the precomputed surface when the parameters are on its grid
+        _, ruin_probs = ruin_curve(target_fortune, win_prob)
+        ruin_prob = ruin_probs[initial_fortune - 1]
             
         st.write(f"Probability of Ruin: {ruin_prob:.2%}")
         
-        # Visualization
-        fortunes = np.arange(1, target_fortune + 1)
-        ruin_probs = []
-        for n in fortunes:
-            if win_prob != 0.5:
-                ruin_probs.append((1 - (win_prob/(1-win_prob))**n)/(1 - (win_prob/(1-win_prob))**target_fortune))
-            else:
-                ruin_probs.append(n/target_fortune)
-                
-        fig, ax = plt.subplots(figsize=(4, 3))
-        ax.plot(fortunes, ruin_probs, color=colors[0])
-        ax.set_xlabel("Initial Fortune ($)")
-        ax.set_ylabel("Probability of Ruin")
-        ax.set_title("Ruin Probability vs Initial Fortune")
-        ax.grid(True)
-        st.pyplot(fig)
+        # Visualization, rendered once per parameter set
+        st.image(ruin_curve_chart(target_fortune, win_prob))
 
         # Add simulation feature
         if st.button("Run Simulation", key="sim_button"):
             num_simulations = 1000
-            wins = 0
-            paths = []
             
             with st.spinner("Running simulation..."):
-                for _ in range(num_simulations):
-                    fortune = initial_fortune
-                    path = [fortune]
-                    while fortune > 0 and fortune < target_fortune:
-                        if np.random.random() < win_prob:
-                            fortune += 1
-                        else:
-                            fortune -= 1
-                        path.append(fortune)
-                    paths.append(path)
-                    if fortune >= target_fortune:
-                        wins += 1
+                # Full trajectories are kept only for the 10 plotted walkers; for all
+                # walkers only the fortune quantiles on a bounded time grid are kept
+                _, final_fortunes, paths, times, bands = simulate_path_bands(
+                    num_simulations, initial_fortune, target_fortune, win_prob, num_paths=10
+                )
                 
-                win_rate = wins / num_simulations
+                win_rate = np.count_nonzero(final_fortunes >= target_fortune) / num_simulations
                 st.success(f"Simulation completed! Win Rate: {win_rate:.2%}")
                 
-                # Plot sample paths
-                fig_paths, ax_paths = plt.subplots(figsize=(4, 3))
-                for i in range(min(10, len(paths))):
-                    ax_paths.plot(paths[i], alpha=0.5, color=colors[i % len(colors)])
-                ax_paths.set_xlabel("Steps")
-                ax_paths.set_ylabel("Fortune ($)")
-                ax_paths.set_title("Sample Paths")
-                ax_paths.grid(True)
-                st.pyplot(fig_paths)
+                # Plot decimated sample paths over the quantile bands of all walkers
+                st.image(sample_paths_chart(paths, times, bands))
 
     with tab4:
         st.header("Interactive Demo (with loan)")
@@ -239,12 +198,15 @@ def show_introduction():
         with col2:
             win_prob_loan = st.slider("Win Probability", 0.0, 1.0, 0.5, 0.01, key="loan_prob")
             max_bet = st.number_input("Maximum Bet ($)", 1, 100, 10)
+            interest = st.number_input("Interest per Bet on Debt (%)", 0.0, 10.0, 0.0, 0.1, key="loan_interest")
             
+        # Solve the loan model for every credit limit up to 50 past the chosen one in one pass
         total_capital = initial_fortune_loan + credit_limit
-        if win_prob_loan != 0.5:
-            ruin_prob_loan = (1 - (win_prob_loan/(1-win_prob_loan))**total_capital)/(1 - (win_prob_loan/(1-win_prob_loan))**target_fortune_loan)
-        else:
-            ruin_prob_loan = total_capital/target_fortune_loan
+        _, ruin_probs_loan = credit_limit_sweep(
+            initial_fortune_loan, target_fortune_loan, win_prob_loan, credit_limit + 51,
+            max_bet=max_bet, interest_rate=interest / 100
+        )
+        ruin_prob_loan = ruin_probs_loan[credit_limit]
             
         st.write(f"Probability of Ruin: {ruin_prob_loan:.2%}")
         st.write(f"Maximum Possible Loss: ${total_capital}")
@@ -261,23 +223,11 @@ def show_introduction():
         else:
             st.write("Strategy: Neutral - Game is fair, but house edge may apply")
 
-        # Loan scenario visualization
-        fig_loan, ax_loan = plt.subplots()
-        credit_limits = np.arange(0, credit_limit + 50, 10)
-        ruin_probs_loan = []
-        for cl in credit_limits:
-            total_cap = initial_fortune_loan + cl
-            if win_prob_loan != 0.5:
-                ruin_probs_loan.append((1 - (win_prob_loan/(1-win_prob_loan))**total_cap)/(1 - (win_prob_loan/(1-win_prob_loan))**target_fortune_loan))
-            else:
-                ruin_probs_loan.append(total_cap/target_fortune_loan)
-        
-        ax_loan.plot(credit_limits, ruin_probs_loan)
-        ax_loan.set_xlabel("Credit Limit ($)")
-        ax_loan.set_ylabel("Probability of Ruin")
-        ax_loan.set_title("Ruin Probability vs Credit Limit")
-        ax_loan.grid(True)
-        st.pyplot(fig_loan)
+        # Loan scenario visualization, rendered once per parameter set
+        st.image(credit_limit_chart(
+            initial_fortune_loan, target_fortune_loan, win_prob_loan, credit_limit + 51,
+            max_bet=max_bet, interest_rate=interest / 100, figsize=None
+        ))
 
     with tab5:
         st.header("API Demo")
@@ -320,14 +270,66 @@ def show_introduction():
                 except requests.exceptions.RequestException as e:
                     st.error(f"An error occurred: {str(e)}")
         
+        st.subheader("Monte Carlo Simulation")
+        col1, col2 = st.columns(2)
+        with col1:
+            sim_initial = st.number_input("Initial Fortune ($)", 1, 1000, 50, key="api_sim_initial")
+            sim_target = st.number_input("Target Fortune ($)", sim_initial + 1, 2000, 100, key="api_sim_target")
+        with col2:
+            sim_prob = st.slider("Win Probability", 0.0, 1.0, 0.5, 0.01, key="api_sim_prob")
+            sim_walkers = st.number_input("Number of Walkers", 1000, 1000000, 100000, 1000, key="api_sim_walkers")
+
+        if st.button("Simulate", key="api_sim_button"):
+            with st.spinner("Simulating..."):
+                try:
+                    # Per-walker results come back as a binary .npz archive
+                    # rather than long JSON lists
+                    response = requests.post(
+                        "http://localhost:8000/simulate",
+                        json={
+                            "num_simulations": sim_walkers,
+                            "initial_fortune": sim_initial,
+                            "target_fortune": sim_target,
+                            "win_probability": sim_prob,
+                            "max_steps": 100000,
+                            "return_walkers": True
+                        },
+                        headers={"Accept": NPZ_MEDIA_TYPE},
+                        timeout=30
+                    )
+                    response.raise_for_status()
+                    result = decode_npz(response.content)
+                    p50, p90, p99 = np.percentile(result["durations"], [50, 90, 99])
+
+                    st.success("Simulation completed successfully!")
+                    col1, col2, col3, col4 = st.columns(4)
+                    with col1:
+                        st.metric("Win Rate", f"{result['win_rate']:.2%}")
+                    with col2:
+                        st.metric("Median Duration", f"{p50:.0f} bets")
+                    with col3:
+                        st.metric("90th Percentile", f"{p90:.0f} bets")
+                    with col4:
+                        st.metric("99th Percentile", f"{p99:.0f} bets")
+
+                except requests.exceptions.Timeout:
+                    st.error("Request timed out. Please try again.")
+                except requests.exceptions.ConnectionError:
+                    st.error("Could not connect to the server. Please check if the API is running.")
+                except requests.exceptions.RequestException as e:
+                    st.error(f"An error occurred: {str(e)}")
+
         st.subheader("Analyze Strategy")
         col1, col2 = st.columns(2)
         with col1:
+            strategy_type = st.selectbox("Strategy", ["Fixed", "Martingale", "Kelly"], key="strategy_type")
             strategy_initial = st.number_input("Initial Fortune ($)", 1, 1000, 100, key="strategy_initial")
             strategy_target = st.number_input("Target Fortune ($)", strategy_initial + 1, 2000, 200, key="strategy_target")
         with col2:
             strategy_prob = st.slider("Win Probability", 0.0, 1.0, 0.5, 0.01, key="strategy_prob")
-            bet_multiplier = st.number_input("Bet Multiplier", 0.1, 2.0, 1.0, 0.1)
+            initial_bet = st.number_input("Initial Bet ($)", 1, 100, 1, key="strategy_bet",
+                                          help="Kelly bets a fraction of the current fortune instead")
+            stop_loss = st.number_input("Stop Loss ($)", 1, 1000, 50, key="strategy_stop_loss")
             
         if st.button("Analyze", key="analyze_button"):
             with st.spinner("Analyzing strategy..."):
@@ -335,28 +337,43 @@ def show_introduction():
                     response = requests.post(
                         "http://localhost:8000/analyze_strategy",
                         json={
+                            "strategy_type": strategy_type,
+                            "initial_bet": initial_bet,
                             "initial_fortune": strategy_initial,
-                            "target_fortune": strategy_target,
                             "win_probability": strategy_prob,
-                            "bet_multiplier": bet_multiplier
+                            "target_fortune": strategy_target,
+                            "stop_loss": stop_loss
                         },
-                        timeout=5
+                        timeout=30
                     )
                     response.raise_for_status()
                     result = response.json()
+                    simulation = result['simulation']
                     
                     # Create a nice display for results
                     st.success("Analysis completed successfully!")
                     
                     # Display results in a more organized way
                     st.markdown("### Strategy Analysis Results")
-                    col1, col2, col3 = st.columns(3)
+                    col1, col2, col3, col4 = st.columns(4)
                     with col1:
                         st.metric("Risk Level", result['risk_level'])
                     with col2:
-                        st.metric("Expected Return", f"${result['expected_return']:.2f}")
+                        st.metric("Largest Bet", f"${result['max_bet']:.2f}")
+                    with col3:
+                        st.metric("Largest Loss", f"${result['max_loss']:.2f}")
+                    with col4:
+                        st.metric("Recommended Bet", f"${result['recommended_bet_size']:.2f}")
+                    
+                    col1, col2, col3, col4 = st.columns(4)
+                    with col1:
+                        st.metric("Reach Target", f"{simulation['target_probability']:.1%}")
+                    with col2:
+                        st.metric("Ruin", f"{simulation['ruin_probability']:.1%}")
                     with col3:
-                        st.info(result['recommendation'])
+                        st.metric("Hit Stop Loss", f"{simulation['stop_loss_probability']:.1%}")
+                    with col4:
+                        st.metric("Mean Final Fortune", f"${simulation['final_wealth']['mean']:.2f}")
                         
                 except requests.exceptions.Timeout:
                     st.error("Request timed out. Please try again.")
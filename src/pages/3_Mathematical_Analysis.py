@@ -1,7 +1,11 @@
 import streamlit as st
-import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.colors import LinearSegmentedColormap
+import sys
+from pathlib import Path
+
+# Make the repository root importable so the pages can share the src package
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from src.charts import transition_heatmap
+from src.page_compute import transition_matrix, transition_matrix_power
 
 # Set page config
 st.set_page_config(
@@ -10,10 +14,6 @@ st.set_page_config(
     layout="wide"
 )
 
-# Custom color scheme
-colors = ['#FF9999', '#66B2FF', '#99FF99', '#FFCC99', '#FF99CC']
-custom_cmap = LinearSegmentedColormap.from_list('custom', colors)
-
 def show_navigation():
     st.sidebar.title("Navigation")
     pages = {
@@ -29,15 +29,6 @@ def show_navigation():
         if st.sidebar.button(page_name):
             st.switch_page(f"{page_file}.py")
 
-def matrix_power(matrix, power):
-    """Calculate the power of a matrix using numpy."""
-    if power == 1:
-        return matrix
-    result = matrix.copy()
-    for _ in range(power - 1):
-        result = np.dot(result, matrix)
-    return result
-
 def show_mathematical_analysis():
     show_navigation()
     
@@ -94,11 +85,7 @@ def show_mathematical_analysis():
         power = st.number_input("Matrix Power", 1, 100, 1, key="matrix_power")
 
     # Create transition matrix
-    P = np.zeros((states, states))
-    P[0,0] = P[-1,-1] = 1  # Absorbing states
-    for i in range(1, states-1):
-        P[i,i-1] = 1 - win_prob_matrix  # Probability of losing
-        P[i,i+1] = win_prob_matrix      # Probability of winning
+    P = transition_matrix(states, win_prob_matrix)
 
     # Display initial matrix
     st.write("Initial Transition Matrix:")
@@ -106,18 +93,12 @@ def show_mathematical_analysis():
 
     # Calculate and display powered matrix
     if power > 1:
-        P_n = matrix_power(P, power)
+        P_n = transition_matrix_power(states, win_prob_matrix, power)
         st.write(f"Transition Matrix after {power} steps:")
         st.write(P_n)
 
-    # Add matrix visualization
-    fig_matrix, ax_matrix = plt.subplots(figsize=(4, 3))
-    im = ax_matrix.imshow(P, cmap=custom_cmap)
-    plt.colorbar(im)
-    ax_matrix.set_title("Transition Matrix Heatmap")
-    ax_matrix.set_xlabel("To State")
-    ax_matrix.set_ylabel("From State")
-    st.pyplot(fig_matrix)
+    # Add matrix visualization, rendered once per parameter set
+    st.image(transition_heatmap(states, win_prob_matrix))
 
 if __name__ == "__main__":
     show_mathematical_analysis() 
\ No newline at end of file
@@ -1,7 +1,13 @@
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.colors import LinearSegmentedColormap
+import sys
+from pathlib import Path
+
+# Make the repository root importable so the pages can share the src package
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from src.simulation import simulate_path_bands
+from src.charts import ruin_curve_chart, sample_paths_chart
+from src.page_compute import ruin_curve
 
 # Set page config
 st.set_page_config(
@@ -10,10 +16,6 @@ st.set_page_config(
     layout="wide"
 )
 
-# Custom color scheme
-colors = ['#FF9999', '#66B2FF', '#99FF99', '#FFCC99', '#FF99CC']
-custom_cmap = LinearSegmentedColormap.from_list('custom', colors)
-
 def show_navigation():
     st.sidebar.title("Navigation")
     pages = {
@@ -42,62 +44,32 @@ def show_interactive_demo_no_loan():
     with col2:
         win_prob = st.slider("Win Probability", 0.0, 1.0, 0.5, 0.01, key="no_loan_prob")
         
-    if win_prob != 0.5:
-        ruin_prob = (1 - (win_prob/(1-win_prob))**initial_fortune)/(1 - (win_prob/(1-win_prob))**target_fortune)
-    else:
-        ruin_prob = initial_fortune/target_fortune
+    # Ruin probability for every initial fortune up to the target, read from
+    # the precomputed surface when the parameters are on its grid
+    _, ruin_probs = ruin_curve(target_fortune, win_prob)
+    ruin_prob = ruin_probs[initial_fortune - 1]
         
     st.write(f"Probability of Ruin: {ruin_prob:.2%}")
     
-    # Visualization
-    fortunes = np.arange(1, target_fortune + 1)
-    ruin_probs = []
-    for n in fortunes:
-        if win_prob != 0.5:
-            ruin_probs.append((1 - (win_prob/(1-win_prob))**n)/(1 - (win_prob/(1-win_prob))**target_fortune))
-        else:
-            ruin_probs.append(n/target_fortune)
-            
-    fig, ax = plt.subplots(figsize=(4, 3))
-    ax.plot(fortunes, ruin_probs, color=colors[0])
-    ax.set_xlabel("Initial Fortune ($)")
-    ax.set_ylabel("Probability of Ruin")
-    ax.set_title("Ruin Probability vs Initial Fortune")
-    ax.grid(True)
-    st.pyplot(fig)
+    # Visualization, rendered once per parameter set
+    st.image(ruin_curve_chart(target_fortune, win_prob))
 
     # Add simulation feature
     if st.button("Run Simulation", key="sim_button"):
         num_simulations = 1000
-        wins = 0
-        paths = []
         
         with st.spinner("Running simulation..."):
-            for _ in range(num_simulations):
-                fortune = initial_fortune
-                path = [fortune]
-                while fortune > 0 and fortune < target_fortune:
-                    if np.random.random() < win_prob:
-                        fortune += 1
-                    else:
-                        fortune -= 1
-                    path.append(fortune)
-                paths.append(path)
-                if fortune >= target_fortune:
-                    wins += 1
+            # Full trajectories are kept only for the 10 plotted walkers; for all
+            # walkers only the fortune quantiles on a bounded time grid are kept
+            _, final_fortunes, paths, times, bands = simulate_path_bands(
+                num_simulations, initial_fortune, target_fortune, win_prob, num_paths=10
+            )
             
-            win_rate = wins / num_simulations
+            win_rate = np.count_nonzero(final_fortunes >= target_fortune) / num_simulations
             st.success(f"Simulation completed! Win Rate: {win_rate:.2%}")
             
-            # Plot sample paths
-            fig_paths, ax_paths = plt.subplots(figsize=(4, 3))
-            for i in range(min(10, len(paths))):
-                ax_paths.plot(paths[i], alpha=0.5, color=colors[i % len(colors)])
-            ax_paths.set_xlabel("Steps")
-            ax_paths.set_ylabel("Fortune ($)")
-            ax_paths.set_title("Sample Paths")
-            ax_paths.grid(True)
-            st.pyplot(fig_paths)
+            # Plot decimated sample paths over the quantile bands of all walkers
+            st.image(sample_paths_chart(paths, times, bands))
 
 if __name__ == "__main__":
     show_interactive_demo_no_loan() 
\ No newline at end of file
@@ -1,7 +1,11 @@
 import streamlit as st
-import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.colors import LinearSegmentedColormap
+import sys
+from pathlib import Path
+
+# Make the repository root importable so the pages can share the src package
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from src.charts import credit_limit_chart
+from src.page_compute import credit_limit_sweep
 
 # Set page config
 st.set_page_config(
@@ -10,9 +14,8 @@ st.set_page_config(
     layout="wide"
 )
 
-# Custom color scheme
-colors = ['#FF9999', '#66B2FF', '#99FF99', '#FFCC99', '#FF99CC']
-custom_cmap = LinearSegmentedColormap.from_list('custom', colors)
+# Largest credit limit offered by the input and covered by the sweep
+MAX_CREDIT_LIMIT = 1000
 
 def show_navigation():
     st.sidebar.title("Navigation")
@@ -38,17 +41,19 @@ def show_interactive_demo_with_loan():
     with col1:
         initial_fortune = st.number_input("Initial Fortune ($)", 1, 1000, 100, key="with_loan_initial")
         target_fortune = st.number_input("Target Fortune ($)", initial_fortune + 1, 2000, 200, key="with_loan_target")
-        credit_limit = st.number_input("Credit Limit ($)", 0, 1000, 100, key="credit_limit")
+        credit_limit = st.number_input("Credit Limit ($)", 0, MAX_CREDIT_LIMIT, 100, key="credit_limit")
     
     with col2:
         win_prob = st.slider("Win Probability", 0.0, 1.0, 0.5, 0.01, key="with_loan_prob")
         max_bet = st.number_input("Maximum Bet ($)", 1, 100, 10, key="max_bet")
+        interest = st.number_input("Interest per Bet on Debt (%)", 0.0, 10.0, 0.0, 0.1, key="interest")
         
-    # Calculate ruin probability
-    if win_prob != 0.5:
-        ruin_prob = (1 - (win_prob/(1-win_prob))**(initial_fortune + credit_limit))/(1 - (win_prob/(1-win_prob))**(target_fortune + credit_limit))
-    else:
-        ruin_prob = (initial_fortune + credit_limit)/(target_fortune + credit_limit)
+    # Solve the loan model for every credit limit the input allows in one pass
+    _, ruin_probs = credit_limit_sweep(
+        initial_fortune, target_fortune, win_prob, MAX_CREDIT_LIMIT + 1,
+        max_bet=max_bet, interest_rate=interest / 100
+    )
+    ruin_prob = ruin_probs[credit_limit]
         
     st.write(f"Probability of Ruin: {ruin_prob:.2%}")
     
@@ -63,22 +68,11 @@ def show_interactive_demo_with_loan():
     else:
         st.info("Strategy is break-even in the long run.")
     
-    # Visualization
-    credit_limits = np.arange(0, credit_limit + 1)
-    ruin_probs = []
-    for limit in credit_limits:
-        if win_prob != 0.5:
-            ruin_probs.append((1 - (win_prob/(1-win_prob))**(initial_fortune + limit))/(1 - (win_prob/(1-win_prob))**(target_fortune + limit)))
-        else:
-            ruin_probs.append((initial_fortune + limit)/(target_fortune + limit))
-            
-    fig, ax = plt.subplots(figsize=(4, 3))
-    ax.plot(credit_limits, ruin_probs, color=colors[0])
-    ax.set_xlabel("Credit Limit ($)")
-    ax.set_ylabel("Probability of Ruin")
-    ax.set_title("Ruin Probability vs Credit Limit")
-    ax.grid(True)
-    st.pyplot(fig)
+    # Visualization, rendered once per parameter set
+    st.image(credit_limit_chart(
+        initial_fortune, target_fortune, win_prob, MAX_CREDIT_LIMIT + 1,
+        max_bet=max_bet, interest_rate=interest / 100, marker=credit_limit
+    ))
 
 if __name__ == "__main__":
     show_interactive_demo_with_loan() 
\ No newline at end of file
@@ -0,0 +1,199 @@
+"""
+Opt-in profiling of the API's computations.
+
+Profiling is off unless ``PROFILE_TOKEN`` or ``PROFILE_ALL`` is set when the
+API starts; otherwise ``profiled`` returns functions unchanged and no
+middleware is installed, so it costs nothing. When enabled:
+
+- ``PROFILE_ALL=1`` profiles every request with cProfile.
+- With ``PROFILE_TOKEN`` set, a request is profiled when it carries the
+  header ``X-Profile-Token: <token>``. The ``X-Profile`` header picks the mode:
+  ``cprofile`` (default) or ``collapsed``.
+
+In ``cprofile`` mode the profile is saved as a ``.prof`` file (readable with
+``pstats`` or snakeviz) in ``PROFILE_DIR`` (default ``profiles``), keeping the
+newest ``PROFILE_KEEP`` files, and its name is returned in the
+``X-Profile-File`` response header. In ``collapsed`` mode the calling thread
+is sampled every ``PROFILE_SAMPLE_INTERVAL`` seconds and the response body is
+replaced by the sampled stacks in collapsed format, one ``frame;frame;... count``
+line per stack, ready for flamegraph.pl or speedscope.
+
+Only functions decorated with ``profiled`` are profiled, wherever they run:
+the active profile is carried in a context variable, which the CPU executor
+passes on to its worker threads.
+"""
+
+import cProfile
+import contextvars
+import functools
+import hmac
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Optional
+
+PROFILE_TOKEN = os.environ.get("PROFILE_TOKEN", "")
+PROFILE_ALL = os.environ.get("PROFILE_ALL", "") not in ("", "0")
+PROFILE_DIR = Path(os.environ.get("PROFILE_DIR", "profiles"))
+PROFILE_KEEP = int(os.environ.get("PROFILE_KEEP", "100"))
+PROFILE_SAMPLE_INTERVAL = float(os.environ.get("PROFILE_SAMPLE_INTERVAL", "0.001"))
+
+ENABLED = bool(PROFILE_TOKEN) or PROFILE_ALL
+
+_active_profile: "contextvars.ContextVar[Optional[RequestProfile]]" = contextvars.ContextVar(
+    "active_profile", default=None)
+
+
+class RequestProfile:
+    """Profile collected over the profiled calls of one request.
+
+    Attributes:
+        mode (str): "cprofile" or "collapsed"
+        calls (int): Number of profiled calls made so far
+        stacks (Counter): Sample counts by collapsed stack, in collapsed mode
+    """
+
+    def __init__(self, mode: str):
+        self.mode = mode
+        self.calls = 0
+        self.stacks = Counter()
+        self._profiler = cProfile.Profile() if mode == "cprofile" else None
+        self._lock = threading.Lock()
+
+    def call(self, func: Callable, *args, **kwargs):
+        """Run ``func`` under the profiler.
+
+        Calls are profiled one at a time; a call made while another is being
+        profiled (e.g. a nested profiled function) runs as part of the outer one.
+        """
+        if not self._lock.acquire(blocking=False):
+            return func(*args, **kwargs)
+        try:
+            self.calls += 1
+            if self._profiler is not None:
+                return self._profiler.runcall(func, *args, **kwargs)
+            return self._sample(func, args, kwargs)
+        finally:
+            self._lock.release()
+
+    def write(self, directory: Path, label: str) -> Path:
+        """Save the cProfile statistics and drop the oldest saved profiles.
+
+        Args:
+            directory (Path): Directory holding the profiles
+            label (str): Description of the request, used in the file name
+
+        Returns:
+            Path of the saved profile
+        """
+        directory.mkdir(parents=True, exist_ok=True)
+        slug = "".join(c if c.isalnum() else "_" for c in label).strip("_")
+        path = directory / f"{time.strftime('%Y%m%dT%H%M%S')}-{slug}-{uuid.uuid4().hex[:8]}.prof"
+        self._profiler.dump_stats(path)
+        saved = sorted(directory.glob("*.prof"), key=lambda p: p.stat().st_mtime)
+        for old in saved[:max(0, len(saved) - PROFILE_KEEP)]:
+            old.unlink(missing_ok=True)
+        return path
+
+    def collapsed(self) -> str:
+        """Sampled stacks in collapsed format, most frequent first."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def _sample(self, func: Callable, args: tuple, kwargs: dict):
+        thread_id = threading.get_ident()
+        entry = sys._getframe()
+        done = threading.Event()
+
+        def sampler():
+            while not done.wait(PROFILE_SAMPLE_INTERVAL):
+                frame = sys._current_frames().get(thread_id)
+                names = []
+                while frame is not None and frame is not entry:
+                    code = frame.f_code
+                    names.append(f"{Path(code.co_filename).stem}:{code.co_name}")
+                    frame = frame.f_back
+                if frame is entry and names:
+                    self.stacks[";".join(reversed(names))] += 1
+
+        thread = threading.Thread(target=sampler, name="profile-sampler", daemon=True)
+        thread.start()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            done.set()
+            thread.join()
+
+
+def profiled(func: Callable) -> Callable:
+    """Profile calls of ``func`` made while a request is being profiled.
+
+    Returns ``func`` itself when profiling is disabled.
+    """
+    if not ENABLED:
+        return func
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        profile = _active_profile.get()
+        if profile is None:
+            return func(*args, **kwargs)
+        return profile.call(func, *args, **kwargs)
+
+    return wrapper
+
+
+class ProfilingMiddleware:
+    """ASGI middleware that activates profiling for selected requests."""
+
+    def __init__(self, app):
+        self.app = app
+
+    def _mode(self, scope) -> Optional[str]:
+        headers = dict(scope["headers"])
+        token = headers.get(b"x-profile-token")
+        if PROFILE_TOKEN and token is not None and hmac.compare_digest(token, PROFILE_TOKEN.encode()):
+            mode = headers.get(b"x-profile", b"cprofile").decode("latin-1").lower()
+            return mode if mode in ("cprofile", "collapsed") else "cprofile"
+        return "cprofile" if PROFILE_ALL else None
+
+    async def __call__(self, scope, receive, send):
+        mode = self._mode(scope) if scope["type"] == "http" else None
+        if mode is None:
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(mode)
+        label = f"{scope['method']} {scope['path']}"
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                if mode == "collapsed":
+                    body = profile.collapsed().encode()
+                    await send({
+                        "type": "http.response.start",
+                        "status": 200,
+                        "headers": [
+                            (b"content-type", b"text/plain; charset=utf-8"),
+                            (b"content-length", str(len(body)).encode()),
+                            (b"x-profile-status", str(message["status"]).encode()),
+                        ],
+                    })
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                if profile.calls:
+                    path = profile.write(PROFILE_DIR, label)
+                    message = {**message, "headers": list(message.get("headers", [])) + [
+                        (b"x-profile-file", path.name.encode())]}
+            elif message["type"] == "http.response.body" and mode == "collapsed":
+                return
+            await send(message)
+
+        token = _active_profile.set(profile)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _active_profile.reset(token)
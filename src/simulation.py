@@ -0,0 +1,793 @@
+"""
+Vectorized Monte Carlo engine for the Gambler's Ruin problem.
+
+All walkers are held in one NumPy array and advanced together. Each round a
+walker at distance ``d`` from the nearest absorbing barrier plays a block of
+``d - 1`` bets at once: the block cannot reach a barrier, so its net result is
+an exact ``Binomial(d - 1, p)`` draw. Walkers next to a barrier play single
+bets. Absorbed walkers are compacted out of the working set after every round,
+so the cost of a run tracks the number of live walkers rather than the number
+of individual bets.
+
+Large runs are split into fixed-size shards with independent
+``SeedSequence`` child streams, which can be spread over a process pool
+shared by all runs.
+"""
+
+import math
+import os
+import threading
+import numpy as np
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from src.analytics import ruin_statistics
+from src.streaming import FixedHistogram, QuantileSketch, RunningStats
+
+# Walkers per shard. Fixed so that the shard layout, and therefore the random
+# streams, depend only on num_simulations and the seed.
+SHARD_SIZE = 1 << 17
+
+# Step cap used when the caller asks for none; far beyond any reachable duration.
+_NO_STEP_CAP = np.iinfo(np.int64).max // 2
+
+# Steps drawn at once when recording full trajectories.
+PATH_BLOCK_STEPS = 4096
+
+# Fortune quantiles reported by simulate_path_bands: median, 50% and 90% bands.
+BAND_QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+# Duration percentiles reported in summaries, and the relative accuracy of
+# the sketch they are read from.
+DURATION_PERCENTILES = (50, 90, 99)
+DURATION_SKETCH_ACCURACY = 0.01
+
+# Bins of the final-fortune histogram in summaries.
+FORTUNE_BINS = 50
+
+# Size of the process pool that shards run on; caps the workers of any run.
+MAX_WORKERS = int(os.environ.get("SIM_MAX_WORKERS", str(os.cpu_count() or 1)))
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _shard_pool() -> ProcessPoolExecutor:
+    """The shared process pool, started on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=MAX_WORKERS)
+        return _pool
+
+
+def simulate_walkers(num_simulations: int, initial_fortune: int, target_fortune: int,
+                     win_probability: float, max_steps: Optional[int] = 1000,
+                     rng: Optional[np.random.Generator] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Simulate independent walkers until absorption or the step cap.
+
+    Args:
+        num_simulations (int): Number of walkers to simulate
+        initial_fortune (int): Starting amount of money
+        target_fortune (int): Target amount to reach
+        win_probability (float): Probability of winning each bet
+        max_steps (Optional[int]): Maximum number of bets played by any walker; None for no cap
+        rng (np.random.Generator): Random generator; a fresh one is created if omitted
+
+    Returns:
+        Tuple of (durations, final_fortunes), both int64 arrays of length num_simulations
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    if max_steps is None:
+        max_steps = _NO_STEP_CAP
+
+    durations = np.zeros(num_simulations, dtype=np.int64)
+    final_fortunes = np.full(num_simulations, initial_fortune, dtype=np.int64)
+    if num_simulations == 0 or initial_fortune <= 0 or initial_fortune >= target_fortune or max_steps <= 0:
+        return durations, final_fortunes
+
+    alive = np.arange(num_simulations)
+    fortunes = final_fortunes.copy()
+    elapsed = np.zeros(num_simulations, dtype=np.int64)
+    while alive.size:
+        distance = np.minimum(fortunes, target_fortune - fortunes)
+        block = np.minimum(np.maximum(distance - 1, 1), max_steps - elapsed)
+        fortunes += 2 * rng.binomial(block, win_probability) - block
+        elapsed += block
+
+        stopped = (fortunes <= 0) | (fortunes >= target_fortune) | (elapsed >= max_steps)
+        done = alive[stopped]
+        durations[done] = elapsed[stopped]
+        final_fortunes[done] = fortunes[stopped]
+
+        running = ~stopped
+        alive = alive[running]
+        fortunes = fortunes[running]
+        elapsed = elapsed[running]
+
+    return durations, final_fortunes
+
+
+def record_paths(num_paths: int, initial_fortune: int, target_fortune: int,
+                 win_probability: float, max_steps: Optional[int] = None,
+                 rng: Optional[np.random.Generator] = None) -> List[np.ndarray]:
+    """Simulate walkers bet by bet and keep their full trajectories.
+
+    Trajectories are written block by block into one preallocated 2-D array
+    of int16 (int32 when fortunes may exceed its range), which doubles in
+    length when a walker outlives it. The returned paths are views into it.
+
+    Args:
+        num_paths (int): Number of walkers to record
+        initial_fortune (int): Starting amount of money
+        target_fortune (int): Target amount to reach
+        win_probability (float): Probability of winning each bet
+        max_steps (Optional[int]): Maximum number of bets played by any walker; None for no cap
+        rng (np.random.Generator): Random generator; a fresh one is created if omitted
+
+    Returns:
+        List of num_paths arrays, each holding a fortune before the first bet
+        and after every bet until the walker stopped
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    if max_steps is None:
+        max_steps = _NO_STEP_CAP
+
+    dtype = np.int16 if max(abs(initial_fortune), abs(target_fortune)) < np.iinfo(np.int16).max else np.int32
+    record = np.empty((num_paths, PATH_BLOCK_STEPS + 1), dtype=dtype)
+    record[:, 0] = initial_fortune
+    lengths = np.zeros(num_paths, dtype=np.int64)
+    if initial_fortune <= 0 or initial_fortune >= target_fortune:
+        return [record[i, :1] for i in range(num_paths)]
+
+    alive = np.arange(num_paths)
+    fortunes = np.full(num_paths, initial_fortune, dtype=np.int64)
+    steps = 0
+    while alive.size and steps < max_steps:
+        block = min(PATH_BLOCK_STEPS, max_steps - steps)
+        if steps + block + 1 > record.shape[1]:
+            grown = np.empty((num_paths, 2 * record.shape[1] - 1), dtype=dtype)
+            grown[:, :steps + 1] = record[:, :steps + 1]
+            record = grown
+
+        moves = np.where(rng.random((alive.size, block)) < win_probability, 1, -1)
+        paths = np.cumsum(moves, axis=1) + fortunes[:, None]
+        record[alive, steps + 1:steps + block + 1] = paths
+
+        absorbed = (paths <= 0) | (paths >= target_fortune)
+        hit = absorbed.any(axis=1)
+        lengths[alive[hit]] = steps + absorbed[hit].argmax(axis=1) + 1
+
+        steps += block
+        fortunes = paths[~hit, -1]
+        alive = alive[~hit]
+
+    lengths[alive] = steps
+    return [record[i, :lengths[i] + 1] for i in range(num_paths)]
+
+
+def simulate_with_sample_paths(num_simulations: int, initial_fortune: int, target_fortune: int,
+                               win_probability: float, num_paths: int = 10,
+                               max_steps: Optional[int] = None,
+                               rng: Optional[np.random.Generator] = None) -> Tuple[np.ndarray, np.ndarray, List[np.ndarray]]:
+    """Simulate walkers, recording full trajectories for a random sample only.
+
+    The recorded walkers form a uniform random sample of ``num_paths`` of the
+    ``num_simulations`` walkers, as a reservoir sample over the run would.
+    Because walkers are independent and identically distributed, the sample
+    can be drawn before the run: the sampled walkers are simulated bet by bet
+    by ``record_paths`` and all others by the summary-only ``simulate_walkers``.
+
+    Args:
+        num_simulations (int): Number of walkers to simulate
+        initial_fortune (int): Starting amount of money
+        target_fortune (int): Target amount to reach
+        win_probability (float): Probability of winning each bet
+        num_paths (int): Number of walkers whose trajectories are kept
+        max_steps (Optional[int]): Maximum number of bets played by any walker; None for no cap
+        rng (np.random.Generator): Random generator; a fresh one is created if omitted
+
+    Returns:
+        Tuple of (durations, final_fortunes, paths): per-walker int64 arrays of
+        length num_simulations, and the trajectories of the sampled walkers in
+        the order they appear in the run
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    num_paths = min(num_paths, num_simulations)
+    sampled = np.sort(rng.choice(num_simulations, size=num_paths, replace=False))
+
+    paths = record_paths(num_paths, initial_fortune, target_fortune, win_probability,
+                         max_steps=max_steps, rng=rng)
+    others = np.ones(num_simulations, dtype=bool)
+    others[sampled] = False
+
+    durations = np.empty(num_simulations, dtype=np.int64)
+    final_fortunes = np.empty(num_simulations, dtype=np.int64)
+    durations[others], final_fortunes[others] = simulate_walkers(
+        num_simulations - num_paths, initial_fortune, target_fortune, win_probability,
+        max_steps=max_steps, rng=rng
+    )
+    durations[sampled] = [path.size - 1 for path in paths]
+    final_fortunes[sampled] = [path[-1] for path in paths]
+    return durations, final_fortunes, paths
+
+
+def _time_grid(initial_fortune: int, target_fortune: int, win_probability: float,
+               max_points: int, max_steps: int) -> Tuple[np.ndarray, int]:
+    """Evenly spaced times covering four expected durations, or ``max_steps``."""
+    playing = 0 < initial_fortune < target_fortune
+    _, _, expected_duration = ruin_statistics(initial_fortune, target_fortune, win_probability)
+    horizon = int(min(4 * float(expected_duration), max_steps)) if playing else 0
+    stride = max(1, -(-horizon // (max_points - 1)))
+    return np.arange(0, horizon + stride, stride), stride
+
+
+def simulate_path_bands(num_simulations: int, initial_fortune: int, target_fortune: int,
+                        win_probability: float, quantiles: Sequence[float] = BAND_QUANTILES,
+                        num_paths: int = 10, max_points: int = 512, max_steps: Optional[int] = None,
+                        rng: Optional[np.random.Generator] = None) -> Tuple[np.ndarray, np.ndarray, List[np.ndarray], np.ndarray, np.ndarray]:
+    """Simulate walkers and track quantiles of the fortune of all of them over time.
+
+    Like ``simulate_with_sample_paths``, full trajectories are recorded for a
+    random sample of ``num_paths`` walkers only. The other walkers are moved
+    in binomial blocks as in ``simulate_walkers``, except that blocks also end
+    at the points of a time grid, where each walker's fortune is added to a
+    histogram of fortunes per grid point (stopped walkers keep their final
+    fortune). The grid spans four expected durations, or ``max_steps``, in at
+    most ``max_points`` points, so memory and the number of rounds stay
+    bounded however long the game runs. It is cut short once every walker,
+    and every sampled trajectory, has stopped.
+
+    Args:
+        num_simulations (int): Number of walkers to simulate
+        initial_fortune (int): Starting amount of money
+        target_fortune (int): Target amount to reach
+        win_probability (float): Probability of winning each bet
+        quantiles (Sequence[float]): Fortune quantiles to track, in [0, 1]
+        num_paths (int): Number of walkers whose trajectories are kept
+        max_points (int): Largest number of grid points
+        max_steps (Optional[int]): Maximum number of bets played by any walker; None for no cap
+        rng (np.random.Generator): Random generator; a fresh one is created if omitted
+
+    Returns:
+        Tuple of (durations, final_fortunes, paths, times, bands): per-walker
+        int64 arrays of length num_simulations, the trajectories of the
+        sampled walkers, the grid times, and an array of shape
+        ``(len(quantiles), len(times))`` with the fortune quantiles at those times
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    if max_steps is None:
+        max_steps = _NO_STEP_CAP
+    num_paths = min(num_paths, num_simulations)
+    sampled = np.sort(rng.choice(num_simulations, size=num_paths, replace=False))
+    paths = record_paths(num_paths, initial_fortune, target_fortune, win_probability,
+                         max_steps=max_steps, rng=rng)
+
+    playing = 0 < initial_fortune < target_fortune
+    times, stride = _time_grid(initial_fortune, target_fortune, win_probability, max_points, max_steps)
+    last_grid = int(times[-1])
+
+    # Walkers seen at each grid point by fortune; stopped walkers are counted
+    # once at the first grid point after they stop and carried forward.
+    lowest = min(initial_fortune, 0)
+    width = max(target_fortune, initial_fortune) - lowest + 1
+    running_counts = np.zeros((times.size, width), dtype=np.int64)
+    stopped_counts = np.zeros((times.size, width), dtype=np.int64)
+
+    count = num_simulations - num_paths
+    durations = np.zeros(count, dtype=np.int64)
+    final_fortunes = np.full(count, initial_fortune, dtype=np.int64)
+    if not playing:
+        stopped_counts[0, initial_fortune - lowest] += count
+
+    alive = np.arange(count) if playing else np.arange(0)
+    fortunes = final_fortunes[alive]
+    elapsed = np.zeros(alive.size, dtype=np.int64)
+    running_counts[0, initial_fortune - lowest] += alive.size
+    while alive.size:
+        distance = np.minimum(fortunes, target_fortune - fortunes)
+        next_grid = np.where(elapsed < last_grid, (elapsed // stride + 1) * stride, max_steps)
+        block = np.minimum(np.maximum(distance - 1, 1), np.minimum(next_grid, max_steps) - elapsed)
+        fortunes += 2 * rng.binomial(block, win_probability) - block
+        elapsed += block
+
+        stopped = (fortunes <= 0) | (fortunes >= target_fortune) | (elapsed >= max_steps)
+        on_grid = ~stopped & (elapsed % stride == 0) & (elapsed <= last_grid)
+        np.add.at(running_counts, (elapsed[on_grid] // stride, fortunes[on_grid] - lowest), 1)
+        first_point = -(-elapsed[stopped] // stride)
+        inside = first_point < times.size
+        np.add.at(stopped_counts, (first_point[inside], fortunes[stopped][inside] - lowest), 1)
+
+        done = alive[stopped]
+        durations[done] = elapsed[stopped]
+        final_fortunes[done] = fortunes[stopped]
+
+        running = ~stopped
+        alive = alive[running]
+        fortunes = fortunes[running]
+        elapsed = elapsed[running]
+
+    # Drop the grid points after everyone has stopped.
+    moving = np.nonzero(running_counts.any(axis=1))[0]
+    longest = max((path.size - 1 for path in paths), default=0)
+    end = min(times.size, max(moving[-1] + 2 if moving.size else 1, -(-longest // stride) + 1))
+    times = times[:end]
+    running_counts = running_counts[:end]
+    stopped_counts = stopped_counts[:end]
+
+    # The sampled walkers count at every grid point as well.
+    for path in paths:
+        positions = np.minimum(times, path.size - 1)
+        running_counts[np.arange(times.size), path[positions] - lowest] += 1
+
+    # Quantiles per grid point from the cumulative fortune histogram.
+    counts = running_counts + np.cumsum(stopped_counts, axis=0)
+    cdf = np.cumsum(counts, axis=1)
+    totals = cdf[:, -1:]
+    bands = np.stack([
+        (cdf < np.maximum(q * totals, 1)).sum(axis=1) + lowest for q in quantiles
+    ])
+
+    others = np.ones(num_simulations, dtype=bool)
+    others[sampled] = False
+    all_durations = np.empty(num_simulations, dtype=np.int64)
+    all_fortunes = np.empty(num_simulations, dtype=np.int64)
+    all_durations[others], all_fortunes[others] = durations, final_fortunes
+    all_durations[sampled] = [path.size - 1 for path in paths]
+    all_fortunes[sampled] = [path[-1] for path in paths]
+    return all_durations, all_fortunes, paths, times, bands
+
+
+def simulate_grid_paths(num_simulations: int, initial_fortune: int, target_fortune: int,
+                        win_probability: float, max_points: int = 256, max_steps: Optional[int] = None,
+                        rng: Optional[np.random.Generator] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Simulate walkers and record every walker's fortune on a coarse time grid.
+
+    Walkers are moved in binomial blocks that end at the grid points, as in
+    ``simulate_path_bands``, and each walker's fortune is stored at every grid
+    point instead of being counted in a histogram. This keeps a trajectory of
+    at most ``max_points`` values per walker, enough to plot thousands of
+    walkers at once, in ``num_simulations * max_points`` values of memory
+    however long the game runs. Excursions between grid points are not kept.
+
+    Args:
+        num_simulations (int): Number of walkers to simulate
+        initial_fortune (int): Starting amount of money
+        target_fortune (int): Target amount to reach
+        win_probability (float): Probability of winning each bet
+        max_points (int): Largest number of grid points
+        max_steps (Optional[int]): Maximum number of bets played by any walker; None for no cap
+        rng (np.random.Generator): Random generator; a fresh one is created if omitted
+
+    Returns:
+        Tuple of (durations, final_fortunes, times, grid): per-walker int64
+        arrays of length num_simulations, the grid times, and an int64 array of
+        shape ``(num_simulations, len(times))`` with each walker's fortune at
+        those times (stopped walkers keep their final fortune)
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    if max_steps is None:
+        max_steps = _NO_STEP_CAP
+
+    playing = 0 < initial_fortune < target_fortune
+    times, stride = _time_grid(initial_fortune, target_fortune, win_probability, max_points, max_steps)
+    last_grid = int(times[-1])
+
+    grid = np.full((num_simulations, times.size), initial_fortune, dtype=np.int64)
+    durations = np.zeros(num_simulations, dtype=np.int64)
+    final_fortunes = np.full(num_simulations, initial_fortune, dtype=np.int64)
+
+    alive = np.arange(num_simulations) if playing else np.arange(0)
+    fortunes = final_fortunes[alive]
+    elapsed = np.zeros(alive.size, dtype=np.int64)
+    while alive.size:
+        distance = np.minimum(fortunes, target_fortune - fortunes)
+        next_grid = np.where(elapsed < last_grid, (elapsed // stride + 1) * stride, max_steps)
+        block = np.minimum(np.maximum(distance - 1, 1), np.minimum(next_grid, max_steps) - elapsed)
+        fortunes += 2 * rng.binomial(block, win_probability) - block
+        elapsed += block
+
+        stopped = (fortunes <= 0) | (fortunes >= target_fortune) | (elapsed >= max_steps)
+        on_grid = ~stopped & (elapsed % stride == 0) & (elapsed <= last_grid)
+        grid[alive[on_grid], elapsed[on_grid] // stride] = fortunes[on_grid]
+
+        done = alive[stopped]
+        durations[done] = elapsed[stopped]
+        final_fortunes[done] = fortunes[stopped]
+
+        running = ~stopped
+        alive = alive[running]
+        fortunes = fortunes[running]
+        elapsed = elapsed[running]
+
+    # Stopped walkers hold their final fortune from the first grid point after they stop.
+    first_point = -(-durations // stride)
+    if playing:
+        grid = np.where(np.arange(times.size) >= first_point[:, None], final_fortunes[:, None], grid)
+
+    # Drop the grid points after everyone has stopped.
+    end = min(times.size, int(first_point.max(initial=0)) + 1)
+    return durations, final_fortunes, times[:end], grid[:, :end]
+
+
+def summarize_walkers(durations: np.ndarray, final_fortunes: np.ndarray,
+                      target_fortune: int) -> Dict[str, Union[int, RunningStats, QuantileSketch, FixedHistogram]]:
+    """Reduce per-walker results to a mergeable partial summary.
+
+    Counts and sums are integers and the accumulators from ``src.streaming``
+    merge exactly (up to floating-point rounding of the duration variance), so
+    partial summaries from different shards combine with ``merge_summaries``
+    into the summary of all their walkers. Memory does not depend on the
+    number of walkers.
+
+    Args:
+        durations (np.ndarray): Number of bets played by each walker
+        final_fortunes (np.ndarray): Fortune of each walker when it stopped
+        target_fortune (int): Target amount to reach
+
+    Returns:
+        Dict containing num_simulations, wins, total_duration (exact number of
+        bets), durations (RunningStats), duration_sketch (QuantileSketch),
+        fortunes (RunningStats) and fortune_histogram (FixedHistogram over
+        ``[0, target_fortune]``)
+    """
+    return {
+        "num_simulations": int(durations.size),
+        "wins": int(np.count_nonzero(final_fortunes >= target_fortune)),
+        "total_duration": int(durations.sum()),
+        "durations": RunningStats().update(durations),
+        "duration_sketch": QuantileSketch(DURATION_SKETCH_ACCURACY).update(durations),
+        "fortunes": RunningStats().update(final_fortunes),
+        "fortune_histogram": FixedHistogram(
+            0, target_fortune, min(FORTUNE_BINS, max(target_fortune, 1))
+        ).update(final_fortunes),
+    }
+
+
+def merge_summaries(summaries: Iterable[Dict]) -> Dict:
+    """Combine partial summaries produced by ``summarize_walkers``.
+
+    Args:
+        summaries (Iterable[Dict]): Partial summaries to combine
+
+    Returns:
+        Dict with the same fields as the inputs, covering all their walkers
+    """
+    summaries = list(summaries)
+    merged = dict(summaries[0])
+    for summary in summaries[1:]:
+        for key in ("num_simulations", "wins", "total_duration"):
+            merged[key] += summary[key]
+        for key in ("durations", "duration_sketch", "fortunes", "fortune_histogram"):
+            merged[key] = merged[key].merge(summary[key])
+    return merged
+
+
+def finalize_summary(summary: Dict) -> Dict[str, Union[int, float, Dict]]:
+    """Turn a partial summary into the statistics returned by the API.
+
+    Args:
+        summary (Dict): Partial summary covering all walkers of a run
+
+    Returns:
+        Dict containing win_rate, average_duration, duration_std,
+        duration_percentiles (p50, p90 and p99, within the relative accuracy of
+        the duration sketch), max_duration, min_fortune, max_fortune and
+        fortune_histogram (edges and counts)
+    """
+    num_simulations = summary["num_simulations"]
+    durations, fortunes = summary["durations"], summary["fortunes"]
+    percentiles = summary["duration_sketch"].quantiles([p / 100 for p in DURATION_PERCENTILES])
+    return {
+        "win_rate": summary["wins"] / num_simulations,
+        "average_duration": summary["total_duration"] / num_simulations,
+        "duration_std": durations.std,
+        "duration_percentiles": {f"p{p}": value for p, value in zip(DURATION_PERCENTILES, percentiles)},
+        "max_duration": durations.maximum,
+        "min_fortune": fortunes.minimum,
+        "max_fortune": fortunes.maximum,
+        "fortune_histogram": summary["fortune_histogram"].to_dict(),
+    }
+
+
+def plan_shards(num_simulations: int, initial_fortune: int, target_fortune: int,
+                win_probability: float, max_steps: int = 1000, seed: Optional[int] = None,
+                shard_size: int = SHARD_SIZE) -> List[Tuple[int, int, int, float, int, np.random.SeedSequence]]:
+    """Split a run into shards with independent random streams.
+
+    Shard ``i`` holds ``shard_size`` walkers (the last one may be smaller) and
+    draws from the ``i``-th child of ``SeedSequence(seed)``, so the layout
+    depends only on the run parameters, never on how the shards are executed.
+
+    Args:
+        num_simulations (int): Number of walkers to simulate
+        initial_fortune (int): Starting amount of money
+        target_fortune (int): Target amount to reach
+        win_probability (float): Probability of winning each bet
+        max_steps (int): Maximum number of bets played by any walker
+        seed (Optional[int]): Root seed; fresh OS entropy is used if omitted
+        shard_size (int): Number of walkers per shard
+
+    Returns:
+        List of shard descriptions accepted by ``run_shard``
+    """
+    sizes = [shard_size] * (num_simulations // shard_size)
+    if num_simulations % shard_size or not sizes:
+        sizes.append(num_simulations % shard_size)
+    children = np.random.SeedSequence(seed).spawn(len(sizes))
+    return [
+        (size, initial_fortune, target_fortune, win_probability, max_steps, child)
+        for size, child in zip(sizes, children)
+    ]
+
+
+def simulate_shard(shard: Tuple[int, int, int, float, int, np.random.SeedSequence]) -> Tuple[np.ndarray, np.ndarray]:
+    """Simulate one shard from ``plan_shards`` and return its per-walker (durations, final_fortunes)."""
+    size, initial_fortune, target_fortune, win_probability, max_steps, seed_seq = shard
+    return simulate_walkers(
+        size, initial_fortune, target_fortune, win_probability,
+        max_steps=max_steps, rng=np.random.default_rng(seed_seq)
+    )
+
+
+def run_shard(shard: Tuple[int, int, int, float, int, np.random.SeedSequence]) -> Dict:
+    """Simulate one shard from ``plan_shards`` and return its partial summary."""
+    durations, final_fortunes = simulate_shard(shard)
+    return summarize_walkers(durations, final_fortunes, shard[2])
+
+
+def map_shards(shards: Iterable[Tuple[int, int, int, float, int, np.random.SeedSequence]],
+               workers: Optional[int] = 1) -> Iterable[Dict]:
+    """Partial summaries of ``shards``, in order, run on up to ``workers`` processes.
+
+    With more than one worker, shards run on the shared process pool, with
+    at most ``workers`` of them submitted at a time; None uses the whole pool.
+    """
+    workers = MAX_WORKERS if workers is None else min(workers, MAX_WORKERS)
+    if workers <= 1:
+        yield from map(run_shard, shards)
+        return
+    pool = _shard_pool()
+    pending = deque()
+    for shard in shards:
+        if len(pending) == workers:
+            yield pending.popleft().result()
+        pending.append(pool.submit(run_shard, shard))
+    while pending:
+        yield pending.popleft().result()
+
+
+def simulate_sharded(num_simulations: int, initial_fortune: int, target_fortune: int,
+                     win_probability: float, max_steps: int = 1000, seed: Optional[int] = None,
+                     workers: Optional[int] = 1) -> Dict:
+    """Simulate walkers in fixed-size shards, optionally over the shared process pool.
+
+    The shard layout from ``plan_shards`` does not depend on ``workers``, and
+    partial summaries are merged in shard order, so a given seed produces the
+    same result whether the shards run in-process or on any number of
+    processes.
+
+    Args:
+        num_simulations (int): Number of walkers to simulate
+        initial_fortune (int): Starting amount of money
+        target_fortune (int): Target amount to reach
+        win_probability (float): Probability of winning each bet
+        max_steps (int): Maximum number of bets played by any walker
+        seed (Optional[int]): Root seed; fresh OS entropy is used if omitted
+        workers (Optional[int]): Number of worker processes, at most ``MAX_WORKERS``;
+            None uses all of them
+
+    Returns:
+        Partial summary (see ``summarize_walkers``) covering all walkers
+    """
+    shards = plan_shards(num_simulations, initial_fortune, target_fortune,
+                         win_probability, max_steps=max_steps, seed=seed)
+    return merge_summaries(map_shards(shards, workers))
+
+
+def wilson_interval(successes: int, trials: int, confidence: float = 0.95) -> Tuple[float, float]:
+    """Wilson score confidence interval for a binomial proportion.
+
+    Unlike the normal approximation, the interval stays inside [0, 1] and
+    remains meaningful when the observed proportion is 0 or 1.
+
+    Args:
+        successes (int): Number of successful trials
+        trials (int): Total number of trials
+        confidence (float): Two-sided confidence level
+
+    Returns:
+        Tuple of (lower, upper) bounds
+    """
+    if trials == 0:
+        return 0.0, 1.0
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    phat = successes / trials
+    denom = 1 + z * z / trials
+    center = (phat + z * z / (2 * trials)) / denom
+    half = z * math.sqrt(phat * (1 - phat) / trials + z * z / (4 * trials * trials)) / denom
+    return max(0.0, center - half), min(1.0, center + half)
+
+
+def simulate_antithetic_walkers(num_pairs: int, initial_fortune: int, target_fortune: int,
+                                win_probability: float, max_steps: Optional[int] = None,
+                                rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """Simulate pairs of walkers driven by antithetic uniforms.
+
+    The first walker of a pair wins a bet when ``u < p`` and the second when
+    ``1 - u < p``, for the same uniform ``u``. The two walks are negatively
+    correlated, so the average of a pair varies less than that of two
+    independent walkers. Walkers advance bet by bet, in blocks.
+
+    Args:
+        num_pairs (int): Number of walker pairs to simulate
+        initial_fortune (int): Starting amount of money
+        target_fortune (int): Target amount to reach
+        win_probability (float): Probability of winning each bet
+        max_steps (Optional[int]): Maximum number of bets played by any walker; None for no cap
+        rng (np.random.Generator): Random generator; a fresh one is created if omitted
+
+    Returns:
+        int64 array of shape (2, num_pairs) with the final fortune of each walker
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    if max_steps is None:
+        max_steps = _NO_STEP_CAP
+
+    final_fortunes = np.full((2, num_pairs), initial_fortune, dtype=np.int64)
+    if initial_fortune <= 0 or initial_fortune >= target_fortune:
+        return final_fortunes
+
+    alive = np.arange(num_pairs)
+    fortunes = final_fortunes.copy()
+    done = np.zeros((2, num_pairs), dtype=bool)
+    steps = 0
+    while alive.size and steps < max_steps:
+        block = min(PATH_BLOCK_STEPS, max_steps - steps)
+        u = rng.random((alive.size, block))
+        moves = np.stack([np.where(u < win_probability, 1, -1), np.where(u > 1 - win_probability, 1, -1)])
+        paths = np.cumsum(moves, axis=2) + fortunes[:, :, None]
+
+        absorbed = (paths <= 0) | (paths >= target_fortune)
+        hit = absorbed.any(axis=2)
+        first = absorbed.argmax(axis=2)
+        ends = np.where(hit, np.take_along_axis(paths, first[:, :, None], axis=2)[:, :, 0], paths[:, :, -1])
+        fortunes = np.where(done, fortunes, ends)
+        done |= hit
+        final_fortunes[:, alive] = fortunes
+
+        steps += block
+        running = ~done.all(axis=0)
+        alive, fortunes, done = alive[running], fortunes[:, running], done[:, running]
+
+    return final_fortunes
+
+
+def importance_sampling_estimate(num_simulations: int, initial_fortune: int, target_fortune: int,
+                                 win_probability: float, antithetic: bool = False,
+                                 max_steps: Optional[int] = None, confidence: float = 0.95,
+                                 rng: Optional[np.random.Generator] = None) -> Dict[str, Optional[Union[str, int, float, List[float]]]]:
+    """Estimate the rare outcome of a game by exponential tilting.
+
+    The rare outcome is reaching the target when ``p < 0.5`` and ruin when
+    ``p > 0.5``. Walkers are simulated with ``p`` and ``q`` swapped, which
+    makes the rare outcome typical. A path that ends ``k`` units above its
+    start has likelihood ratio ``(p/q)^k`` between the original and the tilted
+    game. Every path reaching the outcome shares the same ``k``, so each hit
+    is weighted by the constant ``(p/q)^(N-n)`` (win) or ``(q/p)^n`` (ruin).
+    The relative error then stays bounded as the probability shrinks, instead
+    of growing like ``1/sqrt(probability * num_simulations)``.
+
+    When the outcome is certain or impossible (``p`` is 0 or 1, or the walker
+    starts at 0 or at the target) its exact probability is returned without
+    simulating. When every tilted walker reaches the outcome, the sample has
+    no spread to measure the error from; the result is flagged ``saturated``
+    and the interval is the exact binomial one for the tilted hit rate, scaled
+    by the weight, whose upper end ``(p/q)^(N-n)`` or ``(q/p)^n`` bounds the
+    probability in any case.
+
+    Args:
+        num_simulations (int): Number of walkers to simulate
+        initial_fortune (int): Starting amount of money
+        target_fortune (int): Target amount to reach
+        win_probability (float): Probability of winning each bet
+        antithetic (bool): Simulate antithetic pairs (see ``simulate_antithetic_walkers``)
+        max_steps (Optional[int]): Maximum number of bets played by any walker; truncated
+            walkers count as missing the outcome. None for no cap
+        confidence (float): Two-sided confidence level of the reported interval
+        rng (np.random.Generator): Random generator; a fresh one is created if omitted
+
+    Returns:
+        Dict containing:
+            - event (str): The estimated outcome, "win" or "ruin"
+            - probability (float): Estimated probability of the outcome
+            - log10_probability (Optional[float]): Its base-10 logarithm, which stays
+              meaningful below the float range; None when the estimate is 0
+            - std_error (Optional[float]): Standard error of the estimate; None when saturated
+            - relative_error (Optional[float]): std_error / probability; None when the
+              estimate is 0 or saturated
+            - confidence_interval (List[float]): Normal interval, clipped at 0
+            - hits (int): Tilted walkers that reached the outcome
+            - truncated (int): Walkers stopped by max_steps
+            - exact (bool): Whether the probability is exact rather than estimated
+            - saturated (bool): Whether every tilted walker reached the outcome
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    p, q = win_probability, 1 - win_probability
+    event = "win" if p <= 0.5 else "ruin"
+    distance = max(target_fortune - initial_fortune, 0) if event == "win" else max(initial_fortune, 0)
+    if distance == 0 or p <= 0 or p >= 1:
+        return _exact_estimate(event, 1.0 if distance == 0 else 0.0, num_simulations,
+                               initial_fortune, target_fortune, p, max_steps)
+    log_ratio = distance * math.log(p / q if event == "win" else q / p)
+
+    if antithetic:
+        finals = simulate_antithetic_walkers((num_simulations + 1) // 2, initial_fortune, target_fortune,
+                                             q, max_steps=max_steps, rng=rng)
+    else:
+        _, finals = simulate_walkers(num_simulations, initial_fortune, target_fortune, q,
+                                     max_steps=max_steps, rng=rng)
+    hit = finals >= target_fortune if event == "win" else finals <= 0
+    truncated = int(np.count_nonzero((finals > 0) & (finals < target_fortune)))
+    samples = hit.mean(axis=0) if antithetic else hit.astype(np.float64)
+
+    mean_hit = float(samples.mean())
+    spread = float(samples.std(ddof=1) / math.sqrt(samples.size)) if samples.size > 1 else 0.0
+    weight = math.exp(log_ratio)
+    probability = weight * mean_hit
+    saturated = bool(hit.all())
+    if saturated:
+        # Clopper-Pearson interval of a hit rate with no misses in the samples.
+        std_error = relative_error = None
+        interval = [weight * ((1 - confidence) / 2) ** (1 / samples.size), weight]
+    else:
+        std_error = weight * spread
+        relative_error = spread / mean_hit if mean_hit > 0 else None
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        interval = [max(0.0, probability - z * std_error), probability + z * std_error]
+    return {
+        "event": event,
+        "probability": probability,
+        "log10_probability": (log_ratio + math.log(mean_hit)) / math.log(10) if mean_hit > 0 else None,
+        "std_error": std_error,
+        "relative_error": relative_error,
+        "confidence_interval": interval,
+        "hits": int(np.count_nonzero(hit)),
+        "truncated": truncated,
+        "exact": False,
+        "saturated": saturated,
+    }
+
+
+def _exact_estimate(event: str, probability: float, num_simulations: int, initial_fortune: int,
+                    target_fortune: int, win_probability: float,
+                    max_steps: Optional[int]) -> Dict[str, Optional[Union[str, int, float, List[float]]]]:
+    """``importance_sampling_estimate`` result of a game whose outcome is certain.
+
+    With ``p`` of 0 or 1 every walker takes the same straight path to ruin or
+    to the target, and is truncated if that path is longer than ``max_steps``.
+    """
+    length = initial_fortune if win_probability <= 0 else target_fortune - initial_fortune
+    playing = 0 < initial_fortune < target_fortune
+    truncated = num_simulations if playing and max_steps is not None and max_steps < length else 0
+    return {
+        "event": event,
+        "probability": probability,
+        "log10_probability": 0.0 if probability else None,
+        "std_error": 0.0,
+        "relative_error": 0.0 if probability else None,
+        "confidence_interval": [probability, probability],
+        "hits": num_simulations if probability else 0,
+        "truncated": truncated,
+        "exact": True,
+        "saturated": False,
+    }
@@ -0,0 +1,558 @@
+"""
+Vectorized simulation of betting strategies.
+
+A strategy is a bet-sizing rule applied to an array of walkers at once. Every
+round, each active walker stakes what its rule asks for. The stake is raised
+to the table minimum and capped by the table limit and by the walker's current
+wealth. The walker then wins or loses that stake with even odds. A walker
+stops when it can no longer cover the table minimum (ruin), when its losses
+reach the stop-loss, or when it reaches the target fortune.
+
+Several rules can be played side by side on the same outcome of every
+(walker, round) pair. ``run_tournament`` uses this to compare strategies with
+common random numbers: differences are measured walker by walker, which
+removes most of the shared noise from the comparison.
+"""
+
+import math
+import os
+import numpy as np
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from statistics import NormalDist
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+# Walker status codes.
+ACTIVE = 0
+RUINED = 1
+STOP_LOSS = 2
+TARGET = 3
+NO_BET = 4
+
+# Rounds whose outcomes are packed into one word: bit ``i`` of a word is 1 when
+# the ``i``-th round of the word is won.
+WORD_ROUNDS = 16
+
+# Largest runs the strategy endpoints accept.
+MAX_WALKERS = int(os.environ.get("STRATEGY_MAX_WALKERS", "1000000"))
+MAX_ROUNDS = int(os.environ.get("STRATEGY_MAX_ROUNDS", "100000"))
+
+# Largest wealth tracked when no target fortune is set. Kelly wealth grows
+# exponentially in favourable games; capping it keeps long runs finite.
+WEALTH_CAP = 1e150
+
+
+class BettingRule(ABC):
+    """Bet-sizing rule applied to an array of walkers.
+
+    Attributes:
+        name (str): Label used in results
+    """
+
+    name = "Rule"
+
+    @abstractmethod
+    def initial_stakes(self, wealth: np.ndarray) -> np.ndarray:
+        """Stakes requested for the first round."""
+
+    @abstractmethod
+    def next_stakes(self, stakes: np.ndarray, won: np.ndarray, wealth: np.ndarray) -> np.ndarray:
+        """Stakes requested for the next round, given the outcome of the last one."""
+
+    def stake_formula(self) -> Optional[Tuple[float, float]]:
+        """``(base, fraction)`` if every stake requested is ``base + fraction * wealth``.
+
+        Rules without memory of past rounds can be played a word of rounds at
+        a time from precomputed path tables. The default, None, plays the rule
+        round by round.
+        """
+        return None
+
+
+class FixedRule(BettingRule):
+    """Bet the same amount every round."""
+
+    def __init__(self, bet_size: float, name: str = "Fixed"):
+        self.bet_size = bet_size
+        self.name = name
+
+    def initial_stakes(self, wealth: np.ndarray) -> np.ndarray:
+        return np.full_like(wealth, self.bet_size)
+
+    def next_stakes(self, stakes: np.ndarray, won: np.ndarray, wealth: np.ndarray) -> np.ndarray:
+        return stakes
+
+    def stake_formula(self) -> Optional[Tuple[float, float]]:
+        return self.bet_size, 0.0
+
+
+class MartingaleRule(BettingRule):
+    """Multiply the stake after every loss and return to the base bet after a win."""
+
+    def __init__(self, bet_size: float, multiplier: float = 2.0, name: str = "Martingale"):
+        self.bet_size = bet_size
+        self.multiplier = multiplier
+        self.name = name
+
+    def initial_stakes(self, wealth: np.ndarray) -> np.ndarray:
+        return np.full_like(wealth, self.bet_size)
+
+    def next_stakes(self, stakes: np.ndarray, won: np.ndarray, wealth: np.ndarray) -> np.ndarray:
+        return np.where(won, self.bet_size, stakes * self.multiplier)
+
+
+class KellyRule(BettingRule):
+    """Bet a fixed fraction of current wealth.
+
+    For an even-money bet the Kelly fraction is ``2p - 1``. ``kelly_multiplier``
+    scales it, e.g. 0.5 for half-Kelly. When the game has no edge the
+    fraction is zero and the walker does not bet.
+    """
+
+    def __init__(self, win_probability: float, kelly_multiplier: float = 1.0, name: str = "Kelly"):
+        self.fraction = max(0.0, 2 * win_probability - 1) * kelly_multiplier
+        self.name = name
+
+    def initial_stakes(self, wealth: np.ndarray) -> np.ndarray:
+        return self.fraction * wealth
+
+    def next_stakes(self, stakes: np.ndarray, won: np.ndarray, wealth: np.ndarray) -> np.ndarray:
+        return self.fraction * wealth
+
+    def stake_formula(self) -> Optional[Tuple[float, float]]:
+        return 0.0, self.fraction
+
+
+def make_rule(strategy_type: str, bet_size: float, win_probability: float,
+              multiplier: float = 2.0, kelly_multiplier: float = 1.0,
+              name: Optional[str] = None) -> BettingRule:
+    """Create the rule for a strategy type ("Martingale", "Kelly" or "Fixed").
+
+    Raises:
+        ValueError: If the strategy type is unknown
+    """
+    if strategy_type == "Martingale":
+        return MartingaleRule(bet_size, multiplier, name=name or "Martingale")
+    if strategy_type == "Kelly":
+        return KellyRule(win_probability, kelly_multiplier, name=name or "Kelly")
+    if strategy_type == "Fixed":
+        return FixedRule(bet_size, name=name or "Fixed")
+    raise ValueError(f"unknown strategy type {strategy_type!r}")
+
+
+@lru_cache(maxsize=None)
+def _word_paths() -> np.ndarray:
+    """Wins minus losses of every word after each of its first 0..WORD_ROUNDS rounds."""
+    words = np.arange(1 << WORD_ROUNDS)
+    steps = 2 * ((words[:, None] >> np.arange(WORD_ROUNDS)) & 1) - 1
+    paths = np.zeros((words.size, WORD_ROUNDS + 1), dtype=np.int8)
+    paths[:, 1:] = np.cumsum(steps, axis=1)
+    return paths
+
+
+def _path_table(paths: np.ndarray) -> np.ndarray:
+    """Rows of the end, minimum, maximum, largest pre-bet value and largest drawdown of every path."""
+    drop = (np.maximum.accumulate(paths, axis=1) - paths).max(axis=1)
+    return np.stack([paths[:, -1], paths.min(axis=1), paths.max(axis=1), paths[:, :-1].max(axis=1), drop])
+
+
+@lru_cache(maxsize=None)
+def _additive_table() -> np.ndarray:
+    """``_path_table`` of wealth changes, in stakes, under a constant stake."""
+    return _path_table(_word_paths())
+
+
+@lru_cache(maxsize=16)
+def _multiplicative_table(fraction: float) -> np.ndarray:
+    """``_path_table`` of wealth ratios when a ``fraction`` of wealth is staked every round."""
+    paths = _word_paths()
+    played = np.arange(WORD_ROUNDS + 1)
+    wins = (played + paths) // 2
+    growth = np.power(1 + fraction, np.arange(WORD_ROUNDS + 1))
+    shrink = np.power(1 - fraction, np.arange(WORD_ROUNDS + 1))
+    return _path_table(growth[wins] * shrink[played - wins])
+
+
+@lru_cache(maxsize=64)
+def _byte_alias(win_probability: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Alias tables (Vose's method) drawing bytes whose eight bits are independent wins.
+
+    A 32-bit random number ``x`` picks column ``x >> 24`` and keeps it when
+    ``x`` is below the column's cut, otherwise takes the column's alias.
+    """
+    wins = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1)
+    scaled = 256 * win_probability ** wins * (1 - win_probability) ** (8 - wins)
+    threshold = np.ones(256)
+    alias = np.arange(256)
+    small = [i for i in range(256) if scaled[i] < 1]
+    large = [i for i in range(256) if scaled[i] >= 1]
+    while small and large:
+        s, l = small.pop(), large.pop()
+        threshold[s], alias[s] = scaled[s], l
+        scaled[l] -= 1 - scaled[s]
+        (small if scaled[l] < 1 else large).append(l)
+    columns = np.arange(256, dtype=np.uint64)
+    cut = np.minimum((columns << 24) + np.round(threshold * (1 << 24)).astype(np.uint64), (1 << 32) - 1)
+    return cut.astype(np.uint32), alias.astype(np.uint32)
+
+
+def _draw_words(rng: np.random.Generator, size: int, win_probability: float) -> np.ndarray:
+    """Outcomes of ``WORD_ROUNDS`` rounds for ``size`` walkers, packed into words."""
+    cut, alias = _byte_alias(win_probability)
+    x = rng.integers(0, 1 << 32, size=(2, size), dtype=np.uint32)
+    column = x >> 24
+    byte = np.where(x < np.take(cut, column), column, np.take(alias, column))
+    return byte[0] | (byte[1] << 8)
+
+
+def simulate_strategies(rules: Sequence[BettingRule], initial_fortune: float, win_probability: float,
+                        num_walkers: int = 10_000, max_rounds: int = 1_000,
+                        stop_loss: Optional[float] = None, target_fortune: Optional[float] = None,
+                        table_limit: Optional[float] = None, min_bet: float = 1.0,
+                        rng: Optional[np.random.Generator] = None) -> List[Dict[str, np.ndarray]]:
+    """Play several betting rules on the same outcome streams.
+
+    Walker ``i`` of every rule sees the same win/loss outcome in every round, so
+    differences between rules come from bet sizing alone. Outcomes are drawn a
+    word of ``WORD_ROUNDS`` rounds at a time. While a walker of a rule with a
+    ``stake_formula`` keeps a constant stake, or stakes a constant fraction of
+    its wealth, it moves a whole word at once using precomputed path tables.
+    Words in which it could stop, go all-in or cross a table limit are played
+    round by round, as are all words of rules with memory. Walkers that every
+    rule has stopped are compacted out of the working set once they make up
+    a tenth of it. Without a target fortune, wealth is capped at ``WEALTH_CAP`` so that
+    exponential growth cannot overflow.
+
+    Args:
+        rules (Sequence[BettingRule]): Bet-sizing rules to play
+        initial_fortune (float): Starting amount of money
+        win_probability (float): Probability of winning each bet
+        num_walkers (int): Number of walkers per rule
+        max_rounds (int): Maximum number of rounds played
+        stop_loss (Optional[float]): Stop once cumulative losses reach this amount
+        target_fortune (Optional[float]): Stop once wealth reaches this amount
+        table_limit (Optional[float]): Largest stake the table accepts
+        min_bet (float): Smallest stake the table accepts. Smaller requested
+            stakes are raised to it, and walkers below it are ruined
+        rng (np.random.Generator): Random generator; a fresh one is created if omitted
+
+    Returns:
+        One dict per rule, each holding per-walker arrays: final_wealth,
+        max_drawdown, max_bet, rounds and status
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    num_rules = len(rules)
+    loss_floor = initial_fortune - stop_loss if stop_loss is not None else -np.inf
+    ceiling = target_fortune if target_fortune is not None else np.inf
+    limit = table_limit if table_limit is not None else np.inf
+    # A walker stops below this wealth, either ruined or at its stop-loss.
+    low = max(min_bet, np.nextafter(loss_floor, np.inf))
+    capped = target_fortune is None
+    top = WEALTH_CAP if capped else ceiling
+
+    # Ways each rule can move a word at once, as (stake, fraction, lowest,
+    # highest): a constant stake, or with a stake of None a constant fraction
+    # of wealth. Each applies while the requested stakes stay within
+    # [lowest, highest].
+    modes = []
+    for rule in rules:
+        formula = rule.stake_formula()
+        rule_modes = []
+        if formula is not None and formula[1] == 0:
+            rule_modes.append((float(min(max(formula[0], min_bet), limit)), 0.0, -np.inf, np.inf))
+        elif formula is not None and formula[0] == 0 and 0 < formula[1] < 1:
+            fraction = formula[1]
+            rule_modes.append((None, fraction, min_bet, limit))
+            if min(min_bet, limit) > 0:
+                rule_modes.append((float(min(min_bet, limit)), fraction, -np.inf, min_bet))
+            if table_limit is not None:
+                rule_modes.append((float(limit), fraction, limit, np.inf))
+        modes.append(rule_modes)
+
+    shape = (num_rules, num_walkers)
+    final_wealth = np.full(shape, float(initial_fortune))
+    max_drawdown = np.zeros(shape)
+    max_bet = np.zeros(shape)
+    rounds = np.full(shape, max_rounds, dtype=np.int64)
+    status = np.full(shape, ACTIVE, dtype=np.int8)
+
+    alive = np.arange(num_walkers)
+    wealth = final_wealth.copy()
+    peak = wealth.copy()
+    drawdown = np.zeros(shape)
+    biggest = np.zeros(shape)
+    active = np.ones(shape, dtype=bool)
+    stakes = np.stack([rule.initial_stakes(wealth[r]) for r, rule in enumerate(rules)])
+
+    def stop(round_index: int, rule_index: np.ndarray, column: np.ndarray,
+             w: np.ndarray, dd: np.ndarray, big: np.ndarray) -> None:
+        """Record the final state of the walkers at (``rule_index``, ``column``)."""
+        code = np.select([w >= ceiling, w < min_bet], [TARGET, RUINED], default=STOP_LOSS)
+        walker = alive[column]
+        status[rule_index, walker] = code
+        rounds[rule_index, walker] = round_index
+        final_wealth[rule_index, walker] = w
+        max_drawdown[rule_index, walker] = dd
+        max_bet[rule_index, walker] = big
+
+    def compact() -> None:
+        """Drop the walkers every rule has stopped, once they are a tenth of the working set."""
+        nonlocal alive, wealth, peak, drawdown, biggest, active, stakes
+        keep = active.any(axis=0)
+        if np.count_nonzero(keep) < 0.9 * keep.size:
+            alive = alive[keep]
+            wealth, peak, drawdown = wealth[:, keep], peak[:, keep], drawdown[:, keep]
+            biggest, stakes, active = biggest[:, keep], stakes[:, keep], active[:, keep]
+
+    def play_word(r: int, words: np.ndarray, pending: np.ndarray) -> None:
+        """Move the ``pending`` walkers of rule ``r`` through a word where a mode of the rule applies."""
+        w = wealth[r]
+        for stake, fraction, lowest, highest in modes[r]:
+            table = _multiplicative_table(fraction) if stake is None else _additive_table()
+            end, least, most, most_bet, drop = (np.take(row, words) for row in table)
+            if stake is None:
+                end, drop, least, most, most_bet = w * end - w, w * drop, w * least, w * most, w * most_bet
+                bet, floor = fraction * most_bet, low
+            else:
+                end, drop = stake * end, stake * drop
+                least, most, most_bet = w + stake * least, w + stake * most, w + stake * most_bet
+                bet, floor = stake, max(low, stake)
+            # No stop, no all-in bet and no stake outside the mode anywhere in the word.
+            ok = pending & (least >= floor) & (most < top)
+            if lowest > -np.inf:
+                ok &= fraction * least >= lowest
+            if highest < np.inf:
+                ok &= fraction * most_bet <= highest
+            np.maximum(drop, peak[r] - least, out=drop)
+            np.maximum(drawdown[r], drop, out=drawdown[r], where=ok)
+            np.maximum(peak[r], most, out=peak[r], where=ok)
+            np.maximum(biggest[r], bet, out=biggest[r], where=ok)
+            np.add(w, end, out=w, where=ok)
+            pending &= ~ok
+            if not pending.any():
+                return
+
+    def play_rounds(words: np.ndarray, slow: np.ndarray, first: int, count: int) -> None:
+        """Play the ``slow`` walkers round by round through ``count`` rounds of ``words``."""
+        rows = np.flatnonzero(slow.any(axis=1))
+        cols = np.flatnonzero(slow.any(axis=0))
+        if not cols.size:
+            return
+        block = np.ix_(rows, cols)
+        mask = slow[block]
+        w, high, dd, big = wealth[block], peak[block], drawdown[block], biggest[block]
+        bets, change = np.empty_like(w), np.empty_like(w)
+        requested = stakes[block]
+        for i, r in enumerate(rows):
+            if modes[r]:
+                requested[i] = rules[r].initial_stakes(w[i])
+        outcomes = words[cols]
+        for j in range(count):
+            won = (outcomes >> j) & 1 == 1
+            np.clip(requested, min_bet, limit, out=requested)
+            np.minimum(requested, w, out=bets)
+            bets *= mask
+            np.multiply(bets, np.where(won, 1.0, -1.0), out=change)
+            w += change
+            if capped:
+                np.minimum(w, WEALTH_CAP, out=w)
+            np.maximum(big, bets, out=big)
+            np.maximum(high, w, out=high)
+            np.subtract(high, w, out=change)
+            np.maximum(dd, change, out=dd)
+            for i, r in enumerate(rows):
+                requested[i] = rules[r].next_stakes(requested[i], won, w[i])
+            stopping = mask & ((w < low) | (w >= ceiling))
+            if stopping.any():
+                row, column = np.nonzero(stopping)
+                stop(first + j + 1, rows[row], cols[column], w[stopping], dd[stopping], big[stopping])
+                mask &= ~stopping
+                active[rows[row], cols[column]] = False
+        wealth[block], peak[block], drawdown[block], biggest[block] = w, high, dd, big
+        stakes[block] = requested
+
+    # A rule that asks for no stake declines to play, e.g. Kelly without an edge.
+    declined = stakes <= 0
+    status[declined] = NO_BET
+    rounds[declined] = 0
+    active[declined] = False
+    stopping = active & ((wealth < low) | (wealth >= ceiling))
+    if stopping.any():
+        rule_index, column = np.nonzero(stopping)
+        stop(0, rule_index, column, wealth[stopping], drawdown[stopping], biggest[stopping])
+        active &= ~stopping
+    compact()
+
+    played = 0
+    while played < max_rounds and alive.size:
+        count = min(WORD_ROUNDS, max_rounds - played)
+        words = _draw_words(rng, alive.size, win_probability)
+        slow = active.copy()
+        if count == WORD_ROUNDS:
+            for r in range(num_rules):
+                if modes[r] and slow[r].any():
+                    play_word(r, words, slow[r])
+        play_rounds(words, slow, played, count)
+        played += count
+        compact()
+
+    # Walkers still playing after max_rounds.
+    rule_index, column = np.nonzero(active)
+    walker = alive[column]
+    final_wealth[rule_index, walker] = wealth[rule_index, column]
+    max_drawdown[rule_index, walker] = drawdown[rule_index, column]
+    max_bet[rule_index, walker] = biggest[rule_index, column]
+
+    return [
+        {
+            "final_wealth": final_wealth[r],
+            "max_drawdown": max_drawdown[r],
+            "max_bet": max_bet[r],
+            "rounds": rounds[r],
+            "status": status[r],
+        }
+        for r in range(num_rules)
+    ]
+
+
+def _check_finite(*arrays: np.ndarray) -> None:
+    if not all(np.isfinite(array).all() for array in arrays):
+        raise ValueError("the simulation produced non-finite wealth; set a target fortune or fewer rounds")
+
+
+def summarize_strategy(outcome: Dict[str, np.ndarray], initial_fortune: float,
+                       bins: int = 20) -> Dict[str, Union[float, Dict[str, Union[float, List[float]]]]]:
+    """Reduce the per-walker arrays of one rule to empirical statistics.
+
+    Args:
+        outcome (Dict[str, np.ndarray]): One element of ``simulate_strategies``' result
+        initial_fortune (float): Starting amount of money
+        bins (int): Number of bins of the final-wealth histogram
+
+    Returns:
+        Dict containing ruin, stop-loss, target and no-bet probabilities, the
+        largest stake and loss observed, the average number of rounds played,
+        drawdown statistics, and the final-wealth distribution (mean,
+        percentiles and histogram)
+
+    Raises:
+        ValueError: If the simulation produced non-finite wealth
+    """
+    status = outcome["status"]
+    final_wealth = outcome["final_wealth"]
+    drawdown = outcome["max_drawdown"]
+    _check_finite(final_wealth, drawdown, outcome["max_bet"])
+    p5, p25, p50, p75, p95 = np.percentile(final_wealth, [5, 25, 50, 75, 95])
+    counts, edges = np.histogram(final_wealth, bins=bins)
+    return {
+        "ruin_probability": float(np.mean(status == RUINED)),
+        "stop_loss_probability": float(np.mean(status == STOP_LOSS)),
+        "target_probability": float(np.mean(status == TARGET)),
+        "no_bet_probability": float(np.mean(status == NO_BET)),
+        "max_bet": float(outcome["max_bet"].max()),
+        "max_loss": float(max(0.0, initial_fortune - final_wealth.min())),
+        "average_rounds": float(outcome["rounds"].mean()),
+        "drawdown": {
+            "mean": float(drawdown.mean()),
+            "p95": float(np.percentile(drawdown, 95)),
+            "max": float(drawdown.max()),
+            "mean_fraction_of_initial": float(drawdown.mean() / initial_fortune),
+        },
+        "final_wealth": {
+            "mean": float(final_wealth.mean()),
+            "std": float(final_wealth.std()),
+            "p5": float(p5),
+            "p25": float(p25),
+            "p50": float(p50),
+            "p75": float(p75),
+            "p95": float(p95),
+            "histogram_counts": counts.tolist(),
+            "histogram_edges": edges.tolist(),
+        },
+    }
+
+
+def paired_difference(first: np.ndarray, second: np.ndarray,
+                      confidence: float = 0.95) -> Dict[str, Optional[Union[float, List[float]]]]:
+    """Mean of ``first - second`` over paired samples, with a normal confidence interval.
+
+    Args:
+        first (np.ndarray): Per-walker values of one strategy
+        second (np.ndarray): Per-walker values of another strategy on the same outcome streams
+        confidence (float): Two-sided confidence level
+
+    Returns:
+        Dict containing the mean difference, its confidence_interval and
+        std_error, the unpaired_std_error that independent runs of the same
+        size would give, and variance_reduction, the ratio of the two
+        variances (None when the paired differences do not vary)
+
+    Raises:
+        ValueError: If either sample holds non-finite values
+    """
+    _check_finite(first, second)
+    diff = first - second
+    n = diff.size
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    mean = float(diff.mean())
+    std_error = float(diff.std(ddof=1) / math.sqrt(n)) if n > 1 else 0.0
+    unpaired = float(math.sqrt((first.var(ddof=1) + second.var(ddof=1)) / n)) if n > 1 else 0.0
+    return {
+        "mean": mean,
+        "confidence_interval": [mean - z * std_error, mean + z * std_error],
+        "std_error": std_error,
+        "unpaired_std_error": unpaired,
+        "variance_reduction": (unpaired / std_error) ** 2 if std_error > 0 else None,
+    }
+
+
+def run_tournament(rules: Sequence[BettingRule], initial_fortune: float, win_probability: float,
+                   confidence: float = 0.95, **kwargs) -> Dict[str, Union[List[str], Dict, List[Dict]]]:
+    """Rank betting rules played on common random numbers.
+
+    All rules are simulated in one pass of ``simulate_strategies`` and compared
+    pairwise on the same walkers, on final wealth and on losing (being ruined
+    or hitting the stop-loss).
+
+    Args:
+        rules (Sequence[BettingRule]): Rules to compare; names must be unique
+        initial_fortune (float): Starting amount of money
+        win_probability (float): Probability of winning each bet
+        confidence (float): Two-sided confidence level of the paired intervals
+        **kwargs: Further arguments for ``simulate_strategies``
+
+    Returns:
+        Dict containing:
+            - ranking (List[str]): Rule names by decreasing mean final wealth
+            - strategies (Dict): ``summarize_strategy`` statistics by rule name
+            - comparisons (List[Dict]): For every pair of rules, the paired
+              differences (first minus second) of final wealth and loss probability
+
+    Raises:
+        ValueError: If rule names repeat or the simulation produced non-finite wealth
+    """
+    names = [rule.name for rule in rules]
+    if len(set(names)) != len(names):
+        raise ValueError("strategy names must be unique")
+
+    outcomes = simulate_strategies(rules, initial_fortune, win_probability, **kwargs)
+    losses = [np.isin(outcome["status"], (RUINED, STOP_LOSS)).astype(np.float64) for outcome in outcomes]
+    summaries = {name: summarize_strategy(outcome, initial_fortune) for name, outcome in zip(names, outcomes)}
+
+    comparisons = []
+    for i in range(len(rules)):
+        for j in range(i + 1, len(rules)):
+            comparisons.append({
+                "first": names[i],
+                "second": names[j],
+                "final_wealth": paired_difference(
+                    outcomes[i]["final_wealth"], outcomes[j]["final_wealth"], confidence),
+                "loss_probability": paired_difference(losses[i], losses[j], confidence),
+            })
+
+    return {
+        "ranking": sorted(names, key=lambda name: -summaries[name]["final_wealth"]["mean"]),
+        "strategies": summaries,
+        "comparisons": comparisons,
+    }
@@ -0,0 +1,202 @@
+"""
+Streaming accumulators for simulation statistics.
+
+Each accumulator takes values in batches with ``update``, holds a fixed
+amount of state however many values it has seen, and combines with another
+accumulator of the same kind with ``merge``, so shards of a simulation can be
+summarized independently and merged in any grouping:
+
+- ``RunningStats``: count, mean, variance (Welford/Chan) and extremes. Merges
+  are exact up to floating-point rounding of the mean and variance.
+- ``FixedHistogram``: counts over fixed, equal-width bins. Merges are exact.
+- ``QuantileSketch``: quantiles within a relative error bound, on
+  logarithmically spaced buckets (as in DDSketch). Merges are exact: merged
+  sketches equal the sketch of all values, so the error bound holds after
+  any number of merges.
+"""
+
+import math
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+
+class RunningStats:
+    """Count, mean, variance and extremes of a stream of numbers.
+
+    Attributes:
+        count (int): Number of values seen
+        mean (float): Mean of the values
+        m2 (float): Sum of squared deviations from the mean
+        minimum (Optional[float]): Smallest value, None before the first one
+        maximum (Optional[float]): Largest value, None before the first one
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = None
+        self.maximum = None
+
+    @property
+    def variance(self) -> float:
+        """Sample variance; 0 for fewer than two values."""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation."""
+        return math.sqrt(self.variance)
+
+    def update(self, values: np.ndarray) -> "RunningStats":
+        """Add a batch of values and return self."""
+        values = np.asarray(values)
+        if values.size:
+            batch = RunningStats()
+            batch.count = int(values.size)
+            batch.mean = float(values.mean())
+            batch.m2 = float(np.square(values - batch.mean).sum())
+            batch.minimum = values.min().item()
+            batch.maximum = values.max().item()
+            self._absorb(batch)
+        return self
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        """Statistics of the values of both accumulators, as a new accumulator."""
+        merged = RunningStats()
+        merged._absorb(self)
+        merged._absorb(other)
+        return merged
+
+    def _absorb(self, other: "RunningStats") -> None:
+        # Chan et al.'s pairwise update of Welford's mean and M2.
+        if not other.count:
+            return
+        if not self.count:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.minimum, self.maximum = other.minimum, other.maximum
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+
+class FixedHistogram:
+    """Counts over ``bins`` equal-width bins spanning ``[low, high]``.
+
+    Values outside the range are counted in the first or last bin.
+
+    Attributes:
+        edges (np.ndarray): Bin edges, ``bins + 1`` of them
+        counts (np.ndarray): Number of values per bin
+    """
+
+    def __init__(self, low: float, high: float, bins: int):
+        if high <= low:
+            high = low + 1
+        self.edges = np.linspace(low, high, bins + 1)
+        self.counts = np.zeros(bins, dtype=np.int64)
+
+    def update(self, values: np.ndarray) -> "FixedHistogram":
+        """Add a batch of values and return self."""
+        values = np.asarray(values)
+        bins = self.counts.size
+        low, high = self.edges[0], self.edges[-1]
+        index = ((values - low) * (bins / (high - low))).astype(np.int64)
+        self.counts += np.bincount(np.clip(index, 0, bins - 1), minlength=bins)
+        return self
+
+    def merge(self, other: "FixedHistogram") -> "FixedHistogram":
+        """Histogram of the values of both accumulators, as a new accumulator.
+
+        Raises:
+            ValueError: If the histograms have different bins
+        """
+        if not np.array_equal(self.edges, other.edges):
+            raise ValueError("cannot merge histograms with different bins")
+        merged = FixedHistogram(self.edges[0], self.edges[-1], self.counts.size)
+        merged.counts = self.counts + other.counts
+        return merged
+
+    def to_dict(self) -> Dict[str, List[Union[int, float]]]:
+        """Edges and counts as lists."""
+        return {"edges": self.edges.tolist(), "counts": self.counts.tolist()}
+
+
+class QuantileSketch:
+    """Quantiles of a stream of non-negative numbers within a relative error.
+
+    Positive values fall in buckets ``(gamma**(k - 1), gamma**k]`` with
+    ``gamma = (1 + a) / (1 - a)`` for relative accuracy ``a``; zeros are
+    counted separately. A quantile is answered with the midpoint of its
+    bucket, which is within ``a * value`` of the true quantile. The number of
+    buckets grows with the logarithm of the value range only: about 1400 for
+    values from 1 to 10**12 at 1% accuracy.
+
+    Attributes:
+        relative_accuracy (float): Relative error bound of the quantiles
+        count (int): Number of values seen
+        zero_count (int): Number of zeros seen
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.count = 0
+        self.zero_count = 0
+        self._buckets: Dict[int, int] = {}
+
+    def update(self, values: np.ndarray) -> "QuantileSketch":
+        """Add a batch of non-negative values and return self."""
+        values = np.asarray(values)
+        positive = values[values > 0]
+        self.count += int(values.size)
+        self.zero_count += int(values.size - positive.size)
+        if positive.size:
+            keys = np.ceil(np.log(positive.astype(np.float64)) / self._log_gamma).astype(np.int64)
+            offset = int(keys.min())
+            counts = np.bincount(keys - offset)
+            for key in np.flatnonzero(counts):
+                bucket = int(key) + offset
+                self._buckets[bucket] = self._buckets.get(bucket, 0) + int(counts[key])
+        return self
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """Sketch of the values of both sketches, as a new sketch.
+
+        Raises:
+            ValueError: If the sketches have different accuracies
+        """
+        if self.relative_accuracy != other.relative_accuracy:
+            raise ValueError("cannot merge sketches with different accuracies")
+        merged = QuantileSketch(self.relative_accuracy)
+        merged.count = self.count + other.count
+        merged.zero_count = self.zero_count + other.zero_count
+        merged._buckets = dict(self._buckets)
+        for bucket, count in other._buckets.items():
+            merged._buckets[bucket] = merged._buckets.get(bucket, 0) + count
+        return merged
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate of the ``q`` quantile, ``0 <= q <= 1``; None if no values were seen."""
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for bucket in sorted(self._buckets):
+            seen += self._buckets[bucket]
+            if rank < seen:
+                return 2 * self._gamma ** bucket / (self._gamma + 1)
+        return 2 * self._gamma ** max(self._buckets) / (self._gamma + 1)
+
+    def quantiles(self, qs: Sequence[float]) -> List[Optional[float]]:
+        """Estimates of several quantiles."""
+        return [self.quantile(q) for q in qs]
@@ -0,0 +1,174 @@
+"""
+Precomputed ruin-probability surface backed by a memory-mapped ``.npy`` file.
+
+The surface holds ruin probability, win probability and expected duration for
+every integer pair ``0 <= n, N <= max_fortune`` at ``p_steps`` evenly spaced
+win probabilities in [0, 1]. It is built offline with::
+
+    python -m src.surface --output data/ruin_surface.npy
+
+and opened read-only with ``mmap_mode="r"``, so every uvicorn worker and
+Streamlit process on a machine shares the same pages through the OS page cache
+instead of holding its own copy. Lookups outside the grid fall back to the
+closed-form formulas in ``src.analytics``.
+"""
+
+import argparse
+import os
+import threading
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+
+from src.analytics import ruin_statistics
+
+DEFAULT_PATH = Path(__file__).resolve().parents[1] / "data" / "ruin_surface.npy"
+
+# Tolerance for treating a win probability as lying exactly on a grid node.
+_NODE_TOLERANCE = 1e-9
+
+
+def build_surface(path: os.PathLike, p_steps: int = 101, max_fortune: int = 200) -> None:
+    """Precompute the surface and write it to ``path``.
+
+    The array has shape ``(3, p_steps, max_fortune + 1, max_fortune + 1)`` and
+    is indexed as ``[quantity, p, N, n]``, where quantity 0, 1 and 2 are the
+    ruin probability, win probability and expected duration. For fixed ``p``
+    and ``N`` the values over all ``n`` are contiguous on disk.
+
+    Args:
+        path (os.PathLike): Output ``.npy`` file
+        p_steps (int): Number of grid points for the win probability, including 0 and 1
+        max_fortune (int): Largest initial and target fortune on the grid
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    size = max_fortune + 1
+    surface = np.lib.format.open_memmap(path, mode="w+", dtype=np.float64,
+                                        shape=(3, p_steps, size, size))
+    fortunes = np.arange(size)
+    for i, p in enumerate(np.linspace(0.0, 1.0, p_steps)):
+        ruin, win, duration = ruin_statistics(fortunes[None, :], fortunes[:, None], p)
+        surface[0, i] = ruin
+        surface[1, i] = win
+        surface[2, i] = duration
+    surface.flush()
+    del surface
+
+
+class RuinSurface:
+    """Read-only view of a surface written by ``build_surface``.
+
+    Attributes:
+        data (np.memmap): Surface values indexed as ``[quantity, p, N, n]``
+        p_steps (int): Number of win-probability grid points
+        max_fortune (int): Largest fortune on the grid
+    """
+
+    def __init__(self, path: os.PathLike):
+        self.data = np.load(path, mmap_mode="r")
+        self.p_steps = self.data.shape[1]
+        self.max_fortune = self.data.shape[2] - 1
+
+    def lookup(self, initial_fortune, target_fortune, win_probability,
+               interpolate: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """Read values for the grid points among the inputs.
+
+        Points whose win probability is a grid node are read by direct
+        index. With ``interpolate`` the others are linearly interpolated
+        between the two neighbouring nodes; without it they count as off-grid.
+        Ruin probabilities are steep in ``p`` near 1/2 for large fortunes, so
+        interpolated values can be far off there (0.74 instead of 0.88 for
+        100 of 200 at p = 0.495 on the default grid).
+
+        Args:
+            initial_fortune (array_like): Starting amount of money
+            target_fortune (array_like): Target amount to reach
+            win_probability (array_like): Probability of winning each bet
+            interpolate (bool): Whether to interpolate between win-probability nodes
+
+        Returns:
+            Tuple of (values, inside): values has shape ``(3,) + broadcast shape``
+            and is only meaningful where the boolean mask ``inside`` is set
+        """
+        n, N, p = np.broadcast_arrays(
+            np.asarray(initial_fortune, dtype=np.float64),
+            np.asarray(target_fortune, dtype=np.float64),
+            np.asarray(win_probability, dtype=np.float64),
+        )
+        pos = p * (self.p_steps - 1)
+        node = np.rint(pos)
+        on_node = np.abs(pos - node) < _NODE_TOLERANCE
+        inside = (
+            (n >= 0) & (n <= self.max_fortune) & (n == np.floor(n))
+            & (N >= 0) & (N <= self.max_fortune) & (N == np.floor(N))
+            & (p >= 0) & (p <= 1) & (on_node | interpolate)
+        )
+
+        values = np.empty((3,) + n.shape)
+        ni = n[inside].astype(np.intp)
+        Ni = N[inside].astype(np.intp)
+        lower = np.where(on_node, node, np.floor(pos))[inside].astype(np.intp)
+        upper = np.minimum(lower + 1, self.p_steps - 1)
+        frac = np.where(on_node, 0.0, pos - np.floor(pos))[inside]
+        values[:, inside] = (
+            (1 - frac) * self.data[:, lower, Ni, ni] + frac * self.data[:, upper, Ni, ni]
+        )
+        return values, inside
+
+
+_surface: Optional[RuinSurface] = None
+_surface_loaded = False
+_surface_lock = threading.Lock()
+
+
+def get_surface() -> Optional[RuinSurface]:
+    """Open the surface named by ``RUIN_SURFACE_PATH`` (or the default path) once.
+
+    Returns:
+        The shared RuinSurface, or None when no surface file has been built
+    """
+    global _surface, _surface_loaded
+    if not _surface_loaded:
+        with _surface_lock:
+            if not _surface_loaded:
+                path = Path(os.environ.get("RUIN_SURFACE_PATH", DEFAULT_PATH))
+                _surface = RuinSurface(path) if path.exists() else None
+                _surface_loaded = True
+    return _surface
+
+
+def lookup_ruin_statistics(initial_fortune, target_fortune, win_probability,
+                           interpolate: bool = False) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Answer from the precomputed surface, falling back to the formulas off-grid.
+
+    Args:
+        initial_fortune (array_like): Starting amount of money
+        target_fortune (array_like): Target amount to reach
+        win_probability (array_like): Probability of winning each bet
+        interpolate (bool): Whether to interpolate between win-probability nodes
+
+    Returns:
+        Tuple of (ruin_probability, win_probability, expected_duration), as
+        returned by ``src.analytics.ruin_statistics``
+    """
+    surface = get_surface()
+    if surface is None:
+        return ruin_statistics(initial_fortune, target_fortune, win_probability)
+
+    values, inside = surface.lookup(initial_fortune, target_fortune, win_probability, interpolate)
+    if not inside.all():
+        n, N, p = np.broadcast_arrays(initial_fortune, target_fortune, win_probability)
+        outside = ~inside
+        values[:, outside] = ruin_statistics(n[outside], N[outside], p[outside])
+    return values[0], values[1], values[2]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the precomputed ruin-probability surface.")
+    parser.add_argument("--output", default=str(DEFAULT_PATH), help="Output .npy file")
+    parser.add_argument("--p-steps", type=int, default=101, help="Win-probability grid points in [0, 1]")
+    parser.add_argument("--max-fortune", type=int, default=200, help="Largest initial and target fortune")
+    args = parser.parse_args()
+    build_surface(args.output, p_steps=args.p_steps, max_fortune=args.max_fortune)
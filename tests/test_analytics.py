@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+from src.analytics import ruin_statistics
+
+
+@pytest.mark.parametrize("n, N", [(1, 2), (5, 10), (30, 100)])
+def test_ruin_statistics_matches_closed_form_at_edges(n, N):
+    ruin, win, duration = ruin_statistics(n, N, 0.0)
+    assert (ruin, win, duration) == (1.0, 0.0, n)
+    ruin, win, duration = ruin_statistics(n, N, 1.0)
+    assert (ruin, win, duration) == (0.0, 1.0, N - n)
+    ruin, win, duration = ruin_statistics(n, N, 0.5)
+    assert ruin == pytest.approx((N - n) / N)
+    assert win == pytest.approx(n / N)
+    assert duration == pytest.approx(n * (N - n))
+
+
+@pytest.mark.parametrize("p", [0.3, 0.49, 0.51, 0.7])
+def test_ruin_statistics_matches_classic_formula(p):
+    n, N = 7, 20
+    r = (1 - p) / p
+    win = (1 - r ** n) / (1 - r ** N)
+    result = ruin_statistics(n, N, p)
+    assert result[1] == pytest.approx(win, rel=1e-12)
+    assert result[0] == pytest.approx(1 - win, rel=1e-12)
+    assert result[2] == pytest.approx((n - N * win) / (1 - 2 * p), rel=1e-10)
+
+
+def test_ruin_statistics_broadcasts():
+    ruin, _, _ = ruin_statistics(np.array([1, 2, 3]), 4, np.array([[0.5], [0.0]]))
+    assert ruin.shape == (2, 3)
+    np.testing.assert_allclose(ruin[0], [0.75, 0.5, 0.25])
+    np.testing.assert_array_equal(ruin[1], [1.0, 1.0, 1.0])
@@ -0,0 +1,41 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api_demo import app
+
+client = TestClient(app)
+
+GAME = {"initial_fortune": 5, "target_fortune": 10}
+STRATEGY = {"strategy_type": "Fixed", "bet_size": 1, "initial_fortune": 100}
+
+
+@pytest.mark.parametrize("path, body", [
+    ("/calculate_probability", GAME),
+    ("/duration_distribution", GAME),
+    ("/simulate", {**GAME, "num_simulations": 10}),
+    ("/analyze_strategy", STRATEGY),
+    ("/analyze_strategy/tournament", {"stop_loss": 50, "initial_fortune": 100}),
+])
+@pytest.mark.parametrize("win_probability", [-0.1, 1.5])
+def test_win_probability_out_of_range_is_rejected(path, body, win_probability):
+    response = client.post(path, json={**body, "win_probability": win_probability})
+    assert response.status_code == 422
+
+
+@pytest.mark.parametrize("path, body", [
+    ("/simulate", {**GAME, "num_simulations": 10, "win_probability": 0.5}),
+    ("/analyze_strategy/tournament", {"stop_loss": 50, "initial_fortune": 100, "win_probability": 0.5}),
+])
+@pytest.mark.parametrize("confidence", [0, 1, 1.2])
+def test_confidence_out_of_range_is_rejected(path, body, confidence):
+    response = client.post(path, json={**body, "confidence": confidence})
+    assert response.status_code == 422
+
+
+@pytest.mark.parametrize("column, value", [("win_probability", 1.5), ("win_probability", -0.1),
+                                           ("initial_fortune", -1), ("target_fortune", -5)])
+def test_batch_values_out_of_range_are_rejected(column, value):
+    body = {"initial_fortune": [5, 5], "target_fortune": [10, 10], "win_probability": [0.5, 0.4]}
+    body[column] = [body[column][0], value]
+    response = client.post("/calculate_probability/batch", json=body)
+    assert response.status_code == 422
@@ -0,0 +1,45 @@
+import time
+
+import numpy as np
+import pytest
+
+from src.duration import duration_distribution, duration_tail
+
+
+def _walk_by_dp(n, N, p, steps):
+    """Ruin pmf, win pmf and P(T > t) for t < steps by iterating the walk."""
+    state = np.zeros(N + 1)
+    state[n] = 1.0
+    ruin, win, survival = [], [], []
+    for _ in range(steps):
+        ruin.append(state[0])
+        win.append(state[N])
+        survival.append(state[1:N].sum())
+        moved = np.zeros_like(state)
+        moved[2:N + 1] += p * state[1:N]
+        moved[0:N - 1] += (1 - p) * state[1:N]
+        state = moved
+    return np.array(ruin), np.array(win), np.array(survival)
+
+
+@pytest.mark.parametrize("n, N, p", [(5, 10, 0.5), (3, 12, 0.45), (9, 12, 0.6), (1, 30, 0.52)])
+def test_distribution_matches_dp(n, N, p):
+    ruin_pmf, win_pmf = duration_distribution(n, N, p)
+    ruin, win, _ = _walk_by_dp(n, N, p, ruin_pmf.size)
+    np.testing.assert_allclose(ruin_pmf, ruin, atol=1e-13)
+    np.testing.assert_allclose(win_pmf, win, atol=1e-13)
+    assert ruin_pmf.sum() + win_pmf.sum() == pytest.approx(1.0, abs=1e-11)
+
+
+@pytest.mark.parametrize("n, N, p", [(5, 10, 0.5), (3, 12, 0.45), (9, 12, 0.6)])
+def test_tail_estimate_matches_dp_far_out(n, N, p):
+    _, _, survival = _walk_by_dp(n, N, p, 400)
+    for t in (200, 399):
+        assert duration_tail(n, N, p, t) == pytest.approx(survival[t], rel=1e-6)
+
+
+def test_too_long_game_is_rejected_without_computing():
+    start = time.perf_counter()
+    with pytest.raises(ValueError, match="too long"):
+        duration_distribution(1000, 2000, 0.5)
+    assert time.perf_counter() - start < 0.1
@@ -0,0 +1,13 @@
+from fastapi.testclient import TestClient
+
+from src.api_demo import app
+
+client = TestClient(app)
+
+
+def test_simulation_job_rejects_return_walkers():
+    response = client.post("/jobs", json={"kind": "simulate", "parameters": {
+        "num_simulations": 100, "initial_fortune": 5, "target_fortune": 10,
+        "win_probability": 0.5, "return_walkers": True,
+    }})
+    assert response.status_code == 422
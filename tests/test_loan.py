@@ -0,0 +1,49 @@
+import math
+
+import numpy as np
+import pytest
+
+from src.analytics import ruin_statistics
+from src.loan import credit_limit_ruin
+
+
+def _dense_solve(n, N, p, credit, max_bet, interest_rate):
+    """Ruin probability and duration for one credit limit from a dense linear solve."""
+    states = list(range(-credit + 1, N))
+    index = {w: i for i, w in enumerate(states)}
+    Q = np.zeros((len(states), len(states)))
+    win = np.zeros(len(states))
+    for w in states:
+        bet = min(max_bet, N - w)
+        for after, prob in ((w + bet, p), (w - bet, 1 - p)):
+            if after >= N:
+                win[index[w]] += prob
+                continue
+            interest = interest_rate * max(-after, 0)
+            whole = math.floor(interest)
+            for landing, weight in ((after - whole, 1 - (interest - whole)), (after - whole - 1, interest - whole)):
+                if landing in index:
+                    Q[index[w], index[landing]] += prob * weight
+    system = np.eye(len(states)) - Q
+    win_prob = np.linalg.solve(system, win)[index[n]]
+    duration = np.linalg.solve(system, np.ones(len(states)))[index[n]]
+    return 1 - win_prob, duration
+
+
+@pytest.mark.parametrize("p, max_bet, interest_rate", [(0.5, 1, 0.0), (0.47, 3, 0.0), (0.49, 2, 0.15)])
+def test_credit_limit_ruin_matches_dense_solve(p, max_bet, interest_rate):
+    n, N, max_credit = 6, 15, 12
+    ruin, duration = credit_limit_ruin(n, N, p, max_credit, max_bet=max_bet, interest_rate=interest_rate)
+    for credit in range(max_credit + 1):
+        if n <= -credit:
+            continue
+        expected_ruin, expected_duration = _dense_solve(n, N, p, credit, max_bet, interest_rate)
+        assert ruin[credit] == pytest.approx(expected_ruin, abs=1e-10)
+        assert duration[credit] == pytest.approx(expected_duration, rel=1e-9)
+
+
+def test_unit_bets_without_interest_shift_the_classic_game():
+    ruin, duration = credit_limit_ruin(4, 10, 0.45, 5)
+    expected = ruin_statistics(4 + np.arange(6), 10 + np.arange(6), 0.45)
+    np.testing.assert_allclose(ruin, expected[0], rtol=1e-10)
+    np.testing.assert_allclose(duration, expected[2], rtol=1e-10)
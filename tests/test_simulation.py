@@ -0,0 +1,56 @@
+import math
+
+import numpy as np
+import pytest
+
+from src import simulation
+from src.simulation import (
+    SHARD_SIZE,
+    finalize_summary,
+    importance_sampling_estimate,
+    simulate_sharded,
+    wilson_interval,
+)
+
+
+@pytest.mark.parametrize("p, event, probability", [(0.0, "win", 0.0), (1.0, "ruin", 0.0)])
+def test_importance_sampling_degenerate_probability_is_exact(p, event, probability):
+    estimate = importance_sampling_estimate(100, 5, 10, p, rng=np.random.default_rng(0))
+    assert estimate["exact"]
+    assert estimate["event"] == event
+    assert estimate["probability"] == probability
+    assert estimate["confidence_interval"] == [probability, probability]
+
+
+def test_importance_sampling_flags_saturated_sample():
+    # Tilted to p = 0.99, every walker reaches the target.
+    estimate = importance_sampling_estimate(50, 9, 10, 0.01, rng=np.random.default_rng(0))
+    assert estimate["saturated"]
+    assert estimate["relative_error"] is None
+    low, high = estimate["confidence_interval"]
+    assert low < high == pytest.approx(0.01 / 0.99)
+
+
+def test_importance_sampling_matches_closed_form():
+    p, n, target = 0.4, 10, 20
+    r = (1 - p) / p
+    exact = (r ** n - 1) / (r ** target - 1)
+    estimate = importance_sampling_estimate(20_000, n, target, p, rng=np.random.default_rng(1))
+    assert not estimate["saturated"]
+    assert math.isclose(estimate["probability"], exact, rel_tol=5 * estimate["relative_error"])
+
+
+def test_sharded_run_is_identical_across_worker_counts(monkeypatch):
+    monkeypatch.setattr(simulation, "MAX_WORKERS", 2)
+    args = (2 * SHARD_SIZE + 1000, 10, 20, 0.48)
+    serial = finalize_summary(simulate_sharded(*args, seed=7, workers=1))
+    parallel = finalize_summary(simulate_sharded(*args, seed=7, workers=2))
+    assert simulation._pool is not None
+    assert parallel == serial
+
+
+@pytest.mark.parametrize("successes, trials", [(0, 50), (50, 50), (17, 40)])
+def test_wilson_interval_stays_in_unit_range_and_covers_estimate(successes, trials):
+    low, high = wilson_interval(successes, trials)
+    assert 0 <= low <= successes / trials <= high <= 1
+    assert high - low > 0
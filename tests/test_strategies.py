@@ -0,0 +1,134 @@
+import math
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from src.api_demo import app
+from src.strategies import (
+    BettingRule, FixedRule, KellyRule, MartingaleRule, make_rule, paired_difference, simulate_strategies,
+)
+
+client = TestClient(app)
+
+
+def _finite(value):
+    if isinstance(value, dict):
+        return all(_finite(item) for item in value.values())
+    if isinstance(value, list):
+        return all(_finite(item) for item in value)
+    if isinstance(value, float):
+        return math.isfinite(value)
+    return True
+
+
+def test_favourable_kelly_run_stays_finite():
+    response = client.post("/analyze_strategy", json={
+        "strategy_type": "Kelly", "bet_size": 1, "stop_loss": 50,
+        "win_probability": 0.6, "initial_fortune": 100, "max_rounds": 5000,
+    })
+    assert response.status_code == 200
+    result = response.json()
+    assert _finite(result)
+    assert result["simulation"]["final_wealth"]["mean"] > 100
+
+
+def test_fractional_wealth_is_not_truncated():
+    # Kelly at p=0.55 stakes a tenth of wealth, so every walker ends at
+    # 100 * 1.1**wins * 0.9**losses; the stop-loss keeps stakes above min_bet.
+    outcome, = simulate_strategies(
+        [KellyRule(0.55)], initial_fortune=100, win_probability=0.55, num_walkers=500, max_rounds=300,
+        stop_loss=50, rng=np.random.default_rng(0),
+    )
+    wealth, rounds = outcome["final_wealth"], outcome["rounds"]
+    assert np.any(wealth != np.round(wealth))
+    wins = (np.log(wealth / 100) - rounds * np.log(0.9)) / (np.log(1.1) - np.log(0.9))
+    np.testing.assert_allclose(wins, np.round(wins), atol=1e-6)
+
+
+def test_favourable_kelly_tournament_stays_finite():
+    response = client.post("/analyze_strategy/tournament", json={
+        "stop_loss": 50, "win_probability": 0.6, "initial_fortune": 100,
+        "num_walkers": 2000, "max_rounds": 5000,
+    })
+    assert response.status_code == 200
+    result = response.json()
+    assert _finite(result["strategies"])
+    assert _finite(result["comparisons"])
+    assert result["ranking"][0] == "Kelly"
+
+
+def test_paired_difference_rejects_non_finite_wealth():
+    with pytest.raises(ValueError):
+        paired_difference(np.array([1.0, np.inf]), np.array([1.0, 2.0]))
+
+
+def test_unknown_strategy_type_is_rejected():
+    response = client.post("/analyze_strategy", json={
+        "strategy_type": "Labouchere", "bet_size": 1, "win_probability": 0.5, "initial_fortune": 100,
+    })
+    assert response.status_code == 422
+    response = client.post("/analyze_strategy/tournament", json={
+        "strategies": [{"strategy_type": "Fixed"}, {"strategy_type": "kelly"}],
+        "stop_loss": 50, "win_probability": 0.5, "initial_fortune": 100,
+    })
+    assert response.status_code == 422
+    with pytest.raises(ValueError):
+        make_rule("Labouchere", 1, 0.5)
+
+
+def test_betting_rule_is_abstract():
+    with pytest.raises(TypeError):
+        BettingRule()
+
+
+class _RoundByRoundFixed(FixedRule):
+    def stake_formula(self):
+        return None
+
+
+class _RoundByRoundKelly(KellyRule):
+    def stake_formula(self):
+        return None
+
+
+@pytest.mark.parametrize("settings", [
+    {"initial_fortune": 30, "win_probability": 0.49, "stop_loss": 20},
+    {"initial_fortune": 100, "win_probability": 0.6, "stop_loss": 50, "table_limit": 15},
+    {"initial_fortune": 7.5, "win_probability": 0.55, "target_fortune": 40.25, "min_bet": 0.5},
+])
+def test_word_tables_match_round_by_round_play(settings):
+    p = settings["win_probability"]
+    pairs = [(FixedRule(3), _RoundByRoundFixed(3)), (KellyRule(p, 0.5), _RoundByRoundKelly(p, 0.5))]
+    for fast, slow in pairs:
+        runs = [
+            simulate_strategies([rule, MartingaleRule(1)], num_walkers=2000, max_rounds=501,
+                                rng=np.random.default_rng(3), **settings)
+            for rule in (fast, slow)
+        ]
+        for key in ("status", "rounds"):
+            np.testing.assert_array_equal(runs[0][0][key], runs[1][0][key])
+        for key in ("final_wealth", "max_drawdown", "max_bet"):
+            np.testing.assert_allclose(runs[0][0][key], runs[1][0][key], rtol=1e-9)
+
+
+def test_strategy_run_size_is_bounded():
+    body = {"strategy_type": "Fixed", "bet_size": 1, "win_probability": 0.5, "initial_fortune": 100}
+    for field, value in [("num_walkers", 0), ("num_walkers", 10 ** 9), ("max_rounds", 0), ("max_rounds", 10 ** 9)]:
+        assert client.post("/analyze_strategy", json={**body, field: value}).status_code == 422
+        response = client.post("/analyze_strategy/tournament", json={
+            "stop_loss": 50, "win_probability": 0.5, "initial_fortune": 100, field: value,
+        })
+        assert response.status_code == 422
+
+
+def test_small_kelly_stakes_are_raised_to_min_bet():
+    body = {"strategy_type": "Kelly", "bet_size": 1, "win_probability": 0.505, "initial_fortune": 10,
+            "num_walkers": 200, "max_rounds": 50}
+    # Kelly asks for 1% of wealth, which stays below 10 * 1.01**50, so below either minimum.
+    for min_bet in (1, 0.25):
+        result = client.post("/analyze_strategy", json={**body, "min_bet": min_bet}).json()
+        assert result["max_bet"] == min_bet
+        assert result["parameters"]["min_bet"] == min_bet
+    response = client.post("/analyze_strategy", json={**body, "min_bet": 2, "table_limit": 1})
+    assert response.status_code == 422
@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from src.streaming import FixedHistogram, QuantileSketch, RunningStats
+
+
+@pytest.fixture
+def batches():
+    rng = np.random.default_rng(3)
+    return [rng.geometric(0.01, size=size) for size in (1, 500, 7000, 0, 2500)]
+
+
+def test_running_stats_merge_equals_single_pass(batches):
+    merged = RunningStats()
+    for batch in batches:
+        merged = merged.merge(RunningStats().update(batch))
+    values = np.concatenate(batches)
+    assert merged.count == values.size
+    assert merged.mean == pytest.approx(values.mean(), rel=1e-12)
+    assert merged.variance == pytest.approx(values.var(ddof=1), rel=1e-10)
+    assert (merged.minimum, merged.maximum) == (values.min(), values.max())
+
+
+def test_histogram_merge_equals_single_pass(batches):
+    whole = FixedHistogram(0, 500, 50).update(np.concatenate(batches))
+    merged = FixedHistogram(0, 500, 50)
+    for batch in batches:
+        merged = merged.merge(FixedHistogram(0, 500, 50).update(batch))
+    np.testing.assert_array_equal(merged.counts, whole.counts)
+    with pytest.raises(ValueError):
+        merged.merge(FixedHistogram(0, 100, 50))
+
+
+def test_quantile_sketch_merge_equals_single_pass(batches):
+    values = np.concatenate(batches + [np.zeros(40, dtype=np.int64)])
+    whole = QuantileSketch().update(values)
+    merged = QuantileSketch().update(np.zeros(40))
+    for batch in batches:
+        merged = merged.merge(QuantileSketch().update(batch))
+    qs = [0, 0.01, 0.5, 0.9, 0.99, 1]
+    assert merged.quantiles(qs) == whole.quantiles(qs)
+    exact = np.quantile(values, [0.5, 0.9, 0.99], method="lower")
+    np.testing.assert_allclose(whole.quantiles([0.5, 0.9, 0.99]), exact, rtol=0.01)
@@ -0,0 +1,17 @@
+import numpy as np
+
+from src import surface
+from src.analytics import ruin_statistics
+from src.page_compute import ruin_curve
+
+
+def test_ruin_curve_is_exact_between_grid_nodes(tmp_path, monkeypatch):
+    path = tmp_path / "surface.npy"
+    surface.build_surface(path, p_steps=51, max_fortune=200)
+    monkeypatch.setattr(surface, "_surface", surface.RuinSurface(path))
+    monkeypatch.setattr(surface, "_surface_loaded", True)
+
+    fortunes, ruin = ruin_curve(200, 0.49)
+    expected, _, _ = ruin_statistics(fortunes, 200, 0.49)
+    np.testing.assert_allclose(ruin, expected, rtol=1e-9)
+    assert abs(ruin[99] - 0.98) < 0.01